@@ -14,4 +14,8 @@ setup(
         ]
     },
     python_requires=">=3.10",
+    extras_require={
+        # optional vectorized aggregates for the columnar store
+        "columnar": ["numpy"],
+    },
 )
@@ -0,0 +1,4 @@
+import time
+
+# Reference point for `app --startup-profile`: when the package was first imported.
+IMPORT_START = time.perf_counter()
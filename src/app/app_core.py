@@ -6,7 +6,7 @@ Core application logic for the Grocery List application.
 This module contains the `GroceryList` class which is responsible for:
 - Maintaining the in-memory list of `GroceryItem` objects
 - CRUD operations (add, edit, remove, list, search)
-- Persisting the list to disk as JSON
+- Persisting the list to disk as JSON (optionally through an append-only journal)
 - Exporting a filtered "buy list" to a text file
 
 Design note:
@@ -14,15 +14,34 @@ The CLI layer (user prompts/printing) should live in `app_launch.py`. This modul
 should focus on business logic and persistence.
 """
 
+import logging
 import os
-import re
+import sys
 import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Any
 
 import app.constants as constants
+import app.metrics as metrics
+import app.money as money
+import app.storage as storage
 import app.utils as utils
 from app.grocery_item import GroceryItem
+from app.indexes import CostAggregates, PrefixIndex, PriorityView, TrigramIndex
+from app.log_config import log_event
+from app.query import Condition, Plan, QueryIndex, parse_where
 
+if TYPE_CHECKING:
+    from app.columnar import ColumnarStore
+    from app.exporter import ExportResult
 
+logger = logging.getLogger(__name__)
+
+
+@metrics.instrument
 class GroceryList:
     """Manage grocery list items, persistence, search, and export operations."""
 
@@ -36,49 +55,270 @@ class GroceryList:
             constants.EXPORT_PATH,
             f"{constants.GROCERY_LIST}.json",
         )
-        self.grocery_list: list[GroceryItem] = []
+        self.storage = constants.STORAGE
+        self.backend = storage.create_backend(self.storage)
+        self.journal_path = os.path.join(
+            constants.EXPORT_PATH,
+            f"{constants.GROCERY_LIST}.{constants.JOURNAL_EXTENSION}",
+        )
+        self.journal_enabled = constants.JOURNAL_ENABLED
+        self.journal_count = 0
+
+        # Cross-process write safety (see `_locked` and `_write_changes`):
+        # the lock file, this process's lock nesting depth, and the on-disk
+        # version the in-memory list was last synced with.
+        self.lock_path = os.path.join(
+            constants.EXPORT_PATH,
+            f"{constants.GROCERY_LIST}.{constants.LOCK_EXTENSION}",
+        )
+        self._lock_depth = 0
+        self._version: tuple | None = None
+
+        # Items keyed by ID. Dicts keep insertion order, so this doubles as the
+        # ordered list while giving O(1) lookup and removal.
+        self._items: dict[int, GroceryItem] = {}
+        # Exact name -> {id: item}, kept in insertion order per name.
+        self._name_index: dict[str, dict[int, GroceryItem]] = {}
+        # Case-folded sorted names for prefix search.
+        self._prefix_index = PrefixIndex()
+        # Trigram index for fuzzy search; built on the first fuzzy query so
+        # plain loads do not pay for it (None until then).
+        self._trigram_index: TrigramIndex | None = None
+        # Store / priority / buy / cost indexes for `query`; also built on
+        # first use (None until then).
+        self._query_index: QueryIndex | None = None
+        # Items bucketed by buy flag and priority for `top_items`; built on
+        # first use (None until then).
+        self._priority_view: PriorityView | None = None
+        # Running counts and cost subtotals (overall, per store, per
+        # priority) for totals and `summary`; built on first use (None until
+        # then).
+        self._aggregates: CostAggregates | None = None
+        # Whole-list ID orders for `page_items`, keyed by (sort field,
+        # reverse); cleared on every change.
+        self._sorted_ids: dict[tuple[str, bool], list[int]] = {}
+        # Optional packed columns for vectorized totals (None when disabled).
+        # Imported lazily so NumPy is only loaded when the store is used.
+        self._columns = None
+        if constants.COLUMNAR_ENABLED:
+            from app.columnar import ColumnarStore
+            self._columns = ColumnarStore()
+
+        # Batch state (see `batch`): deferred changes, undo log for edits and
+        # the item order to restore on rollback. `_pending` is None outside a
+        # batch.
+        self._pending: list[tuple[str, GroceryItem]] | None = None
+        self._undo: list[tuple[GroceryItem, tuple]] = []
+        self._batch_items: list[GroceryItem] = []
+
         self.set_grocery_list()
 
+    @property
+    def grocery_list(self) -> list[GroceryItem]:
+        """Return the items in insertion order.
+
+        A new list is built on every access; use the lookup helpers for
+        single-item access.
+        """
+        return list(self._items.values())
+
+    @grocery_list.setter
+    def grocery_list(self, grocery_list: list[GroceryItem]) -> None:
+        """Replace the in-memory items and rebuild every index."""
+        self._items = {}
+
+        for item in grocery_list:
+            # Legacy rows may be missing an ID (or share one); give them a
+            # fresh ID so they do not collide in the index.
+            if item.id == constants.ID_DEFAULT or item.id in self._items:
+                item.id = int(uuid.uuid4())
+            self._items[item.id] = item
+
+        self._rebuild_indexes()
+
     def set_grocery_list(self) -> list[GroceryItem]:
         """Load the grocery list from disk into memory.
 
-        Creates the export directory if needed. If the JSON file does not exist,
-        initializes an empty list and writes it to disk.
+        Creates the export directory if needed. If the storage backend has no
+        data yet, initializes an empty list and writes it to disk; an existing
+        `grocery_list.json` is converted automatically when another backend is
+        configured. Any records left in the journal are replayed on top. The
+        whole load runs under the data-directory lock.
 
         Returns:
             The in-memory grocery list.
         """
         os.makedirs(constants.EXPORT_PATH, exist_ok=True)
 
-        if os.path.exists(self.grocery_list_path):
+        with self._locked():
+            self._load()
+            self._version = self._disk_version()
+
+        return self.grocery_list
+
+    def _load(self) -> None:
+        """Load the list and replay the journal (caller holds the lock)."""
+        convert_from_json = False
+
+        if self.backend.exists():
             grocery_list = self.load_data()
+        elif self.storage != "json" and os.path.exists(self.grocery_list_path):
+            grocery_list = storage.JsonBackend(self.grocery_list_path).load()
+            convert_from_json = True
         else:
             print("")
-            print("** No JSON path found, creating JSON path **")
+            print(f"** No {self.storage} data found, creating {self.backend.path} **")
             grocery_list = []
             self.grocery_list = []
             self.save_data()
 
         self.grocery_list = grocery_list
-        return self.grocery_list
+
+        if os.path.exists(self.journal_path):
+            self.replay_journal()
+
+        if convert_from_json:
+            print("")
+            print(f"** Converted JSON list to {self.storage} storage **")
+            self.save_data()
 
     # -------------------------
     # Lookup helpers
     # -------------------------
 
+    def get_item_from_id(self, item_id: int) -> GroceryItem | None:
+        """Return the item with the given ID, or None if not found."""
+        return self._items.get(item_id)
+
+    def get_items_from_name(self, name: str) -> list[GroceryItem]:
+        """Return every item with an exact matching name, in insertion order."""
+        return list(self._name_index.get(name, {}).values())
+
     def get_index_from_id(self, item_id: int) -> int | None:
-        """Return the index for a given item ID, or None if not found."""
-        for index, item in enumerate(self.grocery_list):
-            if item.id == item_id:
+        """Return the index for a given item ID, or None if not found.
+
+        Positions are not indexed, so this is linear; prefer `get_item_from_id`.
+        """
+        if item_id not in self._items:
+            return None
+        for index, key in enumerate(self._items):
+            if key == item_id:
                 return index
         return None
 
     def get_index_from_name(self, name: str) -> int | None:
         """Return the index of the first item with an exact matching name, or None."""
-        for index, item in enumerate(self.grocery_list):
-            if item.name == name:
-                return index
-        return None
+        matches = self._name_index.get(name)
+        if not matches:
+            return None
+        return self.get_index_from_id(next(iter(matches)))
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild every secondary index from `_items` in one pass.
+
+        Used after bulk changes, where sorting once is far cheaper than
+        inserting item by item.
+        """
+        self._name_index = {}
+        for item in self._items.values():
+            self._name_index.setdefault(item.name, {})[item.id] = item
+
+        self._prefix_index.rebuild(self._items.values())
+        self._sorted_ids.clear()
+
+        if self._trigram_index is not None:
+            self._trigram_index.rebuild(self._items.values())
+
+        if self._query_index is not None:
+            self._query_index.rebuild(self._items.values())
+
+        if self._priority_view is not None:
+            self._priority_view.rebuild(self._items.values())
+
+        if self._aggregates is not None:
+            self._aggregates.rebuild(self._items.values())
+
+        if self._columns is not None:
+            self._columns.rebuild(self._items.values())
+
+    def _index_item(self, item: GroceryItem) -> None:
+        """Add an item to the ID, name and prefix indexes."""
+        self._items[item.id] = item
+        self._name_index.setdefault(item.name, {})[item.id] = item
+        self._prefix_index.add(item)
+        self._sorted_ids.clear()
+
+        if self._trigram_index is not None:
+            self._trigram_index.add(item)
+
+        if self._query_index is not None:
+            self._query_index.add(item)
+
+        if self._priority_view is not None:
+            self._priority_view.add(item)
+
+        if self._aggregates is not None:
+            self._aggregates.add(item)
+
+        if self._columns is not None:
+            self._columns.add(item)
+
+    def _unindex_item(self, item: GroceryItem) -> None:
+        """Remove an item from the ID, name and prefix indexes."""
+        self._items.pop(item.id, None)
+        self._unindex_name(item.id, item.name)
+        self._prefix_index.remove(item.id, item.name)
+        self._sorted_ids.clear()
+
+        if self._trigram_index is not None:
+            self._trigram_index.remove(item.id)
+
+        if self._query_index is not None:
+            self._query_index.remove(item.id)
+
+        if self._priority_view is not None:
+            self._priority_view.remove(item.id)
+
+        if self._aggregates is not None:
+            self._aggregates.remove(item.id)
+
+        if self._columns is not None:
+            self._columns.remove(item.id)
+
+    def _unindex_name(self, item_id: int, name: str) -> None:
+        """Remove one ID from the name index bucket for `name`."""
+        same_name = self._name_index.get(name)
+        if same_name is not None:
+            same_name.pop(item_id, None)
+            if not same_name:
+                del self._name_index[name]
+
+    def _reindex_item(self, item: GroceryItem, old_name: str) -> None:
+        """Update secondary indexes after an in-place edit.
+
+        The item keeps its position in `_items`; only index buckets whose key
+        actually changed are touched.
+        """
+        self._sorted_ids.clear()
+
+        if item.name != old_name:
+            self._unindex_name(item.id, old_name)
+            self._name_index.setdefault(item.name, {})[item.id] = item
+            self._prefix_index.rename(item, old_name)
+            if self._trigram_index is not None:
+                self._trigram_index.rename(item)
+
+        if self._query_index is not None:
+            self._query_index.update(item)
+
+        if self._priority_view is not None:
+            self._priority_view.update(item)
+
+        if self._aggregates is not None:
+            self._aggregates.update(item)
+
+        if self._columns is not None:
+            self._columns.update(item)
 
     # -------------------------
     # CRUD
@@ -92,10 +332,85 @@ class GroceryList:
         amount: int,
         priority: int,
         buy: bool,
-    ) -> None:
-        """Create a new GroceryItem, append it to the list, and persist to disk."""
-        unique_id = int(uuid.uuid4())
+    ) -> GroceryItem:
+        """Create a new GroceryItem, append it to the list, and persist to disk.
 
+        Returns:
+            The new item.
+        """
+        grocery_item = self._build_item(name, store, cost, amount, priority, buy)
+
+        self._index_item(grocery_item)
+        self.commit("add", grocery_item)
+        return grocery_item
+
+    def add_items(self, rows: Iterable[Mapping]) -> tuple[int, list[tuple[int, str]]]:
+        """Add many items from an iterable of row mappings and persist once.
+
+        Rows are consumed one at a time, so `rows` may be a generator over a
+        file of any size. Each row may use native values or strings (as read
+        from CSV); blank or missing fields fall back to the constants defaults.
+        Invalid rows are skipped and reported instead of aborting the import.
+        If reading `rows` itself fails, nothing is added and the error is
+        re-raised.
+
+        Args:
+            rows: Mappings with any of the keys name, store, cost, amount,
+                priority, and buy.
+
+        Returns:
+            A tuple of (number of items added, list of (row number, error)).
+        """
+        added: list[GroceryItem] = []
+        errors: list[tuple[int, str]] = []
+
+        try:
+            for row_number, row in enumerate(rows, start=1):
+                if not isinstance(row, Mapping):
+                    errors.append((row_number, "Row could not be parsed."))
+                    continue
+
+                try:
+                    grocery_item = self._build_item(
+                        name=self._row_value(row, "name", str, constants.NAME_DEFAULT),
+                        store=self._row_value(row, "store", str, constants.STORE_DEFAULT),
+                        cost=self._row_value(row, "cost", float, constants.COST_DEFAULT),
+                        amount=self._row_value(row, "amount", int, constants.AMOUNT_DEFAULT),
+                        priority=self._row_value(
+                            row, "priority", int, constants.PRIORITY_DEFAULT),
+                        buy=self._row_value(
+                            row, "buy", self._parse_bool, constants.BUY_DEFAULT),
+                    )
+                except (TypeError, ValueError) as exc:
+                    errors.append((row_number, str(exc)))
+                    continue
+
+                # Indexes other than the ID map are rebuilt once below.
+                self._items[grocery_item.id] = grocery_item
+                added.append(grocery_item)
+        except BaseException:
+            # Only the ID map has seen these items; take them back out so the
+            # in-memory list (and a long-lived daemon's state) is unchanged.
+            for grocery_item in added:
+                del self._items[grocery_item.id]
+            raise
+
+        if added:
+            self._rebuild_indexes()
+            self.commit_many([("add", item) for item in added])
+
+        return len(added), errors
+
+    @staticmethod
+    def _build_item(
+        name: str,
+        store: str,
+        cost: float,
+        amount: int,
+        priority: int,
+        buy: bool,
+    ) -> GroceryItem:
+        """Create a validated GroceryItem with a fresh unique ID."""
         grocery_item = GroceryItem()
         grocery_item.name = name
         grocery_item.store = store
@@ -103,21 +418,45 @@ class GroceryList:
         grocery_item.amount = amount
         grocery_item.priority = priority
         grocery_item.buy = buy
-        grocery_item.id = unique_id
+        grocery_item.id = int(uuid.uuid4())
+        return grocery_item
+
+    @staticmethod
+    def _row_value(row: Mapping, key: str, cast: Callable, default: Any) -> Any:
+        """Return `row[key]` converted with `cast`, or `default` when blank/missing."""
+        value = row.get(key)
 
-        self.grocery_list.append(grocery_item)
-        self.save_data()
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                return default
+            if cast is not str:
+                value = cast(value)
+        elif value is None:
+            return default
+
+        return value
+
+    @staticmethod
+    def _parse_bool(value: str) -> bool:
+        """Parse a buy flag string into a boolean (ValueError if invalid)."""
+        v = value.strip().lower()
+        if v in constants.BUY_TRUE:
+            return True
+        if v in constants.BUY_FALSE:
+            return False
+        raise ValueError(f"Buy must be yes/no/true/false (got {value!r}).")
 
     def remove_item(self, name: str, id: int) -> None:
         """Remove an item by its unique ID and persist changes."""
         # Note: removal is performed by `id`; `name` is only used for user-friendly messaging.
-        index = self.get_index_from_id(id)
-        if index is None:
+        removed_item = self.get_item_from_id(id)
+        if removed_item is None:
             print(f"Could not remove '{name}': ID not found.")
             return
 
-        self.grocery_list.pop(index)
-        self.save_data()
+        self._unindex_item(removed_item)
+        self.commit("remove", removed_item)
 
     def edit_item(
         self,
@@ -131,62 +470,196 @@ class GroceryList:
     ) -> None:
         """Update an existing item by ID.
 
-        Any argument set to None means "keep the current value".
+        Any argument set to None means "keep the current value". If a value is
+        invalid, the item is left unchanged and the ValueError is re-raised.
         """
         if id is None:
             print("Cannot edit item: missing id.")
             return
 
-        index = self.get_index_from_id(id)
-        if index is None:
+        current_item = self.get_item_from_id(id)
+        if current_item is None:
             print("Cannot edit item: ID not found.")
             return
 
-        current_item = self.grocery_list[index]
+        state = self._item_state(current_item)
+        if self._pending is not None:
+            self._undo.append((current_item, state))
 
-        if name is not None:
-            current_item.name = name
-        if store is not None:
-            current_item.store = store
-        if cost is not None:
-            current_item.cost = cost
-        if amount is not None:
-            current_item.amount = amount
-        if priority is not None:
-            current_item.priority = priority
+        # Re-index after the update (even if a setter fails part way) so a
+        # rename never leaves the indexes pointing at stale keys.
+        old_name = current_item.name
+        try:
+            if name is not None:
+                current_item.name = name
+            if store is not None:
+                current_item.store = store
+            if cost is not None:
+                current_item.cost = cost
+            if amount is not None:
+                current_item.amount = amount
+            if priority is not None:
+                current_item.priority = priority
 
-        # Use `is not None` so `False` is treated as a real update.
-        if buy is not None:
-            current_item.buy = buy
+            # Use `is not None` so `False` is treated as a real update.
+            if buy is not None:
+                current_item.buy = buy
+        except ValueError:
+            (current_item.name, current_item.store, current_item.cost,
+             current_item.amount, current_item.priority, current_item.buy) = state
+            raise
+        finally:
+            self._reindex_item(current_item, old_name)
 
-        self.save_data()
+        self.commit("edit", current_item)
 
     # -------------------------
     # Search
     # -------------------------
 
-    def search_item_name(self, search_item: str) -> list[GroceryItem]:
-        """Return items whose names start with the search string (case-insensitive)."""
-        matching_items: list[GroceryItem] = []
-        pattern = rf"^{re.escape(search_item)}"
+    def search_item_name(
+        self,
+        search_item: str,
+        stores: Iterable[str] | None = None,
+    ) -> list[GroceryItem]:
+        """Return items whose names start with the search string (case-insensitive).
+
+        Results are ordered by case-folded name, then by insertion order.
+
+        Args:
+            search_item: Name prefix to search for.
+            stores: Only return items from these stores (case-insensitive);
+                None searches every store.
+        """
+        matches = (self._items[item_id] for item_id in self._prefix_index.search(search_item))
+        store_filter = self._store_filter(stores)
+        if store_filter is None:
+            return list(matches)
+        return [item for item in matches if item.store.casefold() in store_filter]
+
+    def search_fuzzy(
+        self,
+        search_item: str,
+        limit: int | None = constants.FUZZY_LIMIT,
+        stores: Iterable[str] | None = None,
+    ) -> list[GroceryItem]:
+        """Return items whose names are similar to the search string (typos allowed).
+
+        Names are compared by character trigrams and ranked by similarity,
+        best first; only names at least `constants.FUZZY_THRESHOLD` similar
+        are returned. The trigram index is built on the first call and kept
+        up to date afterwards.
+
+        Args:
+            search_item: Text to match, e.g. "chese" for "cheese".
+            limit: Maximum number of results (None for all).
+            stores: Only return items from these stores (case-insensitive).
+        """
+        if self._trigram_index is None:
+            self._trigram_index = TrigramIndex()
+            self._trigram_index.rebuild(self._items.values())
+
+        store_filter = self._store_filter(stores)
+        results = self._trigram_index.search(
+            search_item,
+            constants.FUZZY_THRESHOLD,
+            limit if store_filter is None else None,
+        )
+
+        matches = [self._items[item_id] for _similarity, item_id in results]
+        if store_filter is not None:
+            matches = [item for item in matches if item.store.casefold() in store_filter]
+            if limit is not None:
+                matches = matches[:limit]
+        return matches
 
-        for item in self.grocery_list:
-            if re.match(pattern, item.name, re.IGNORECASE):
-                matching_items.append(item)
+    def query(self, conditions: Iterable[str | Condition]) -> list[GroceryItem]:
+        """Return the items matching every condition, ordered by case-folded name.
+
+        Conditions are strings such as "priority>=4", "buy", "store=Costco" or
+        "cost<10" (see `app.query`), or parsed `Condition`s. The most
+        selective indexed condition supplies the candidates and the others
+        are checked on those items only. The indexes are built on the first
+        call and kept up to date afterwards.
+
+        Raises:
+            ValueError: If a condition cannot be parsed.
+        """
+        return self._query_indexes().execute(self._conditions(conditions), self._items)
+
+    def plan_query(self, conditions: Iterable[str | Condition]) -> Plan:
+        """Return the plan `query` would use for these conditions (see `query`)."""
+        plan, _reader = self._query_indexes().plan(self._conditions(conditions))
+        return plan
+
+    def top_items(self, k: int = constants.TOP_K, buy_only: bool = True) -> list[GroceryItem]:
+        """Return the k most important items (highest priority first).
+
+        Items are read from a view bucketed by buy flag and priority, so the
+        cost is O(k) regardless of list size. The view is built on the first
+        call and kept up to date on every add, edit and remove afterwards.
+
+        Args:
+            k: Maximum number of items to return.
+            buy_only: Only consider items marked to buy. With False, items
+                marked to buy come first within each priority.
+        """
+        if self._priority_view is None:
+            self._priority_view = PriorityView(
+                constants.PRIORITY_MIN, constants.PRIORITY_MAX)
+            self._priority_view.rebuild(self._items.values())
 
-        return matching_items
+        return [self._items[item_id] for item_id in self._priority_view.top(k, buy_only)]
+
+    def _query_indexes(self) -> QueryIndex:
+        """Return the query indexes, building them on first use."""
+        if self._query_index is None:
+            self._query_index = QueryIndex()
+            self._query_index.rebuild(self._items.values())
+        return self._query_index
+
+    @staticmethod
+    def _conditions(conditions: Iterable[str | Condition]) -> list[Condition]:
+        """Parse any condition strings."""
+        parsed: list[Condition] = []
+        for condition in conditions:
+            if isinstance(condition, Condition):
+                parsed.append(condition)
+            else:
+                parsed.extend(parse_where([condition]))
+        return parsed
+
+    @staticmethod
+    def _store_filter(stores: Iterable[str] | None) -> set[str] | None:
+        """Return the case-folded store names to scope to (None for all)."""
+        if stores is None:
+            return None
+        return {store.casefold() for store in stores}
 
     # -------------------------
     # Display / export
     # -------------------------
 
-    def list_items(self, grocery_list: list[GroceryItem] | None = None) -> None:
-        """Print a formatted list of items to stdout."""
-        if grocery_list is None:
-            grocery_list = self.grocery_list
+    def list_items(
+        self,
+        grocery_list: list[GroceryItem] | None = None,
+        sort: str | None = None,
+        reverse: bool = False,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> int:
+        """Print a formatted page of items to stdout.
+
+        Only the rows on the page are formatted (see `page_items` for the
+        arguments). A footer gives the position when the page is partial.
+
+        Returns:
+            The total number of items the page was taken from.
+        """
+        page, total = self.page_items(grocery_list, sort, reverse, offset, limit)
 
         print("")
-        for match_num, item in enumerate(grocery_list, start=1):
+        for match_num, item in enumerate(page, start=offset + 1):
             match_string = (
                 f"{match_num}. "
                 f"Name: {item.name}, "
@@ -197,88 +670,475 @@ class GroceryList:
                 f"Buy: {item.buy}"
             )
             print(match_string)
+        if len(page) < total:
+            print(self.page_footer(offset, len(page), total))
         print("")
+        return total
+
+    @staticmethod
+    def page_footer(offset: int, shown: int, total: int) -> str:
+        """Return the "Showing a-b of n items" line printed under a partial page."""
+        if not shown:
+            return f"No items past position {offset} ({total} in total)."
+        return f"Showing {offset + 1}-{offset + shown} of {total} items."
+
+    def page_items(
+        self,
+        grocery_list: Iterable[GroceryItem] | None = None,
+        sort: str | None = None,
+        reverse: bool = False,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[list[GroceryItem], int]:
+        """Return one page of items, optionally sorted, and the total count.
+
+        Sort keys are computed once per item (never per comparison). The
+        order of the whole list is cached per sort field until the next
+        change, so paging through it only slices the cached order.
+
+        Args:
+            grocery_list: Items to page through (default: the whole list, in
+                insertion order).
+            sort: One of `constants.SORT_FIELDS` ("priority" puts the most
+                important first), or None to keep the given order.
+            reverse: Reverse the order.
+            offset: Number of items to skip.
+            limit: Maximum number of items to return (None for all).
+
+        Raises:
+            ValueError: If `sort` is unknown or `offset`/`limit` is negative.
+        """
+        if sort is not None and sort not in constants.SORT_FIELDS:
+            raise ValueError(
+                f"Cannot sort by {sort!r} (choose from {', '.join(constants.SORT_FIELDS)}).")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset and limit must not be negative.")
+        stop = None if limit is None else offset + limit
 
-    def export_items(self, grocery_list: list[GroceryItem] | None = None) -> None:
-        """Write items marked for purchase (buy=True) to the export text file."""
         if grocery_list is None:
-            grocery_list = self.grocery_list
+            total = len(self._items)
+            if sort is None:
+                ordered = reversed(self._items.values()) if reverse else self._items.values()
+                return list(islice(ordered, offset, stop)), total
 
-        buy_list = [item for item in grocery_list if item.buy is True]
+            key = (sort, reverse)
+            ids = self._sorted_ids.get(key)
+            if ids is None:
+                ordered = sorted(self._items.values(), key=self._sort_key(sort), reverse=reverse)
+                ids = self._sorted_ids[key] = [item.id for item in ordered]
+            return [self._items[item_id] for item_id in ids[offset:stop]], total
 
-        if not buy_list:
-            print("No items to export.")
-            return
+        items = list(grocery_list)
+        if sort is not None:
+            items.sort(key=self._sort_key(sort), reverse=reverse)
+        elif reverse:
+            items.reverse()
+        return items[offset:stop], len(items)
+
+    @staticmethod
+    def _sort_key(sort: str) -> Callable[[GroceryItem], tuple]:
+        """Return the key function for a sort field (case-folded name breaks ties)."""
+        if sort == "name":
+            return lambda item: (item.name.casefold(),)
+        if sort == "store":
+            return lambda item: (item.store.casefold(), item.name.casefold())
+        if sort == "cost":
+            return lambda item: (item.cost_cents, item.name.casefold())
+        return lambda item: (-item.priority, item.name.casefold())
+
+    def export_items(
+        self,
+        grocery_list: Iterable[GroceryItem] | None = None,
+        stores: Iterable[str] | None = None,
+        file_format: str = "txt",
+        path: str | None = None,
+        compress: bool = False,
+        to_stdout: bool = False,
+        echo: bool = True,
+    ) -> "ExportResult | None":
+        """Export items marked for purchase (buy=True) in one streaming pass.
+
+        Items are filtered lazily and written as they are read (see
+        `app.exporter`), with the total accumulated along the way, so memory
+        use does not grow with the list.
 
-        exported_list_file = os.path.join(
-            constants.EXPORT_PATH, constants.EXPORT_LIST)
+        Args:
+            grocery_list: Items to export from (default: the whole list).
+            stores: Only export items from these stores (case-insensitive).
+            file_format: One of `constants.EXPORT_FORMATS`.
+            path: Output file (default: the export file for the format in the
+                data directory).
+            compress: Gzip the output.
+            to_stdout: Write the export to stdout instead of a file.
+            echo: Print each item and the total while writing a text export
+                to a file, as well as where it was written.
+
+        Returns:
+            The export summary, or None if there was nothing to export.
+        """
+        import app.exporter as exporter
 
-        with open(exported_list_file, "w") as file:
-            file.write("\n** Grocery List Export ** \n\n")
+        store_filter = self._store_filter(stores)
+        if grocery_list is None and store_filter is None and self._columns is not None:
+            buy_items: Iterator[GroceryItem] = map(
+                self._items.__getitem__, self._columns.buy_ids())
+        else:
+            source = self._items.values() if grocery_list is None else grocery_list
+            buy_items = (
+                item for item in source
+                if item.buy is True
+                and (store_filter is None or item.store.casefold() in store_filter)
+            )
 
-            for match_num, item in enumerate(buy_list, start=1):
-                match_string = (
-                    f"Item {match_num} "
-                    f"| Name: {item.name} "
-                    f"| Store: {item.store} "
-                    f"| Cost: {item.cost} "
-                    f"| Amount: {item.amount} "
-                    f"| Priority: {item.priority} "
-                    f"| Buy: {item.buy}"
-                )
-                print(match_string)
-                file.write(match_string + "\n")
+        # Peek so an empty export does not create a file.
+        first = next(buy_items, None)
+        if first is None:
+            if echo:
+                print("No items to export.")
+            return None
 
-            total_cost = self.calculate_total_cost(buy_list, round_cost=True)
-            print(f"\nThe total cost is ${total_cost:.2f}\n")
-            file.write(f"\nThe total cost is ${total_cost:.2f}\n")
+        result = exporter.export(
+            chain((first,), buy_items),
+            self.total_from_cents,
+            file_format=file_format,
+            path=path,
+            compress=compress,
+            to_stdout=to_stdout,
+            echo=sys.stdout if echo and not to_stdout else None,
+        )
 
-        print(f"Grocery list exported to {exported_list_file}")
+        if echo and not to_stdout:
+            if file_format != "txt":
+                print(f"\n{result.count} item(s), total cost ${result.total:.2f}")
+            print(f"Grocery list exported to {result.path}")
+        return result
 
     # -------------------------
     # Persistence
     # -------------------------
 
     def save_data(self) -> None:
-        """Persist the current grocery list to JSON.
-
-        Note:
-            This writes the internal/private fields produced by `vars(item)`.
-            A future improvement is to add `GroceryItem.to_dict()`.
-        """
-        export_list = [vars(item) for item in self.grocery_list]
-        utils.save_data(self.grocery_list_path, export_list)
+        """Persist the whole grocery list through the storage backend."""
+        with self._locked():
+            self.backend.save_all(self._items.values())
+            self._version = self._disk_version()
 
     def load_data(self) -> list[GroceryItem]:
-        """Load grocery list data from JSON and return GroceryItem objects.
+        """Load every item from the storage backend.
 
-        Normalizes legacy data:
+        Normalizes legacy JSON data:
         - Keys that start with an underscore (e.g. "_buy" -> "buy")
         - String booleans for buy ("True"/"False") into real bool values
         """
-        grocery_list: list[GroceryItem] = []
-        json_data = utils.load_data(self.grocery_list_path)
+        return self.backend.load()
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Stream GroceryItem objects from the storage backend one at a time.
+
+        For JSON the file is parsed element by element (see
+        `utils.iter_json_array`), so no intermediate list of dicts is built and
+        callers can consume items before the whole file has been read. Journal
+        records are not applied.
+        """
+        return self.backend.iter_items()
+
+    def convert_storage(self, target: str) -> str:
+        """Write the current list with another storage backend.
+
+        Args:
+            target: A GROCERY_APP_STORAGE value ("json", "binary", "sqlite").
+
+        Returns:
+            The path that was written.
+        """
+        if target == self.storage:
+            self.save_data()
+            return self.backend.path
+
+        backend = storage.create_backend(target)
+        try:
+            backend.save_all(self._items.values())
+        finally:
+            backend.close()
+        return backend.path
+
+    def close(self) -> None:
+        """Release resources held by the storage backend."""
+        self.backend.close()
+
+    @staticmethod
+    def item_from_dict(item_dict: dict) -> GroceryItem:
+        """Build a GroceryItem from a persisted dictionary (legacy keys allowed)."""
+        return storage.item_from_dict(item_dict)
+
+    # -------------------------
+    # Batching
+    # -------------------------
+
+    @contextmanager
+    def batch(self) -> Iterator["GroceryList"]:
+        """Defer persistence of add/edit/remove calls until the block exits.
+
+        Changes are written exactly once when the block exits normally. If an
+        exception escapes, the in-memory list is rolled back to its state at
+        the start of the batch (or the last `flush`) and nothing is written.
+        Nested batches join the outermost one.
+
+        Example:
+            with grocery_list.batch():
+                grocery_list.add_item(...)
+                grocery_list.edit_item(...)
+        """
+        if self._pending is not None:
+            yield self
+            return
+
+        self._start_batch()
+        try:
+            yield self
+        except BaseException:
+            self._rollback()
+            raise
+        else:
+            self.flush()
+        finally:
+            self._pending = None
+            self._undo = []
+            self._batch_items = []
+
+    def flush(self) -> None:
+        """Write changes queued by the current batch now and keep batching."""
+        if self._pending is None:
+            return
+
+        changes = self._pending
+        if changes:
+            self._write_changes(changes)
+        # Taken after the write, which may have merged in other processes'
+        # changes, so a later rollback does not drop them.
+        self._start_batch()
+
+    def _start_batch(self) -> None:
+        """Reset the batch queue and remember the state to roll back to."""
+        self._pending = []
+        self._undo = []
+        self._batch_items = list(self._items.values())
+
+    def _rollback(self) -> None:
+        """Restore the in-memory list to the start of the batch."""
+        log_event(logger, logging.WARNING, "rollback", {"changes": len(self._pending or ())})
+        for item, state in reversed(self._undo):
+            (item.name, item.store, item.cost, item.amount,
+             item.priority, item.buy) = state
+
+        self.grocery_list = self._batch_items
+
+    @staticmethod
+    def _item_state(item: GroceryItem) -> tuple:
+        """Return the editable fields of an item (used by the undo log)."""
+        return (item.name, item.store, item.cost, item.amount, item.priority, item.buy)
+
+    # -------------------------
+    # Journal
+    # -------------------------
+
+    def commit(self, op: str, item: GroceryItem) -> None:
+        """Persist a single mutation.
+
+        In journal mode one compact record is appended to the journal and the
+        JSON snapshot is only rewritten once the compaction threshold is hit.
+        Otherwise the full list is rewritten as before.
+
+        Args:
+            op: One of "add", "edit" or "remove".
+            item: The item that was mutated.
+        """
+        self.commit_many([(op, item)])
+
+    def commit_many(self, changes: list[tuple[str, GroceryItem]]) -> None:
+        """Persist several mutations with a single write.
+
+        Inside `batch` the changes are only queued. Each change is logged at
+        INFO (see `_log_changes`).
+
+        Args:
+            changes: (op, item) pairs in the order they were applied.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            self._log_changes(changes)
+
+        if self._pending is not None:
+            self._pending.extend(changes)
+            return
+
+        self._write_changes(changes)
+
+    def _log_changes(self, changes: list[tuple[str, GroceryItem]]) -> None:
+        """Log one structured "mutation" record per change.
+
+        Records carry a snapshot of the item (they are formatted later, on the
+        logging thread). Bigger change sets, such as bulk imports, are logged
+        as a single "mutations" record with counts per operation.
+        """
+        batched = self._pending is not None
+        if len(changes) > constants.LOG_MUTATIONS_MAX:
+            counts = Counter(op for op, _item in changes)
+            log_event(logger, logging.INFO, "mutations", {"batched": batched, **counts})
+            return
+
+        for op, item in changes:
+            if op == "remove":
+                fields = {"op": op, "batched": batched, "id": str(item.id), "name": item.name}
+            else:
+                fields = {"op": op, "batched": batched, **item.to_dict(), "id": str(item.id)}
+            log_event(logger, logging.INFO, "mutation", fields)
+
+    def _write_changes(self, changes: list[tuple[str, GroceryItem]]) -> None:
+        """Write changes to disk.
+
+        Incremental backends write the changes directly (SQLite does its own
+        locking and only touches the changed rows). Otherwise the write is an
+        optimistic read-modify-write under the data-directory lock: if another
+        process has written since this list was loaded, its data is reloaded
+        and these changes are re-applied on top (see `_merge_from_disk`)
+        before the changes are appended to the journal (in journal mode) or
+        the list is rewritten. The lock is only held for the write itself, so
+        parallel writers wait milliseconds rather than losing data.
+        """
+        if self.backend.incremental:
+            self.backend.apply_changes(changes, self._items.values())
+            return
+
+        with self._locked():
+            if self._disk_version() != self._version:
+                self._merge_from_disk(changes)
+
+            if not self.journal_enabled:
+                # Whole-file backends rewrite everything; the sharded backend
+                # rewrites only the shards these changes touched.
+                self.backend.apply_changes(changes, self._items.values())
+                self._version = self._disk_version()
+                return
 
-        for item_dict in json_data:
-            grocery_item = GroceryItem()
+            # A change set that would trip compaction anyway is written
+            # straight to the snapshot instead of being appended first.
+            if self.journal_count + len(changes) >= constants.JOURNAL_COMPACT_THRESHOLD:
+                self.compact()
+                return
 
-            for key, value in item_dict.items():
-                if isinstance(key, str) and key.startswith("_"):
-                    key = key[1:]
+            records = self._change_records(changes)
+            utils.append_records(self.journal_path, records, strict=self.backend.strict)
+            self.journal_count += len(records)
+            self._version = self._disk_version()
 
-                if key == "buy" and isinstance(value, str):
-                    v = value.strip().lower()
-                    if v in ("true", "yes", "y", "1"):
-                        value = True
-                    elif v in ("false", "no", "n", "0"):
-                        value = False
+    def _merge_from_disk(self, changes: list[tuple[str, GroceryItem]]) -> None:
+        """Reload the list written by another process and re-apply `changes`.
 
-                if hasattr(grocery_item, key):
-                    setattr(grocery_item, key, value)
+        Each change replaces the on-disk state of its item, so concurrent
+        writers touching different items both keep their changes and the last
+        writer wins for an item changed by both.
+        """
+        log_event(logger, logging.INFO, "merge", {"changes": len(changes)})
+        self.grocery_list = self.load_data()
+        self.journal_count = 0
+        if os.path.exists(self.journal_path):
+            records = utils.load_records(self.journal_path)
+            self._apply_records(records)
+            self.journal_count = len(records)
+
+        self._apply_records(self._change_records(changes))
 
-            grocery_list.append(grocery_item)
+    @staticmethod
+    def _change_records(changes: list[tuple[str, GroceryItem]]) -> list[dict]:
+        """Return the journal records for (op, item) changes."""
+        records = []
+        for op, item in changes:
+            if op == "remove":
+                records.append({"op": op, "id": item.id})
+            else:
+                records.append({"op": op, "item": item.to_dict()})
+        return records
 
-        return grocery_list
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the data-directory lock (re-entrant within this process)."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with utils.file_lock(self.lock_path):
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def _disk_version(self) -> tuple:
+        """Return a token that changes whenever the persisted list changes."""
+        return (
+            self.backend.version(),
+            utils.file_version(self.journal_path),
+        )
+
+    def replay_journal(self) -> None:
+        """Apply journal records on top of the in-memory list.
+
+        Replay is idempotent: "add"/"edit" records replace the item with the
+        same ID (or append it) and "remove" records for unknown IDs are ignored,
+        so a crash between writing the snapshot and truncating the journal is
+        harmless. When journal mode is disabled (or the backend writes changes
+        incrementally) the journal is compacted right away so its records are
+        not lost.
+        """
+        records = utils.load_records(self.journal_path)
+        self._apply_records(records)
+        self.journal_count = len(records)
+
+        if not self.journal_enabled or self.backend.incremental:
+            self.compact()
+
+    def _apply_records(self, records: list[dict]) -> None:
+        """Apply journal records to the in-memory list (see `replay_journal`)."""
+        for record in records:
+            op = record.get("op")
+
+            if op == "remove":
+                item = self.get_item_from_id(record.get("id"))
+                if item is not None:
+                    self._unindex_item(item)
+            elif op in ("add", "edit"):
+                item = self.item_from_dict(record.get("item", {}))
+                existing_item = self.get_item_from_id(item.id)
+                if existing_item is None:
+                    self._index_item(item)
+                    continue
+
+                # Update in place so the item keeps its position.
+                old_name = existing_item.name
+                for field in ("name", "store", "cost", "amount", "priority", "buy"):
+                    setattr(existing_item, field, getattr(item, field))
+                self._reindex_item(existing_item, old_name)
+
+    def compact(self) -> None:
+        """Rewrite the persisted list and truncate the journal."""
+        with self._locked():
+            self.save_data()
+
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                print(f"Error truncating journal: {exc}")
+
+            self.journal_count = 0
+            self._version = self._disk_version()
+        if logger.isEnabledFor(logging.DEBUG):
+            log_event(logger, logging.DEBUG, "compact", {"items": len(self._items)})
 
     # -------------------------
     # Utilities
@@ -286,17 +1146,183 @@ class GroceryList:
 
     @staticmethod
     def calculate_total_cost(
-        grocery_list: list[GroceryItem],
+        grocery_list: Iterable[GroceryItem],
+        round_cost: bool = False,
+        tax: float | None = None,
+    ) -> float:
+        """Calculate the total cost of a list of items, including sales tax.
+
+        Costs are summed per store in integer cents and each store's tax rate
+        is applied to its subtotal (see `total_from_cents`).
+        """
+        subtotals: dict[str, int] = {}
+        for item in grocery_list:
+            subtotals[item.store] = subtotals.get(item.store, 0) + item.amount * item.cost_cents
+        return GroceryList.total_from_cents(subtotals, round_cost, tax)
+
+    @staticmethod
+    def total_from_cents(
+        store_subtotals: Mapping[str, int],
         round_cost: bool = False,
-        tax: float = 0.0825,
+        tax: float | None = None,
     ) -> float:
-        """Calculate total cost for a list of items."""
-        total_cost = sum(item.amount * item.cost for item in grocery_list)
+        """Return per-store subtotals (cents) plus tax, in dollars.
 
+        Args:
+            store_subtotals: Pre-tax subtotal in cents for each store.
+            round_cost: Round the total to whole dollars (half up).
+            tax: One rate for every store instead of the per-store rates
+                (`constants.STORE_TAX_RATES`); 0 for no tax.
+        """
+        total = money.total_with_tax(store_subtotals, tax)
         if round_cost:
-            total_cost = round(total_cost)
+            total = (total + 50) // 100 * 100
+        return money.from_cents(total)
+
+    @staticmethod
+    def apply_rounding_and_tax(
+        total_cost: float,
+        round_cost: bool = False,
+        tax: float = constants.TAX_RATE_DEFAULT,
+    ) -> float:
+        """Add one tax rate to a dollar subtotal, optionally rounding to whole dollars.
+
+        The subtotal is taken to the nearest cent and the tax is rounded to
+        the cent before the total is rounded.
+        """
+        return GroceryList.total_from_cents({"": money.to_cents(total_cost)}, round_cost, tax)
+
+    def total_cost(
+        self,
+        buy_only: bool = False,
+        round_cost: bool = False,
+        tax: float | None = None,
+    ) -> float:
+        """Return the total cost, with tax, of the whole list (or only buy items).
+
+        Summed over the columnar store when it is enabled, otherwise read from
+        the running aggregates (O(stores) after the first call).
+        """
+        subtotals = self._cost_totals().store_totals(buy_only=buy_only)
+        return self.total_from_cents(subtotals, round_cost, tax)
+
+    def store_totals(self, buy_only: bool = False) -> dict[str, float]:
+        """Return the pre-tax cost (amount * cost) grouped by store."""
+        return {
+            store: money.from_cents(cents)
+            for store, cents in self._cost_totals().store_totals(buy_only=buy_only).items()
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """Return item counts and pre-tax subtotals, overall, per store and per priority.
+
+        Subtotals are in dollars, summed exactly in cents; `buy_total_with_tax`
+        applies each store's tax rate to its buy subtotal. Read from the
+        running aggregates, which are built on the first call
+        and kept up to date on every add, edit and remove afterwards, so this
+        costs O(stores + priorities) rather than a pass over the list.
+        """
+        aggregates = self._cost_aggregates()
+        store_counts = aggregates.store_counts()
+        store_buy_counts = aggregates.store_counts(buy_only=True)
+        store_totals = aggregates.store_totals()
+        store_buy_totals = aggregates.store_totals(buy_only=True)
+        priority_buy_counts = aggregates.priority_counts(buy_only=True)
+
+        return {
+            "items": aggregates.count(),
+            "buy_items": aggregates.count(buy_only=True),
+            "total": money.from_cents(aggregates.total()),
+            "buy_total": money.from_cents(aggregates.total(buy_only=True)),
+            "buy_total_with_tax": self.total_from_cents(store_buy_totals),
+            "stores": {
+                store: {
+                    "items": store_counts[store],
+                    "buy_items": store_buy_counts.get(store, 0),
+                    "total": money.from_cents(store_totals[store]),
+                    "buy_total": money.from_cents(store_buy_totals.get(store, 0)),
+                }
+                for store in sorted(store_counts, key=str.casefold)
+            },
+            "priorities": {
+                priority: {"items": count, "buy_items": priority_buy_counts.get(priority, 0)}
+                for priority, count in aggregates.priority_counts().items()
+            },
+        }
+
+    def check_aggregates(self) -> list[str]:
+        """Recompute `summary` from scratch and report where the running aggregates differ.
+
+        Returns:
+            One message per mismatching value (empty when consistent).
+        """
+        expected = self._summary_from_scratch()
+        actual = self.summary()
+        if actual == expected:
+            return []
+        return [
+            f"{key}: running {actual_value!r} != recomputed {expected_value!r}"
+            for key, actual_value, expected_value in self._diff(actual, expected)
+        ]
+
+    def _summary_from_scratch(self) -> dict[str, Any]:
+        """Build the `summary` data with one plain pass over the items."""
+        # store -> [items, buy items, subtotal, buy subtotal] (cents)
+        stores: dict[str, list[int]] = {}
+        priorities: dict[int, list[int]] = {}
+        for item in self._items.values():
+            line = item.amount * item.cost_cents
+            entry = stores.setdefault(item.store, [0, 0, 0, 0])
+            entry[0] += 1
+            entry[2] += line
+            counts = priorities.setdefault(item.priority, [0, 0])
+            counts[0] += 1
+            if item.buy:
+                entry[1] += 1
+                entry[3] += line
+                counts[1] += 1
+
+        buy_subtotals = {store: entry[3] for store, entry in stores.items() if entry[1]}
+        return {
+            "items": sum(entry[0] for entry in stores.values()),
+            "buy_items": sum(entry[1] for entry in stores.values()),
+            "total": money.from_cents(sum(entry[2] for entry in stores.values())),
+            "buy_total": money.from_cents(sum(buy_subtotals.values())),
+            "buy_total_with_tax": self.total_from_cents(buy_subtotals),
+            "stores": {
+                store: {
+                    "items": entry[0],
+                    "buy_items": entry[1],
+                    "total": money.from_cents(entry[2]),
+                    "buy_total": money.from_cents(entry[3]),
+                }
+                for store, entry in sorted(stores.items(), key=lambda pair: pair[0].casefold())
+            },
+            "priorities": {
+                priority: {"items": priorities[priority][0], "buy_items": priorities[priority][1]}
+                for priority in sorted(priorities, reverse=True)
+            },
+        }
+
+    @staticmethod
+    def _diff(actual: Any, expected: Any, key: str = "") -> Iterator[tuple[str, Any, Any]]:
+        """Yield (dotted key, actual, expected) for every value that differs."""
+        if isinstance(actual, dict) and isinstance(expected, dict):
+            for name in actual.keys() | expected.keys():
+                yield from GroceryList._diff(
+                    actual.get(name), expected.get(name), f"{key}.{name}" if key else str(name))
+        elif actual != expected:
+            yield key, actual, expected
 
-        if tax:
-            total_cost += total_cost * tax
+    def _cost_totals(self) -> "CostAggregates | ColumnarStore":
+        """Return what answers per-store cost totals: the columns if enabled, else the aggregates."""
+        if self._columns is not None:
+            return self._columns
+        return self._cost_aggregates()
 
-        return total_cost
+    def _cost_aggregates(self) -> CostAggregates:
+        """Return the running aggregates, building them on first use."""
+        if self._aggregates is None:
+            self._aggregates = CostAggregates()
+            self._aggregates.rebuild(self._items.values())
+        return self._aggregates
@@ -10,13 +10,36 @@ This module is responsible for:
 - Printing user-facing messages
 
 It delegates all business logic and persistence to `app_core.GroceryList`.
+
+Startup is kept lean: heavy modules (the core, storage backends, importers)
+are imported and the grocery list is loaded only when a command needs it.
+
+When a daemon (`app --mode server`) is running, commands are forwarded to it
+over its Unix socket instead of loading and saving the list locally.
 """
 
 import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-import app.app_core as app_core
 import app.constants as constants
+import app.metrics as metrics
 import app.utils as utils
+from app import IMPORT_START
+
+if TYPE_CHECKING:
+    from app.app_core import GroceryList
+
+# End of module imports, for `--startup-profile`.
+_IMPORT_END = time.perf_counter()
+
+# Subcommands that may prompt for input; only these get the client's stdin
+# when forwarded to a daemon.
+PROMPTING_COMMANDS = frozenset({"remove", "edit", "search", "query"})
 
 
 class Launch:
@@ -27,47 +50,146 @@ class Launch:
     # -------------------------
 
     def __init__(self) -> None:
-        """Create the GroceryList core instance."""
-        self.grocery_app = app_core.GroceryList()
+        """Set up the controller; the GroceryList is created on first use."""
+        self._grocery_app: "GroceryList | None" = None
+        # Seconds spent importing the core and loading the list.
+        self.load_seconds = 0.0
+
+    @property
+    def grocery_app(self) -> "GroceryList":
+        """Return the GroceryList core, loading it from disk on first access."""
+        if self._grocery_app is None:
+            start = time.perf_counter()
+
+            import app.app_core as app_core
+            import app.log_config as log_config
+
+            log_config.configure_logging()
+            self._grocery_app = app_core.GroceryList()
+            self.load_seconds = time.perf_counter() - start
+
+        return self._grocery_app
 
     def launch(self, mode: str = "interactive") -> None:
-        """Run the interactive CLI loop until the user quits."""
+        """Run the interactive CLI loop, the daemon, or the HTTP API until stopped."""
         if mode == "interactive":
             self.run_interactive()
-        elif mode == "ui":
-            # Placeholder for a future UI mode.
-            pass
+        elif mode in ("server", "ui"):
+            # "ui" was a placeholder and is kept as an alias for the daemon.
+            self.run_server()
+        elif mode == "http":
+            self.run_http()
         else:
             print(f"Unknown mode: {mode}")
 
     def run_interactive(self) -> None:
-        """Run the interactive prompt loop (input-driven mode)."""
+        """Run the interactive prompt loop (input-driven mode).
+
+        The session runs inside a `GroceryList.batch`, so changes are written
+        once on quit (or whenever the user types "save") instead of after every
+        command. A command that fails or is interrupted with Ctrl-C ends only
+        that command; changes made so far are kept (and written if it failed).
+        """
         print("")
         print(utils.get_line_delimiter())
         print("Welcome to the Grocery App List Manager!")
         print(utils.get_line_delimiter())
 
-        while True:
-            command = input(
-                "\nEnter a command (add, remove, edit, list, export, search, or quit): "
-            ).strip().lower()
-
-            if command == "add":
-                self.handle_add_command()
-            elif command == "remove":
-                self.handle_remove_command()
-            elif command == "edit":
-                self.handle_edit_command()
-            elif command == "list":
-                self.handle_list_command()
-            elif command == "export":
-                self.grocery_app.export_items()
-            elif command == "search":
-                self.handle_search_command()
-            elif command == "quit":
-                break
-            else:
-                print("Invalid command. Please try again.")
+        with self.grocery_app.batch():
+            while True:
+                try:
+                    command = input(
+                        "\nEnter a command "
+                        "(add, remove, edit, list, export, search, query, top, save, or quit): "
+                    ).strip().lower()
+                except (EOFError, KeyboardInterrupt):
+                    print("")
+                    break
+
+                if command == "quit":
+                    break
+
+                try:
+                    self.run_command(command)
+                except (ValueError, IndexError) as exc:
+                    print(f"Invalid input: {exc}")
+                except KeyboardInterrupt:
+                    print("\nCommand cancelled.")
+                except Exception as exc:
+                    print(f"Error: {exc}")
+                    # Keep the session's changes: write them now rather than
+                    # letting the error end the batch and roll them back.
+                    self.grocery_app.flush()
+
+    def run_server(self) -> None:
+        """Keep the grocery list in memory and serve commands over a Unix socket.
+
+        The list is loaded once up front. Each client command then runs against
+        the in-memory list and only its own changes are written (cheapest with
+        journal mode or the SQLite backend).
+        """
+        import app.daemon as daemon
+
+        grocery_app = self.grocery_app
+        try:
+            daemon.serve(
+                constants.DAEMON_SOCKET,
+                self.handle_request,
+                constants.DAEMON_IDLE_TIMEOUT,
+            )
+        finally:
+            grocery_app.close()
+
+    def run_http(self) -> None:
+        """Serve the grocery list over the HTTP JSON API (see `http_api`)."""
+        import app.http_api as http_api
+
+        api = http_api.GroceryApi(self.grocery_app)
+        try:
+            api.serve(constants.HTTP_HOST, constants.HTTP_PORT)
+        finally:
+            self.grocery_app.close()
+
+    def handle_request(self, argv: list[str], cwd: str) -> None:
+        """Run a command forwarded by a client (see `daemon.forward`).
+
+        Args:
+            argv: The client's command-line arguments.
+            cwd: The client's working directory, used to resolve file arguments.
+        """
+        parser = build_parser()
+        args = parser.parse_args(argv)
+
+        if args.command == "import":
+            args.file = os.path.join(cwd, args.file)
+        elif args.command == "export" and args.output is not None:
+            args.output = os.path.join(cwd, args.output)
+
+        run(self, parser, args, forward=False)
+
+    def run_command(self, command: str) -> None:
+        """Dispatch one interactive command."""
+        if command == "add":
+            self.handle_add_command()
+        elif command == "remove":
+            self.handle_remove_command()
+        elif command == "edit":
+            self.handle_edit_command()
+        elif command == "list":
+            self.handle_list_command()
+        elif command == "export":
+            self.grocery_app.export_items()
+        elif command == "search":
+            self.handle_search_command()
+        elif command == "query":
+            self.handle_query_command()
+        elif command == "top":
+            self.handle_top_command()
+        elif command == "save":
+            self.grocery_app.flush()
+            print("Changes saved.")
+        else:
+            print("Invalid command. Please try again.")
 
     # -------------------------
     # Command handlers
@@ -114,13 +236,14 @@ class Launch:
             name = input("\nEnter the item name to remove: ").strip()
 
         print("")
-        matches = self.grocery_app.search_item_name(name)
+        matches, fuzzy = self._find_matches(name)
 
         if not matches:
             print(f"I'm sorry, I could not find a match for '{name}'.")
             return
 
-        if len(matches) > 1:
+        # Similar (fuzzy) matches are never removed without a choice.
+        if len(matches) > 1 or fuzzy:
             for match_num, match in enumerate(matches, start=1):
                 print(
                     f"{match_num}. "
@@ -168,7 +291,7 @@ class Launch:
 
             target_item = " ".join(raw_name).strip() if isinstance(
                 raw_name, list) else str(raw_name).strip()
-            matches = self.grocery_app.search_item_name(target_item)
+            matches, fuzzy = self._find_matches(target_item)
 
             if not matches:
                 print(
@@ -176,9 +299,12 @@ class Launch:
                 return
 
             item_id = getattr(args, "id", None)
-            if len(matches) > 1 and item_id is None:
-                print(
-                    f"Multiple items match '{target_item}'. Please rerun with --id to choose one:")
+            if (len(matches) > 1 or fuzzy) and item_id is None:
+                if fuzzy:
+                    print("Please rerun with --id to choose one:")
+                else:
+                    print(
+                        f"Multiple items match '{target_item}'. Please rerun with --id to choose one:")
                 for match_num, match in enumerate(matches, start=1):
                     print(
                         f"{match_num}. "
@@ -193,9 +319,8 @@ class Launch:
                 return
 
             if item_id is not None:
-                match_item = next(
-                    (m for m in matches if m.id == item_id), None)
-                if match_item is None:
+                match_item = self.grocery_app.get_item_from_id(item_id)
+                if match_item is None or match_item not in matches:
                     print(
                         f"No match found for id={item_id} under '{target_item}'.")
                     return
@@ -234,13 +359,13 @@ class Launch:
         target_item = input("\nWhat item would you like to edit: ").strip()
         print("\nRetrieving your matching items...\n")
 
-        matches = self.grocery_app.search_item_name(target_item)
+        matches, fuzzy = self._find_matches(target_item)
         if not matches:
             print(
                 f"\nI'm sorry, I could not find a match for '{target_item}'.\n")
             return
 
-        if len(matches) > 1:
+        if len(matches) > 1 or fuzzy:
             for match_num, match in enumerate(matches, start=1):
                 print(
                     f"{match_num}. "
@@ -269,9 +394,114 @@ class Launch:
             id=match_item.id,
         )
 
-    def handle_list_command(self) -> None:
-        """List all items currently in the grocery list."""
-        self.grocery_app.list_items()
+    def handle_import_command(self, args: argparse.Namespace) -> None:
+        """Bulk-import items from a CSV or JSON Lines file."""
+        import app.importer as importer
+
+        file_format = args.format or importer.detect_format(args.file)
+        if file_format is None:
+            print("Unknown file type. Use a .csv or .jsonl file, or pass --format.")
+            return
+
+        try:
+            added, errors = self.grocery_app.add_items(
+                importer.iter_rows(args.file, file_format))
+        except (OSError, ValueError) as exc:
+            print(f"Error reading {args.file}: {exc}")
+            print("Nothing was imported.\n")
+            return
+
+        for row_number, error in errors[:constants.IMPORT_ERRORS_SHOWN]:
+            print(f"Row {row_number}: {error}")
+        if len(errors) > constants.IMPORT_ERRORS_SHOWN:
+            print(f"... and {len(errors) - constants.IMPORT_ERRORS_SHOWN} more.")
+
+        print(f"\nImported {added} item(s), skipped {len(errors)} invalid row(s).\n")
+
+    def handle_convert_command(self, args: argparse.Namespace) -> None:
+        """Write the grocery list in another storage format."""
+        path = self.grocery_app.convert_storage(args.to)
+        print(f"\nGrocery list written to {path}")
+        if args.to != self.grocery_app.storage:
+            print(f"Set GROCERY_APP_STORAGE={args.to} to use it.\n")
+
+    def handle_summary_command(self, args: argparse.Namespace) -> None:
+        """Print item counts and subtotals per store and priority (or check them)."""
+        if args.check:
+            problems = self.grocery_app.check_aggregates()
+            for problem in problems:
+                print(problem)
+            print("Aggregates are consistent." if not problems
+                  else f"{len(problems)} aggregate(s) differ from a full recount.")
+            return
+
+        summary = self.grocery_app.summary()
+        if args.json:
+            print(json.dumps(summary, indent=2))
+            return
+
+        print("")
+        print(utils.get_line_delimiter())
+        print(f"Items: {summary['items']} ({summary['buy_items']} to buy)")
+        print(f"Subtotal: ${summary['total']:.2f} (to buy: ${summary['buy_total']:.2f}, "
+              f"${summary['buy_total_with_tax']:.2f} with tax)")
+        if summary["stores"]:
+            print(f"\n{'Store':<24}{'Items':>8}{'To buy':>8}{'Subtotal':>14}{'To buy $':>14}")
+            for store, entry in summary["stores"].items():
+                print(f"{store:<24}{entry['items']:>8}{entry['buy_items']:>8}"
+                      f"{entry['total']:>14.2f}{entry['buy_total']:>14.2f}")
+            print(f"\n{'Priority':<24}{'Items':>8}{'To buy':>8}")
+            for priority, entry in summary["priorities"].items():
+                print(f"{priority:<24}{entry['items']:>8}{entry['buy_items']:>8}")
+        print(utils.get_line_delimiter())
+        print("")
+
+    def handle_stats_command(self, args: argparse.Namespace) -> None:
+        """Print the instrumentation metrics (see `metrics`), or reset them."""
+        if args.reset:
+            metrics.reset()
+            print("Metrics reset.")
+            return
+
+        data = metrics.report()
+        if args.json:
+            print(json.dumps(data, indent=2))
+            return
+
+        if not metrics.ENABLED:
+            print("Instrumentation is off; set GROCERY_APP_METRICS=1 to record metrics.\n")
+        print(metrics.format_report(data))
+
+    def handle_export_command(self, args: argparse.Namespace) -> None:
+        """Export the items marked for purchase in the requested format."""
+        output = args.output
+        if output is not None and not args.stdout:
+            output = os.path.abspath(output)
+
+        try:
+            self.grocery_app.export_items(
+                stores=args.store,
+                file_format=args.format,
+                path=output,
+                compress=args.gzip,
+                to_stdout=args.stdout,
+                echo=not args.quiet,
+            )
+        except OSError as exc:
+            print(f"Error writing export: {exc}")
+
+    def handle_list_command(self, args: argparse.Namespace | None = None) -> None:
+        """List the items in the grocery list (a page at a time when interactive)."""
+        if args is None:
+            self._page_through(
+                lambda offset, limit: self.grocery_app.list_items(offset=offset, limit=limit))
+            return
+
+        try:
+            self.grocery_app.list_items(
+                sort=args.sort, reverse=args.reverse, offset=args.offset, limit=args.limit)
+        except ValueError as exc:
+            print(f"Invalid input: {exc}")
 
     def handle_search_command(self, args: argparse.Namespace | None = None) -> None:
         """Search for items by name prefix and print matching results."""
@@ -290,11 +520,82 @@ class Launch:
         ):
             search_keyword = search_keyword[1:-1].strip()
 
-        matches = self.grocery_app.search_item_name(search_keyword)
+        stores = getattr(args, "store", None)
+        if getattr(args, "fuzzy", False):
+            matches = self.grocery_app.search_fuzzy(search_keyword, stores=stores)
+        else:
+            matches = self.grocery_app.search_item_name(search_keyword, stores=stores)
+
+        empty_message = "No items match the provided search keyword."
+        if args is None:
+            self._page_through(
+                lambda offset, limit: self._print_matches(
+                    matches, empty_message, offset=offset, limit=limit))
+            return
+
+        try:
+            self._print_matches(
+                matches,
+                empty_message,
+                sort=args.sort,
+                reverse=args.reverse,
+                offset=args.offset,
+                limit=args.limit,
+            )
+        except ValueError as exc:
+            print(f"Invalid input: {exc}")
+
+    def handle_query_command(self, args: argparse.Namespace | None = None) -> None:
+        """Print the items matching every `--where` condition (e.g. priority>=4)."""
+        if args and args.where:
+            clauses = args.where
+        else:
+            clauses = [input(
+                "\nConditions (e.g. priority>=4 and buy and store=Costco and cost<10): ")]
+
+        try:
+            if args and args.explain:
+                print(f"\nPlan: {self.grocery_app.plan_query(clauses)}")
+            matches = self.grocery_app.query(clauses)
+        except ValueError as exc:
+            print(f"Invalid query: {exc}")
+            return
+
+        self._print_matches(matches, "No items match the query.")
+
+    def handle_top_command(self, args: argparse.Namespace | None = None) -> None:
+        """Print the most important items to buy, highest priority first."""
+        k = args.k if args else constants.TOP_K
+        if k < 1:
+            print("--k must be at least 1.")
+            return
+
+        buy_only = not (args and args.all)
+        matches = self.grocery_app.top_items(k, buy_only=buy_only)
+        self._print_matches(
+            matches,
+            "No items are marked to buy." if buy_only else "The grocery list is empty.",
+        )
+
+    def _print_matches(
+        self,
+        matches: list,
+        empty_message: str,
+        sort: str | None = None,
+        reverse: bool = False,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> int:
+        """Print a page of numbered search/query results (see `GroceryList.page_items`).
+
+        Returns:
+            The total number of matches.
+        """
+        page, total = self.grocery_app.page_items(matches, sort, reverse, offset, limit)
         print("")
 
-        if matches:
-            for match_num, match in enumerate(matches, start=1):
+        if page:
+            for match_num, match in enumerate(page, start=offset + 1):
                 print(
                     f"{match_num}. "
                     f"| name: {match.name} "
@@ -304,10 +605,52 @@ class Launch:
                     f"| priority: {match.priority} "
                     f"| buy: {match.buy}"
                 )
-        else:
-            print("No items match the provided search keyword.")
+        elif not total:
+            print(empty_message)
+        if total and len(page) < total:
+            print(self.grocery_app.page_footer(offset, len(page), total))
 
         print(utils.get_line_delimiter())
+        return total
+
+    @staticmethod
+    def _page_through(show: Callable[[int, int], int]) -> None:
+        """Show rows `constants.PAGE_SIZE` at a time, asking before each next page.
+
+        Args:
+            show: Prints the rows at (offset, limit) and returns the total.
+        """
+        offset = 0
+        while True:
+            total = show(offset, constants.PAGE_SIZE)
+            offset += constants.PAGE_SIZE
+            if offset >= total:
+                return
+
+            try:
+                reply = input(
+                    f"-- Enter for the next {min(constants.PAGE_SIZE, total - offset)} "
+                    "items, or q to stop: ")
+            except EOFError:
+                print("")
+                return
+            if reply.strip().lower() in ("q", "quit"):
+                return
+
+    def _find_matches(self, name: str) -> tuple[list, bool]:
+        """Return (matches, fuzzy) for a name typed in the remove/edit flows.
+
+        Prefix matches are preferred; if there are none, similar names are
+        offered instead (fuzzy is then True).
+        """
+        matches = self.grocery_app.search_item_name(name)
+        if matches or not name:
+            return matches, False
+
+        matches = self.grocery_app.search_fuzzy(name)
+        if matches:
+            print(f"No items start with '{name}'. Did you mean:")
+        return matches, True
 
     # -------------------------
     # Small parsing helpers
@@ -540,14 +883,27 @@ class Launch:
             print("Invalid input. Please enter true|yes OR false|no")
 
 
-def main() -> None:
-    """Parse CLI arguments and route commands to the application."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the `app` command."""
     parser = argparse.ArgumentParser(description="Grocery App List Manager")
     parser.add_argument(
         "--mode",
-        choices=["cli", "ui", "interactive"],
+        choices=["cli", "server", "http", "ui", "interactive"],
         default="interactive",
-        help="Choose how to run the app: cli, ui, or interactive (default).",
+        help=(
+            "Choose how to run the app: cli, server (socket daemon), "
+            "http (JSON API), or interactive (default)."
+        ),
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run the command directly even if a daemon is running.",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Print import, load, and dispatch timings to stderr on exit.",
     )
 
     subparser = parser.add_subparsers(dest="command")
@@ -595,8 +951,60 @@ def main() -> None:
         help="Set buy flag (yes/no/true/false or y/n/1/0). Omit to keep current.",
     )
 
-    subparser.add_parser("list", help="List all items")
-    subparser.add_parser("export", help="Export 'buy' items")
+    import_parser = subparser.add_parser(
+        "import", help="Bulk-import items from a CSV or JSON Lines file")
+    import_parser.add_argument("file", help="Path to a .csv or .jsonl file")
+    import_parser.add_argument(
+        "--format",
+        choices=constants.IMPORT_FORMATS,
+        default=None,
+        help="File format (default: detected from the file extension).",
+    )
+
+    convert_parser = subparser.add_parser(
+        "convert", help="Write the grocery list in another storage format")
+    convert_parser.add_argument(
+        "--to",
+        required=True,
+        choices=constants.STORAGE_FORMATS,
+        help="Target storage: json, binary, sqlite, or sharded.",
+    )
+
+    list_parser = subparser.add_parser("list", help="List all items")
+    add_paging_arguments(list_parser)
+    export_parser = subparser.add_parser("export", help="Export 'buy' items")
+    export_parser.add_argument(
+        "--store",
+        action="append",
+        default=None,
+        help="Only export items from this store (repeatable).",
+    )
+    export_parser.add_argument(
+        "--format",
+        choices=constants.EXPORT_FORMATS,
+        default="txt",
+        help="Output format: txt (default), csv, jsonl, or md.",
+    )
+    export_parser.add_argument(
+        "--output",
+        default=None,
+        help="Output file (default: export_grocery_list.<format> in the data directory).",
+    )
+    export_parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip the output (adds .gz to the default file name).",
+    )
+    export_parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Write the export to stdout instead of a file.",
+    )
+    export_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not echo the exported items to the console.",
+    )
 
     search_parser = subparser.add_parser("search", help="Search an item")
     search_parser.add_argument(
@@ -604,15 +1012,155 @@ def main() -> None:
         nargs="+",
         help="Search prefix for item name (positional). Use quotes for multi-word searches.",
     )
+    search_parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Typo-tolerant search ranked by similarity (e.g. 'chese' finds 'cheese').",
+    )
+    search_parser.add_argument(
+        "--store",
+        action="append",
+        default=None,
+        help="Only search items from this store (repeatable).",
+    )
+    add_paging_arguments(search_parser)
+
+    query_parser = subparser.add_parser(
+        "query", help="List items matching field conditions")
+    query_parser.add_argument(
+        "--where",
+        action="append",
+        required=True,
+        help=(
+            "Condition such as 'priority>=4', 'buy', 'store=Costco' or 'cost<10' "
+            "(repeatable; conditions may also be joined with 'and')."
+        ),
+    )
+    query_parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print which index the query uses before the results.",
+    )
+
+    top_parser = subparser.add_parser(
+        "top", help="Show the most important items to buy")
+    top_parser.add_argument(
+        "--k",
+        type=int,
+        default=constants.TOP_K,
+        help=f"Number of items to show (default: {constants.TOP_K}).",
+    )
+    top_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Include items not marked to buy.",
+    )
+
+    summary_parser = subparser.add_parser(
+        "summary", help="Show item counts and costs per store and priority")
+    summary_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the summary as JSON.",
+    )
+    summary_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Recompute the totals from scratch and report any mismatch.",
+    )
+
+    stats_parser = subparser.add_parser(
+        "stats", help="Show per-operation timings and counters")
+    stats_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the metrics as JSON.",
+    )
+    stats_parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Clear the recorded metrics.",
+    )
+
+    return parser
+
+
+def add_paging_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --sort/--reverse/--limit/--offset options shared by list and search."""
+    parser.add_argument(
+        "--sort",
+        choices=constants.SORT_FIELDS,
+        default=None,
+        help="Sort by name, store, cost, or priority (highest first).",
+    )
+    parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Reverse the order.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Show at most this many items.",
+    )
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Skip this many items first.",
+    )
 
-    args = parser.parse_args()
-    app = Launch()
 
+def main() -> None:
+    """Parse CLI arguments and route commands to the application."""
+    parse_start = time.perf_counter()
+    argv = sys.argv[1:]
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    parse_end = time.perf_counter()
+
+    app = Launch()
+    try:
+        run(app, parser, args, argv=argv)
+    finally:
+        if args.startup_profile:
+            print_startup_profile(app, parse_start, parse_end)
+
+
+def run(
+    app: Launch,
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    argv: list[str] | None = None,
+    forward: bool = True,
+) -> None:
+    """Run the selected mode or subcommand.
+
+    Args:
+        app: The CLI controller.
+        parser: The parser `args` came from (used to print help).
+        args: Parsed command-line arguments.
+        argv: The raw arguments, sent to the daemon when one is running.
+        forward: Try the daemon first. False when already running inside it.
+    """
     # If user asked for CLI mode but didn't provide a subcommand, show help and quit.
     if args.mode == "cli" and not args.command:
         parser.print_help()
         return
 
+    # Hand the command to a running daemon, if any (falls through if none).
+    if forward and not args.no_daemon and args.mode not in ("server", "http", "ui"):
+        import app.daemon as daemon
+
+        interactive = args.command is None or args.command in PROMPTING_COMMANDS
+        if daemon.forward(
+            constants.DAEMON_SOCKET,
+            argv if argv is not None else sys.argv[1:],
+            interactive=interactive,
+        ):
+            return
+
     # If no subcommand was provided, run the selected app mode.
     if not args.command:
         app.launch(mode=args.mode)
@@ -627,11 +1175,38 @@ def main() -> None:
         case "edit":
             app.handle_edit_command(args)
         case "list":
-            app.grocery_app.list_items()
+            app.handle_list_command(args)
         case "export":
-            app.grocery_app.export_items()
+            app.handle_export_command(args)
         case "search":
             app.handle_search_command(args)
+        case "query":
+            app.handle_query_command(args)
+        case "top":
+            app.handle_top_command(args)
+        case "import":
+            app.handle_import_command(args)
+        case "convert":
+            app.handle_convert_command(args)
+        case "summary":
+            app.handle_summary_command(args)
+        case "stats":
+            app.handle_stats_command(args)
+
+
+def print_startup_profile(app: Launch, parse_start: float, parse_end: float) -> None:
+    """Print a one-line JSON startup profile (milliseconds) to stderr."""
+    end = time.perf_counter()
+    load = app.load_seconds
+    profile = {
+        "import_ms": (_IMPORT_END - IMPORT_START) * 1000,
+        "parse_ms": (parse_end - parse_start) * 1000,
+        "load_ms": load * 1000,
+        "dispatch_ms": (end - parse_end - load) * 1000,
+        "total_ms": (end - IMPORT_START) * 1000,
+    }
+    profile = {key: round(value, 3) for key, value in profile.items()}
+    print(f"startup-profile: {json.dumps(profile)}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,318 @@
+"""
+bench.py
+
+Offline benchmark suite for the core `GroceryList` operations.
+
+For each list size a synthetic list is generated in a temporary
+`GROCERY_APP_DATA_DIR` and every operation is timed `--repeat` times (the
+best run is reported):
+
+- add_item, edit_item, remove_item: `--ops` mutations inside one batch, so
+  they measure the in-memory and index work (the write is save_data's job)
+- search_item_name: `--ops` prefix searches for existing names
+- save_data / load_data: one full write / read through the storage backend
+- export_items: one streaming text export of the buy items
+- calculate_total_cost: one pass over the whole list
+
+Results can be printed as JSON, saved as a baseline, and compared against a
+saved baseline; the exit status is 1 if any operation got slower than the
+baseline by more than `--tolerance`.
+
+Usage:
+    python -m app.bench                          # 1k, 100k and 1M items
+    python -m app.bench --sizes 1000 100000 --save-baseline bench_baseline.json
+    python -m app.bench --sizes 1000 100000 --baseline bench_baseline.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import redirect_stdout
+
+import app.constants as constants
+
+# List sizes benchmarked by default
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# Words used to build synthetic item names
+WORDS = (
+    "apples", "bananas", "bread", "butter", "carrots", "cheese", "chicken",
+    "coffee", "eggs", "flour", "garlic", "grapes", "ham", "honey", "lettuce",
+    "milk", "onions", "pasta", "pepper", "rice", "salt", "spinach", "sugar",
+    "tea", "tomatoes", "tuna", "yogurt",
+)
+
+# Stores used for synthetic items
+STORES = ("Costco", "Kroger", "Walmart", "Aldi", "Target", "Safeway")
+
+# Operations in report order
+OPERATIONS = (
+    "add_item",
+    "edit_item",
+    "remove_item",
+    "search_item_name",
+    "save_data",
+    "load_data",
+    "export_items",
+    "calculate_total_cost",
+)
+
+
+def synthetic_records(size: int, rng: random.Random) -> list[dict]:
+    """Return `size` random item records with unique names and IDs."""
+    return [
+        {
+            "name": f"{rng.choice(WORDS)} {number}",
+            "store": rng.choice(STORES),
+            "cost": round(rng.uniform(0.25, 40.0), 2),
+            "amount": rng.randint(1, 6),
+            "priority": rng.randint(1, 5),
+            "buy": rng.random() < 0.5,
+            "id": rng.getrandbits(127) + 1,
+        }
+        for number in range(size)
+    ]
+
+
+def summarize(times: list[float], ops: int) -> dict:
+    """Return the report entry for the run times of one operation."""
+    best = min(times)
+    return {
+        "ops": ops,
+        "best_s": round(best, 6),
+        "mean_s": round(sum(times) / len(times), 6),
+        "per_op_us": round(best / ops * 1e6, 3),
+    }
+
+
+def time_call(func: Callable[[], object]) -> float:
+    """Return how long one call takes, in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_size(size: int, repeat: int, ops: int, seed: int) -> dict[str, dict]:
+    """Benchmark every operation on a list of `size` items."""
+    from app.app_core import GroceryList
+    from app.grocery_item import GroceryItem
+
+    rng = random.Random(seed)
+    timings: dict[str, list[float]] = {op: [] for op in OPERATIONS}
+
+    with redirect_stdout(io.StringIO()):
+        grocery_app = GroceryList()
+    grocery_app.grocery_list = [
+        GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+
+    try:
+        for _ in range(repeat):
+            timings["save_data"].append(time_call(grocery_app.save_data))
+            timings["load_data"].append(time_call(grocery_app.load_data))
+
+        items = grocery_app.grocery_list
+        queries = [item.name[:-1] for item in rng.choices(items, k=ops)]
+        for _ in range(repeat):
+            timings["search_item_name"].append(time_call(
+                lambda: [grocery_app.search_item_name(query) for query in queries]))
+            timings["calculate_total_cost"].append(time_call(
+                lambda: GroceryList.calculate_total_cost(items)))
+
+        # Mutations run in one batch (written once at the end, untimed) and
+        # each round removes what it added, so the size stays the same.
+        with grocery_app.batch():
+            for round_number in range(repeat):
+                added = []
+                timings["add_item"].append(time_call(lambda: added.extend(
+                    grocery_app.add_item(
+                        f"bench {round_number} {number}", rng.choice(STORES),
+                        1.5, 1, 3, True)
+                    for number in range(ops))))
+
+                targets = [(item.id, rng.randint(1, 5)) for item in rng.choices(items, k=ops)]
+                timings["edit_item"].append(time_call(lambda: [
+                    grocery_app.edit_item(id=item_id, cost=2.0, priority=priority)
+                    for item_id, priority in targets]))
+
+                timings["remove_item"].append(time_call(lambda: [
+                    grocery_app.remove_item(item.name, item.id) for item in added]))
+
+        export_path = os.path.join(tempfile.gettempdir(), f"bench_export_{os.getpid()}.txt")
+        try:
+            for _ in range(repeat):
+                timings["export_items"].append(time_call(
+                    lambda: grocery_app.export_items(path=export_path, echo=False)))
+        finally:
+            if os.path.exists(export_path):
+                os.remove(export_path)
+    finally:
+        grocery_app.close()
+
+    single = ("save_data", "load_data", "export_items", "calculate_total_cost")
+    return {
+        op: summarize(timings[op], 1 if op in single else ops)
+        for op in OPERATIONS
+    }
+
+
+def use_data_dir(data_dir: str) -> None:
+    """
+    Point this process (and its child processes) at another data directory.
+
+    Rebinds `constants.EXPORT_PATH` and the paths derived from it at import
+    time (the daemon socket and the log file), and sets GROCERY_APP_DATA_DIR
+    for child processes, so nothing touches the real data directory.
+
+    Args:
+        data_dir: Directory to use instead of the configured one.
+    """
+    import app.log_config as log_config
+
+    os.environ["GROCERY_APP_DATA_DIR"] = data_dir
+    constants.EXPORT_PATH = data_dir
+    constants.DAEMON_SOCKET = os.path.join(
+        data_dir, os.path.basename(constants.DAEMON_SOCKET))
+    log_config.log_file_name = os.path.join(data_dir, constants.LOG_FILE)
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the suite in a temporary data directory and return the report."""
+    data_dir = tempfile.mkdtemp(prefix="grocery_bench_")
+    use_data_dir(data_dir)
+    if args.storage:
+        constants.STORAGE = args.storage
+
+    results = {}
+    try:
+        for size in args.sizes:
+            print(f"Benchmarking {size:,} items...", file=sys.stderr)
+            results[str(size)] = bench_size(size, args.repeat, args.ops, args.seed)
+            # Start the next size from an empty data directory.
+            shutil.rmtree(data_dir)
+            os.makedirs(data_dir)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": constants.STORAGE,
+            "journal": constants.JOURNAL_ENABLED,
+            "repeat": args.repeat,
+            "ops": args.ops,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """
+    Compare per-operation times with a baseline report.
+
+    Returns:
+        One entry per (size, operation) present in both reports, with the
+        ratio of current to baseline time and whether it is a regression.
+    """
+    rows = []
+    for size, operations in report["results"].items():
+        for op, entry in operations.items():
+            base = baseline.get("results", {}).get(size, {}).get(op)
+            if not base or not base.get("per_op_us"):
+                continue
+            ratio = entry["per_op_us"] / base["per_op_us"]
+            rows.append({
+                "size": size,
+                "op": op,
+                "baseline_us": base["per_op_us"],
+                "current_us": entry["per_op_us"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + tolerance,
+            })
+    return rows
+
+
+def print_report(report: dict, comparison: list[dict] | None) -> None:
+    """Print the results (and baseline comparison) as a table."""
+    ratios = {(row["size"], row["op"]): row for row in comparison or []}
+
+    for size, operations in report["results"].items():
+        print(f"\n{int(size):,} items")
+        for op, entry in operations.items():
+            line = f"  {op:<22}{entry['per_op_us']:>14.3f} us/op  ({entry['ops']} op(s))"
+            row = ratios.get((size, op))
+            if row is not None:
+                flag = "  REGRESSION" if row["regression"] else ""
+                line += f"  x{row['ratio']:.2f} vs baseline{flag}"
+            print(line)
+
+
+def main() -> None:
+    """Parse arguments, run the suite, report and compare."""
+    parser = argparse.ArgumentParser(description="Benchmark core GroceryList operations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="List sizes to benchmark (default: 1000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per operation; the best is reported (default: 3)")
+    parser.add_argument("--ops", type=int, default=1000,
+                        help="Adds, edits, removes and searches per run (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for the synthetic data (default: 0)")
+    parser.add_argument("--storage", choices=constants.STORAGE_FORMATS,
+                        default=None, help="Storage backend (default: GROCERY_APP_STORAGE)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the report as JSON")
+    parser.add_argument("--output", default=None,
+                        help="Also write the JSON report to this file")
+    parser.add_argument("--save-baseline", default=None,
+                        help="Write the JSON report to this file as the new baseline")
+    parser.add_argument("--baseline", default=None,
+                        help="Compare against this baseline report")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs the baseline (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.ops < 1 or any(size < 1 for size in args.sizes):
+        parser.error("--sizes, --repeat and --ops must be positive")
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as file:
+                baseline = json.load(file)
+        except (OSError, json.JSONDecodeError) as exc:
+            parser.error(f"Cannot read baseline {args.baseline}: {exc}")
+
+    report = run(args)
+    comparison = None
+    if baseline is not None:
+        comparison = compare(report, baseline, args.tolerance)
+        report["comparison"] = comparison
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, comparison)
+
+    if comparison and any(row["regression"] for row in comparison):
+        regressions = sum(row["regression"] for row in comparison)
+        print(f"\n{regressions} operation(s) slower than the baseline.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""
+check.py
+
+Offline regression checks for behaviour that the benchmarks do not cover.
+
+Every check runs against synthetic data (see `bench.synthetic_records`) in a
+temporary `GROCERY_APP_DATA_DIR`:
+
+- aggregates: random adds, edits and removes (and a rolled-back batch) keep
+  `GroceryList.check_aggregates()` consistent, and the columnar store agrees
+  with the running aggregates
+- round_trip: every storage backend loads back exactly what it saved, in
+  order, including after incremental changes; SQLite rejects a clashing ID
+- damaged_shard: a truncated shard, or one holding something other than
+  items, is quarantined rather than overwritten
+- money: cent rounding and per-store tax
+- damaged_snapshot: a binary snapshot cut short anywhere is quarantined
+  rather than loaded or overwritten
+- concurrent_writers: parallel `app add` processes (with every backend, and
+  with the journal) do not lose each other's items
+- daemon: a stale socket file is ignored and replaced; a daemon started with
+  `--mode server` runs commands sent by clients (including one with unread
+  piped input), saves their changes and removes its socket on SIGTERM
+- http: concurrent API writes share one flush and are on disk when answered;
+  invalid input gets 400, a failed flush or a server bug gets 500
+
+Each check prints ok or its failures; the exit status is 1 if any failed.
+
+Usage:
+    python -m app.check
+    python -m app.check --size 20000 --ops 5000 --only aggregates
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import redirect_stdout
+
+import app.constants as constants
+from app.bench import STORES, synthetic_records, use_data_dir
+
+# Parallel `app add` processes started by the concurrent-writers check, and
+# the most items in the list they add to
+WRITERS = 20
+WRITER_LIST_SIZE = 1000
+
+# Seconds the daemon check waits for the daemon to start, answer or stop
+DAEMON_WAIT = 10.0
+
+# Concurrent writes sent by the HTTP check
+HTTP_WRITES = 50
+
+
+def check_aggregates(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Mutate a list at random and compare the aggregates with a recount."""
+    from app.app_core import GroceryList
+    from app.columnar import ColumnarStore
+    from app.grocery_item import GroceryItem
+
+    failures = []
+    with redirect_stdout(io.StringIO()):
+        grocery_app = GroceryList()
+    grocery_app.grocery_list = [
+        GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+    grocery_app.summary()
+
+    try:
+        with grocery_app.batch():
+            ids = list(grocery_app._items)
+            for number in range(ops):
+                roll = rng.random()
+                if roll < 0.3 or not ids:
+                    item = grocery_app.add_item(
+                        f"check {number}", rng.choice(STORES), rng.choice((0.1, 1.005, 2.675)),
+                        rng.randint(1, 9), rng.randint(1, 5), rng.random() < 0.5)
+                    ids.append(item.id)
+                elif roll < 0.6:
+                    item = grocery_app.get_item_from_id(ids.pop(rng.randrange(len(ids))))
+                    grocery_app.remove_item(item.name, item.id)
+                else:
+                    grocery_app.edit_item(
+                        id=rng.choice(ids), cost=rng.choice((0.7, 3.33)),
+                        buy=rng.random() < 0.5, priority=rng.randint(1, 5),
+                        store=rng.choice(STORES))
+            failures += [f"after {ops} changes: {message}"
+                         for message in grocery_app.check_aggregates()]
+
+            try:
+                with grocery_app.batch():
+                    grocery_app.add_item("rolled back", "Aldi", 1.0, 1, 1, True)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            failures += [f"after rollback: {message}"
+                         for message in grocery_app.check_aggregates()]
+
+            columns = ColumnarStore()
+            columns.rebuild(grocery_app._items.values())
+            aggregates = grocery_app._cost_aggregates()
+            for buy_only in (False, True):
+                if columns.store_totals(buy_only) != aggregates.store_totals(buy_only):
+                    failures.append(f"columnar store totals differ (buy_only={buy_only})")
+                if columns.total(buy_only) != aggregates.total(buy_only):
+                    failures.append(f"columnar total differs (buy_only={buy_only})")
+    finally:
+        grocery_app.close()
+    return failures
+
+
+def check_round_trip(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Save, change and reload the list with every storage backend."""
+    import app.storage as storage
+    from app.grocery_item import GroceryItem
+
+    failures = []
+    items = [GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+
+    for name in constants.STORAGE_FORMATS:
+        backend = storage.create_backend(name)
+        try:
+            backend.save_all(items)
+            failures += _compare(name, "save_all", items, backend)
+
+            # Edit (moving some items to another store), remove and add.
+            changed = list(items)
+            changes = []
+            for item in rng.sample(changed, min(ops, len(changed) // 2)):
+                edited = GroceryItem.from_record({**item.to_dict(), "store": rng.choice(STORES)})
+                changed[changed.index(item)] = edited
+                changes.append(("edit", edited))
+            for item in rng.sample(changed, min(ops, len(changed) // 4)):
+                changed.remove(item)
+                changes.append(("remove", item))
+            added = GroceryItem.from_record({"name": "check added", "cost": 2.675, "id": 1})
+            changed.append(added)
+            changes.append(("add", added))
+
+            backend.apply_changes(changes, changed)
+            failures += _compare(name, "apply_changes", changed, backend)
+        finally:
+            backend.close()
+
+        reopened = storage.create_backend(name)
+        try:
+            failures += _compare(name, "reopen", changed, reopened)
+            if name == "sqlite":
+                failures += _check_id_conflict(reopened, changed)
+        finally:
+            reopened.close()
+    return failures
+
+
+def _check_id_conflict(backend, stored: list) -> list[str]:
+    """Adding an item whose ID is already stored must fail and change nothing."""
+    import sqlite3
+
+    from app.grocery_item import GroceryItem
+
+    clash = GroceryItem.from_record({"name": "check clash", "id": stored[0].id})
+    backend.strict = True
+    try:
+        backend.apply_changes([("add", clash)], [*stored, clash])
+    except sqlite3.IntegrityError:
+        return _compare("sqlite", "id conflict", stored, backend)
+    finally:
+        backend.strict = False
+    return ["sqlite id conflict: an add with a stored ID was accepted"]
+
+
+def _compare(name: str, step: str, expected: list, backend) -> list[str]:
+    """Return a failure message if `backend` does not load `expected` exactly."""
+    loaded = [item.to_dict() for item in backend.load()]
+    wanted = [item.to_dict() for item in expected]
+    if loaded == wanted:
+        return []
+    if len(loaded) != len(wanted):
+        return [f"{name} {step}: loaded {len(loaded)} items, expected {len(wanted)}"]
+    index = next(i for i, (got, want) in enumerate(zip(loaded, wanted)) if got != want)
+    return [f"{name} {step}: item {index} is {loaded[index]}, expected {wanted[index]}"]
+
+
+def check_damaged_shard(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Damage a shard and make sure it is quarantined, not overwritten."""
+    import app.storage as storage
+    from app.grocery_item import GroceryItem
+
+    failures = []
+    items = [GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+    store = items[0].store
+    kept = [item for item in items if item.store != store]
+
+    # A shard cut off mid-write, and one holding a value that is not an item.
+    for damage in ("truncated", "not an item"):
+        backend = storage.create_backend("sharded")
+        backend.save_all(items)
+        shard = os.path.join(backend.path, backend.shard_name(store))
+        with open(shard, "rb") as file:
+            original = file.read()
+        if damage == "truncated":
+            damaged = original[:len(original) // 2]
+        else:
+            damaged = original.replace(b"[", b"[7,", 1)
+        with open(shard, "wb") as file:
+            file.write(damaged)
+
+        backend = storage.create_backend("sharded")
+        with redirect_stdout(io.StringIO()):
+            loaded = backend.load()
+            added = GroceryItem.from_record({"name": "check added", "store": store, "id": 1})
+            backend.apply_changes([("add", added)], [*loaded, added])
+
+        if not {item.id for item in kept} <= {item.id for item in loaded}:
+            failures.append(f"{damage}: items of undamaged shards were lost")
+        corrupt = f"{shard}.corrupt"
+        if not os.path.exists(corrupt):
+            failures.append(f"{damage}: damaged shard was not moved to .corrupt")
+            continue
+        with open(corrupt, "rb") as file:
+            if file.read() != damaged:
+                failures.append(f"{damage}: quarantined shard does not hold the damaged data")
+        os.remove(corrupt)
+    return failures
+
+
+def check_money(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Check cent rounding and per-store tax on known values."""
+    from app.money import tax_cents, to_cents, total_with_tax
+
+    failures = []
+    for dollars, cents in ((2.675, 268), (1.005, 101), (0.125, 13), (2.99, 299), (19.999, 2000)):
+        if to_cents(dollars) != cents:
+            failures.append(f"to_cents({dollars}) is {to_cents(dollars)}, expected {cents}")
+    if tax_cents(1000, 0.0825) != 83:
+        failures.append(f"tax on $10.00 at 8.25% is {tax_cents(1000, 0.0825)} cents, expected 83")
+    # 5% of 10 cents is half a cent per store: rounded up once per store.
+    if total_with_tax({"A": 10, "B": 10}, tax=0.05) != 22:
+        failures.append("per-store tax is not rounded per store")
+    return failures
+
+
+def check_damaged_snapshot(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Cut a binary snapshot short at several points; each must be quarantined."""
+    import app.storage as storage
+    from app.grocery_item import GroceryItem
+
+    failures = []
+    items = [GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+    backend = storage.create_backend("binary")
+    backend.save_all(items)
+    with open(backend.path, "rb") as file:
+        original = file.read()
+
+    # Inside the header, the columns, the string offsets and the string blob.
+    for length in (10, len(original) // 3, len(original) - 200, len(original) - 1):
+        with open(backend.path, "wb") as file:
+            file.write(original[:length])
+        with redirect_stdout(io.StringIO()):
+            try:
+                loaded = storage.create_backend("binary").load()
+            except Exception as exc:
+                failures.append(f"cut at {length} bytes: raised {type(exc).__name__}: {exc}")
+                continue
+        if loaded:
+            failures.append(f"cut at {length} bytes: loaded {len(loaded)} items")
+        corrupt = f"{backend.path}.corrupt"
+        if not os.path.exists(corrupt):
+            failures.append(f"cut at {length} bytes: the snapshot was not moved to .corrupt")
+        else:
+            os.remove(corrupt)
+    return failures
+
+
+def check_concurrent_writers(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Add items from parallel `app add` processes and make sure none is lost."""
+    import app.storage as storage
+    from app.app_core import GroceryList
+    from app.grocery_item import GroceryItem
+
+    failures = []
+    # Every writer loads the whole list, so keep it small.
+    size = min(size, WRITER_LIST_SIZE)
+    items = [GroceryItem.from_record(record) for record in synthetic_records(size, rng)]
+    writers = min(ops, WRITERS)
+
+    for name in constants.STORAGE_FORMATS:
+        for journal in ((False, True) if name == "json" else (False,)):
+            label = f"{name}{' + journal' if journal else ''}"
+            backend = storage.create_backend(name)
+            backend.save_all(items)
+            backend.close()
+
+            env = _child_env(GROCERY_APP_STORAGE=name,
+                             GROCERY_APP_JOURNAL="1" if journal else "")
+            processes = [
+                subprocess.Popen(
+                    _app_command("--no-daemon", "add", "--name", f"writer {number}",
+                                 "--store", rng.choice(STORES)),
+                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                for number in range(writers)
+            ]
+            for process in processes:
+                _output, errors = process.communicate()
+                if process.returncode:
+                    failures.append(f"{label}: a writer exited with {process.returncode}: "
+                                    f"{errors.decode(errors='replace').strip()[-200:]}")
+
+            # Load through GroceryList so journal records are replayed.
+            constants.STORAGE, storage_before = name, constants.STORAGE
+            constants.JOURNAL_ENABLED, journal_before = journal, constants.JOURNAL_ENABLED
+            try:
+                with redirect_stdout(io.StringIO()):
+                    grocery_app = GroceryList()
+                names = [item.name for item in grocery_app.grocery_list]
+                grocery_app.close()
+            finally:
+                constants.STORAGE = storage_before
+                constants.JOURNAL_ENABLED = journal_before
+
+            lost = {f"writer {number}" for number in range(writers)} - set(names)
+            if lost:
+                failures.append(f"{label}: lost {len(lost)} of {writers} concurrent adds")
+            if len(names) != size + writers:
+                failures.append(f"{label}: {len(names)} items after the adds, "
+                                f"expected {size + writers}")
+
+            # Start the next backend from an empty data directory.
+            shutil.rmtree(constants.EXPORT_PATH)
+            os.makedirs(constants.EXPORT_PATH)
+    return failures
+
+
+def check_daemon(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Start a daemon, run commands through it and stop it."""
+    import app.daemon as daemon
+
+    failures = []
+    socket_path = constants.DAEMON_SOCKET
+    if not daemon.supported():
+        return failures
+
+    # A socket file left behind by a daemon that died: clients must fall back
+    # to running the command themselves, and a new daemon must replace it.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    if daemon.forward(socket_path, ["list"], interactive=False):
+        failures.append("a stale socket was treated as a running daemon")
+
+    server = subprocess.Popen(
+        _app_command("--mode", "server"), env=_child_env(),
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        if not _wait_for_daemon(socket_path, server):
+            output = b"" if server.poll() is None else server.communicate()[0]
+            failures.append(
+                f"the daemon did not start: {output.decode(errors='replace')[-200:]}")
+            return failures
+
+        # Piped input the command never reads must not break the client.
+        added = subprocess.run(
+            _app_command("add", "--name", "daemon item", "--store", "Aldi", "--cost", "1.25"),
+            env=_child_env(), input=b"unread input\n" * 1000, capture_output=True,
+            timeout=DAEMON_WAIT)
+        if added.returncode:
+            failures.append(f"add through the daemon exited with {added.returncode}: "
+                            f"{added.stderr.decode(errors='replace')[-200:]}")
+
+        listed = subprocess.run(
+            _app_command("list"), env=_child_env(), stdin=subprocess.DEVNULL,
+            capture_output=True, timeout=DAEMON_WAIT)
+        if b"daemon item" not in listed.stdout:
+            failures.append("list through the daemon does not show the added item")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.communicate(timeout=DAEMON_WAIT)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.communicate()
+            failures.append("the daemon did not stop on SIGTERM")
+
+    if os.path.exists(socket_path):
+        failures.append("the daemon left its socket file behind")
+
+    # The daemon's change was written, not just kept in memory.
+    listed = subprocess.run(
+        _app_command("--no-daemon", "list"), env=_child_env(), stdin=subprocess.DEVNULL,
+        capture_output=True, timeout=DAEMON_WAIT)
+    if b"daemon item" not in listed.stdout:
+        failures.append("the item added through the daemon was not saved")
+    return failures
+
+
+def _wait_for_daemon(socket_path: str, server: subprocess.Popen) -> bool:
+    """Return True once the daemon accepts connections (False if it exits or times out)."""
+    import app.daemon as daemon
+
+    deadline = time.monotonic() + DAEMON_WAIT
+    while time.monotonic() < deadline and server.poll() is None:
+        client = daemon.connect(socket_path)
+        if client is not None:
+            client.close()
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _app_command(*args: str) -> list[str]:
+    """Return the command line that runs `app` with `args` in a child process."""
+    return [sys.executable, "-m", "app.app_launch", *args]
+
+
+def _child_env(**overrides: str) -> dict[str, str]:
+    """Return the environment for a child `app` process (see `_app_command`)."""
+    # Children must import this copy of the package.
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    python_path = os.pathsep.join(filter(None, (package_root, os.environ.get("PYTHONPATH"))))
+    return {**os.environ, "PYTHONPATH": python_path, **overrides}
+
+
+def check_http(size: int, ops: int, rng: random.Random) -> list[str]:
+    """Send concurrent writes to the HTTP API; check the flush and error statuses."""
+    import asyncio
+    from http import HTTPStatus
+
+    from app.app_core import GroceryList
+    from app.http_api import GroceryApi
+
+    failures = []
+    writes = min(ops, HTTP_WRITES)
+    with redirect_stdout(io.StringIO()):
+        grocery_app = GroceryList()
+    api = GroceryApi(grocery_app, flush_delay=0.05)
+
+    def request(method: str, target: str, body: object = None) -> tuple:
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        return asyncio.run(api.dispatch(method, target, data))
+
+    async def post_all(bodies: list[dict]) -> list[tuple]:
+        return await asyncio.gather(*(
+            api.dispatch("POST", "/items", json.dumps(body).encode("utf-8")) for body in bodies))
+
+    def fail(*args, **kwargs) -> None:
+        raise OSError("disk full")
+
+    def bug(*args, **kwargs) -> None:
+        raise TypeError("bug")
+
+    try:
+        with grocery_app.batch():
+            names = {f"http {number}" for number in range(writes)}
+            results = asyncio.run(post_all(
+                [{"name": name, "store": rng.choice(STORES)} for name in names]))
+            if {status for status, _payload in results} != {HTTPStatus.CREATED}:
+                failures.append("not every concurrent add was answered with 201")
+            if api.flushes != 1:
+                failures.append(f"{writes} concurrent adds took {api.flushes} flushes, expected 1")
+            # An acknowledged write is on disk.
+            if not names <= {item.name for item in grocery_app.backend.load()}:
+                failures.append("acknowledged adds are missing from disk")
+
+            status, _payload = request("POST", "/items", {"name": "bad", "priority": 9})
+            if status != HTTPStatus.BAD_REQUEST:
+                failures.append(f"an invalid field was answered with {status.value}, expected 400")
+
+            # A failed flush must not be acknowledged.
+            grocery_app.backend.apply_changes = fail
+            try:
+                status, payload = request("POST", "/items", {"name": "unsaved"})
+            finally:
+                del grocery_app.backend.apply_changes
+            if status != HTTPStatus.INTERNAL_SERVER_ERROR:
+                failures.append(f"an add whose flush failed was answered with {status.value}")
+
+            # A bug in the server is not the client's fault.
+            grocery_app.summary = bug
+            try:
+                status, _payload = request("GET", "/summary")
+            finally:
+                del grocery_app.summary
+            if status != HTTPStatus.INTERNAL_SERVER_ERROR:
+                failures.append(f"a TypeError in a handler was answered with {status.value}, "
+                                "expected 500")
+    finally:
+        grocery_app.close()
+    return failures
+
+
+# Checks in report order
+CHECKS: dict[str, Callable[[int, int, random.Random], list[str]]] = {
+    "aggregates": check_aggregates,
+    "round_trip": check_round_trip,
+    "damaged_shard": check_damaged_shard,
+    "money": check_money,
+    "damaged_snapshot": check_damaged_snapshot,
+    "concurrent_writers": check_concurrent_writers,
+    "daemon": check_daemon,
+    "http": check_http,
+}
+
+
+def run(args: argparse.Namespace) -> dict[str, list[str]]:
+    """Run the selected checks in a temporary data directory; return failures by check."""
+    data_dir = tempfile.mkdtemp(prefix="grocery_check_")
+    use_data_dir(data_dir)
+
+    results = {}
+    try:
+        for name in args.only or CHECKS:
+            rng = random.Random(args.seed)
+            try:
+                results[name] = CHECKS[name](args.size, args.ops, rng)
+            except Exception as exc:
+                results[name] = [f"raised {type(exc).__name__}: {exc}"]
+            # Start the next check from an empty data directory.
+            shutil.rmtree(data_dir)
+            os.makedirs(data_dir)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the checks and report."""
+    parser = argparse.ArgumentParser(description="Run offline regression checks")
+    parser.add_argument("--size", type=int, default=5000,
+                        help="Items in the synthetic list (default: 5000)")
+    parser.add_argument("--ops", type=int, default=2000,
+                        help="Random changes per check (default: 2000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for the synthetic data (default: 0)")
+    parser.add_argument("--only", choices=list(CHECKS), nargs="+", default=None,
+                        help="Run only these checks")
+    args = parser.parse_args()
+
+    if args.size < 2 or args.ops < 1:
+        parser.error("--size must be at least 2 and --ops positive")
+
+    results = run(args)
+    for name, failures in results.items():
+        print(f"{name:<20}{'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"  {failure}")
+
+    failed = sum(bool(failures) for failures in results.values())
+    if failed:
+        print(f"\n{failed} check(s) failed.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+columnar.py
+
+Optional column-oriented mirror of the grocery list used for fast aggregates.
+
+`ColumnarStore` keeps one `array` column per numeric field (cost in integer
+cents, amount, priority, buy) plus interned store codes, so totals, buy
+filters and per-store breakdowns run over packed machine values instead of
+Python objects. When NumPy
+is installed the columns are viewed (zero-copy) as NumPy arrays and the
+aggregates are fully vectorized; otherwise C-level builtins (`map`, `sum`,
+`itertools.compress`) are used.
+
+Rows are appended in insertion order. Removed rows are tombstoned (zeroed and
+flagged dead) so removal is O(1) and row order keeps matching the list order;
+tombstones are compacted away once they outnumber live rows.
+"""
+
+import operator
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import compress
+
+from app.grocery_item import GroceryItem
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure-Python columns.
+    np = None
+
+# Minimum number of tombstones before compaction is considered
+COMPACT_MIN_DEAD = 1024
+
+
+class ColumnarStore:
+    """Packed per-field columns mirroring the items of a GroceryList."""
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self.rebuild(())
+
+    def __len__(self) -> int:
+        """Return the number of live rows."""
+        return len(self._rows)
+
+    # -----------------
+    # Maintenance
+    # -----------------
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace all columns with the given items (in order)."""
+        self.ids: list[int] = []
+        self.names: list[str] = []
+        self.cost = array("q")
+        self.amount = array("q")
+        self.priority = array("b")
+        self.buy = array("b")
+        self.live = array("b")
+        self.store = array("q")
+
+        self._rows: dict[int, int] = {}
+        self._store_names: list[str] = []
+        self._store_codes: dict[str, int] = {}
+        self._dead = 0
+
+        for item in items:
+            self.add(item)
+
+    def add(self, item: GroceryItem) -> None:
+        """Append a row for a new item."""
+        self._rows[item.id] = len(self.ids)
+        self.ids.append(item.id)
+        self.names.append(sys.intern(item.name))
+        self.cost.append(item.cost_cents)
+        self.amount.append(item.amount)
+        self.priority.append(item.priority)
+        self.buy.append(item.buy)
+        self.live.append(1)
+        self.store.append(self._store_code(item.store))
+
+    def update(self, item: GroceryItem) -> None:
+        """Overwrite the row of an edited item."""
+        row = self._rows.get(item.id)
+        if row is None:
+            return
+
+        self.names[row] = sys.intern(item.name)
+        self.cost[row] = item.cost_cents
+        self.amount[row] = item.amount
+        self.priority[row] = item.priority
+        self.buy[row] = item.buy
+        self.store[row] = self._store_code(item.store)
+
+    def remove(self, item_id: int) -> None:
+        """Tombstone the row of a removed item."""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+
+        # Zeroed rows drop out of every sum and filter without a live check.
+        self.cost[row] = 0
+        self.amount[row] = 0
+        self.buy[row] = 0
+        self.live[row] = 0
+        self._dead += 1
+
+        if self._dead >= COMPACT_MIN_DEAD and self._dead > len(self._rows):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows, keeping the order of live rows."""
+        live = self.live
+        self.ids = list(compress(self.ids, live))
+        self.names = list(compress(self.names, live))
+        self.cost = array("q", compress(self.cost, live))
+        self.amount = array("q", compress(self.amount, live))
+        self.priority = array("b", compress(self.priority, live))
+        self.buy = array("b", compress(self.buy, live))
+        self.store = array("q", compress(self.store, live))
+        self.live = array("b", [1]) * len(self.ids)
+
+        self._rows = {item_id: row for row, item_id in enumerate(self.ids)}
+        self._dead = 0
+
+    def _store_code(self, store: str) -> int:
+        """Return the interned code for a store name."""
+        code = self._store_codes.get(store)
+        if code is None:
+            code = len(self._store_names)
+            self._store_codes[store] = code
+            self._store_names.append(sys.intern(store))
+        return code
+
+    # -----------------
+    # Aggregates
+    # -----------------
+
+    def total(self, buy_only: bool = False) -> int:
+        """Return sum(amount * cost) in cents, optionally only for buy-flagged rows."""
+        if np is not None:
+            line_totals = self._np_line_totals()
+            if buy_only:
+                return int(line_totals[np.frombuffer(self.buy, dtype=np.int8) != 0].sum())
+            return int(line_totals.sum())
+
+        line_totals = map(operator.mul, self.amount, self.cost)
+        if buy_only:
+            return sum(compress(line_totals, self.buy))
+        return sum(line_totals)
+
+    def store_totals(self, buy_only: bool = False) -> dict[str, int]:
+        """
+        Return sum(amount * cost) in cents grouped by store name.
+
+        Only stores with at least one matching row (live, or buy-flagged when
+        `buy_only` is set) are included, as in `CostAggregates.store_totals`.
+        """
+        flags = self.buy if buy_only else self.live
+
+        if np is not None:
+            mask = np.frombuffer(flags, dtype=np.int8) != 0
+            codes = np.frombuffer(self.store, dtype=np.int64)[mask]
+            size = len(self._store_names)
+            # float64 sums are exact for totals below 2**53 cents.
+            sums = np.bincount(codes, weights=self._np_line_totals()[mask], minlength=size)
+            counts = np.bincount(codes, minlength=size)
+            return {
+                name: int(sums[code])
+                for code, name in enumerate(self._store_names)
+                if counts[code]
+            }
+
+        totals: dict[str, int] = {}
+        for code, amount, cost in compress(
+            zip(self.store, self.amount, self.cost), flags
+        ):
+            name = self._store_names[code]
+            totals[name] = totals.get(name, 0) + amount * cost
+        return totals
+
+    def buy_ids(self) -> Iterator[int]:
+        """Yield the IDs of buy-flagged rows in insertion order, lazily."""
+        return compress(self.ids, self.buy)
+
+    def _np_line_totals(self):
+        """Return amount * cost (cents) for every row as a NumPy int64 array."""
+        return np.frombuffer(self.amount, dtype=np.int64) * np.frombuffer(
+            self.cost, dtype=np.int64)
@@ -11,6 +11,49 @@ This module contains:
 """
 
 import os
+import sys
+
+# Invalid environment values that were replaced by their defaults; logged by
+# `log_config.configure_logging` once logging is set up
+CONFIG_WARNINGS: list[str] = []
+
+
+def _env_number(
+    name: str,
+    default: int | float,
+    minimum: float | None = None,
+    maximum: float | None = None,
+) -> int | float:
+    """
+    Read a numeric environment variable, falling back to its default.
+
+    A missing value gives `default` silently. An unparsable or out-of-range
+    one also gives `default`, with a warning on stderr (and later in the log)
+    instead of a traceback at import time.
+
+    Args:
+        name: Environment variable name.
+        default: Value used when the variable is unset or invalid; its type
+            (int or float) is the type parsed.
+        minimum: Smallest accepted value, if any.
+        maximum: Largest accepted value, if any.
+    """
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = type(default)(raw.strip())
+        if minimum is not None and value < minimum:
+            raise ValueError
+        if maximum is not None and value > maximum:
+            raise ValueError
+    except ValueError:
+        message = f"Ignoring invalid {name} value {raw!r}; using {default}."
+        CONFIG_WARNINGS.append(message)
+        print(message, file=sys.stderr)
+        return default
+    return value
+
 
 # -------------------------
 # File system configuration
@@ -25,9 +68,180 @@ EXPORT_PATH = os.environ.get(
 # Filename for the exported (buy-only) grocery list
 EXPORT_LIST = "export_grocery_list.txt"
 
+# Export file formats (text is the original human-readable format)
+EXPORT_FORMATS = ("txt", "csv", "jsonl", "md")
+
+# Bytes buffered before an export is written to disk
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Compression level for gzipped exports (1 fastest - 9 smallest)
+EXPORT_GZIP_LEVEL = 6
+
 # Base filename (without extension) for the persistent grocery list JSON
 GROCERY_LIST = "grocery_list"
 
+# Extension for the binary snapshot of the grocery list
+SNAPSHOT_EXTENSION = "bin"
+
+# Extension for the advisory lock file that serializes writers across processes
+LOCK_EXTENSION = "lock"
+
+# Storage backend for the grocery list: "json" (default), "binary", "sqlite"
+# or "sharded" (one JSON file per store)
+STORAGE_FORMATS = ("json", "binary", "sqlite", "sharded")
+STORAGE = os.environ.get("GROCERY_APP_STORAGE", "json").strip().lower()
+
+# Threads used to read shard files in parallel (sharded storage)
+SHARD_LOAD_WORKERS = _env_number("GROCERY_APP_SHARD_WORKERS", 8, minimum=1)
+
+
+# -------------------------
+# Journal configuration
+# -------------------------
+
+# Extension for the append-only mutation journal stored next to the JSON file
+JOURNAL_EXTENSION = "journal"
+
+# Enable journal mode (append one record per mutation instead of rewriting
+# the whole JSON file). Accepts yes/true/y/1.
+JOURNAL_ENABLED = os.environ.get("GROCERY_APP_JOURNAL", "").strip().lower() in (
+    "yes", "true", "y", "1")
+
+# Number of journal records after which the journal is compacted into the
+# JSON snapshot
+JOURNAL_COMPACT_THRESHOLD = _env_number("GROCERY_APP_JOURNAL_COMPACT", 1000, minimum=1)
+
+
+# -------------------------
+# Columnar store configuration
+# -------------------------
+
+# Keep a packed, column-oriented copy of the list for fast totals and
+# per-store breakdowns. Accepts yes/true/y/1.
+COLUMNAR_ENABLED = os.environ.get("GROCERY_APP_COLUMNAR", "").strip().lower() in (
+    "yes", "true", "y", "1")
+
+
+# -------------------------
+# Logging configuration
+# -------------------------
+
+# Log file in the data directory
+LOG_FILE = "grocery_logger.log"
+
+# Lowest level written to the log file (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.environ.get("GROCERY_APP_LOG_LEVEL", "INFO").strip()
+
+# Size at which the log file is rotated, and the number of old files kept
+LOG_MAX_BYTES = _env_number("GROCERY_APP_LOG_MAX_BYTES", 5 * 1024 * 1024, minimum=0)
+LOG_BACKUPS = _env_number("GROCERY_APP_LOG_BACKUPS", 3, minimum=0)
+
+# Change sets larger than this (e.g. bulk imports) are logged as one summary
+# record instead of one record per item
+LOG_MUTATIONS_MAX = 100
+
+
+# -------------------------
+# Instrumentation configuration
+# -------------------------
+
+# Record call counts, latency histograms and byte/item counters for the core
+# operations (see `metrics`). Accepts yes/true/y/1.
+METRICS_ENABLED = os.environ.get("GROCERY_APP_METRICS", "").strip().lower() in (
+    "yes", "true", "y", "1")
+
+# File in the data directory that accumulates the metrics of finished runs
+METRICS_FILE = "grocery_app_metrics.json"
+
+# Latency histogram buckets (powers of two microseconds; the last one is
+# open-ended, from about 67 seconds)
+METRICS_BUCKETS = 28
+
+
+# -------------------------
+# Daemon configuration
+# -------------------------
+
+# Unix domain socket the daemon (`app --mode server`) listens on, inside the
+# data directory
+DAEMON_SOCKET = os.path.join(EXPORT_PATH, "grocery_app.sock")
+
+# Seconds the daemon waits on a silent client before treating its input as
+# closed
+DAEMON_IDLE_TIMEOUT = _env_number("GROCERY_APP_DAEMON_TIMEOUT", 300.0, minimum=0.001)
+
+
+# -------------------------
+# HTTP API configuration
+# -------------------------
+
+# Address the HTTP JSON API (`app --mode http`) listens on
+HTTP_HOST = os.environ.get("GROCERY_APP_HTTP_HOST", "127.0.0.1")
+HTTP_PORT = _env_number("GROCERY_APP_HTTP_PORT", 8080, minimum=0, maximum=65535)
+
+# Seconds the API waits after a write before flushing, so a burst of
+# concurrent writes is persisted with a single flush
+HTTP_FLUSH_DELAY = _env_number("GROCERY_APP_HTTP_FLUSH_DELAY", 0.02, minimum=0.0)
+
+# Largest request body (bytes) the API accepts
+HTTP_MAX_BODY = 1024 * 1024
+
+
+# -------------------------
+# Fuzzy search configuration
+# -------------------------
+
+# Minimum trigram similarity (0-1) for a name to match a fuzzy search
+FUZZY_THRESHOLD = 0.3
+
+# Maximum number of fuzzy search results
+FUZZY_LIMIT = 10
+
+
+# -------------------------
+# Priority view configuration
+# -------------------------
+
+# Default number of items shown by `app top`
+TOP_K = 10
+
+
+# -------------------------
+# Listing configuration
+# -------------------------
+
+# Fields `list` and `search` can sort by
+SORT_FIELDS = ("name", "store", "cost", "priority")
+
+# Rows per page in the interactive pager
+PAGE_SIZE = _env_number("GROCERY_APP_PAGE_SIZE", 20, minimum=1)
+
+
+# -------------------------
+# Import configuration
+# -------------------------
+
+# Supported bulk-import file formats
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Maximum number of invalid rows listed after a bulk import
+IMPORT_ERRORS_SHOWN = 20
+
+
+# -------------------------
+# Tax configuration
+# -------------------------
+
+# Sales tax rate for stores without a rate of their own
+TAX_RATE_DEFAULT = 0.0825
+
+# Sales tax rate per store (store names are compared case-insensitively),
+# e.g. {"Costco": 0.07, "Aldi": 0.0}
+STORE_TAX_RATES: dict[str, float] = {}
+
+# Extra or overriding per-store rates, e.g. "Costco=0.07,Aldi=0"
+STORE_TAX_RATES_ENV = os.environ.get("GROCERY_APP_TAX_RATES", "")
+
 
 # -------------------------
 # GroceryItem default values
@@ -39,7 +253,7 @@ NAME_DEFAULT = "unnamed item"
 # Default store name when user input is blank
 STORE_DEFAULT = "Kroger"
 
-# Default item cost
+# Default item cost (dollars; items store it as integer cents)
 COST_DEFAULT = 0.00
 
 # Default quantity
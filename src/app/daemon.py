@@ -0,0 +1,249 @@
+"""
+daemon.py
+
+Resident daemon that keeps the grocery list in memory behind a Unix domain
+socket, plus the thin client used by the `app` command to reach it.
+
+Protocol (one connection per command):
+- The client sends one JSON line: {"argv": [...], "cwd": "..."}.
+- The daemon runs the command with stdin/stdout bound to the connection, so
+  prompts (e.g. choosing between several matches) work as they do locally.
+- The client relays the socket to its stdout until the daemon closes the
+  connection; for commands that may prompt it also relays its own stdin.
+- When the command finishes the daemon shuts down its side of the socket and
+  discards any input the client sent but the command did not read.
+
+Connections are served one at a time, so commands never interleave.
+"""
+
+import json
+import os
+import select
+import signal
+import socket
+import sys
+from collections.abc import Callable
+from contextlib import redirect_stderr, redirect_stdout, suppress
+
+# Bytes read per relay step
+CHUNK_SIZE = 65536
+
+# Seconds to wait for a client to close after its command finished
+DRAIN_TIMEOUT = 5.0
+
+
+def supported() -> bool:
+    """Return True if this platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def connect(socket_path: str) -> socket.socket | None:
+    """Return a connection to a running daemon, or None if none is listening."""
+    if not supported() or not os.path.exists(socket_path):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        # Stale socket file (daemon exited uncleanly) or no permission.
+        client.close()
+        return None
+    return client
+
+
+# -------------------------
+# Client
+# -------------------------
+
+def forward(socket_path: str, argv: list[str], interactive: bool = True) -> bool:
+    """
+    Run a command in the daemon and relay its output.
+
+    Args:
+        socket_path: The daemon's socket.
+        argv: Command-line arguments for the command (without the program name).
+        interactive: Relay stdin too, for commands that may prompt. Otherwise
+            the daemon sees end-of-file on its input straight away.
+
+    Returns:
+        True if a daemon ran the command, False if none is running (the caller
+        should then run the command itself).
+    """
+    client = connect(socket_path)
+    if client is None:
+        return False
+
+    with client:
+        request = {"argv": argv, "cwd": os.getcwd()}
+        try:
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            if not interactive:
+                client.shutdown(socket.SHUT_WR)
+            _relay(client, relay_stdin=interactive)
+        except (BrokenPipeError, ConnectionResetError):
+            # The daemon closed the connection while input was still being
+            # sent; whatever it wrote before that has been relayed.
+            pass
+    return True
+
+
+def _relay(client: socket.socket, relay_stdin: bool = True) -> None:
+    """Copy the daemon's output to stdout (and stdin to the daemon) until it closes."""
+    stdin_fd: int | None = None
+    if relay_stdin:
+        try:
+            stdin_fd = sys.stdin.fileno()
+        except (AttributeError, ValueError, OSError):
+            stdin_fd = None
+    stdout = sys.stdout.buffer
+
+    while True:
+        readers = [client] if stdin_fd is None else [client, stdin_fd]
+        ready, _, _ = select.select(readers, [], [])
+
+        if client in ready:
+            data = client.recv(CHUNK_SIZE)
+            if not data:
+                break
+            stdout.write(data)
+            stdout.flush()
+
+        if stdin_fd is not None and stdin_fd in ready:
+            data = os.read(stdin_fd, CHUNK_SIZE)
+            if data:
+                client.sendall(data)
+            else:
+                # No more input: let a waiting prompt see end-of-file.
+                client.shutdown(socket.SHUT_WR)
+                stdin_fd = None
+
+
+# -------------------------
+# Server
+# -------------------------
+
+def serve(
+    socket_path: str,
+    handle: Callable[[list[str], str], None],
+    timeout: float | None = None,
+) -> None:
+    """
+    Listen on `socket_path` and run each client's command with `handle`.
+
+    Runs until interrupted (Ctrl+C or SIGTERM); the socket file is removed on
+    exit.
+
+    Args:
+        socket_path: Path of the Unix domain socket to create.
+        handle: Called with (argv, cwd) for every request. Anything it prints
+            or reads with `input()` goes to the client.
+        timeout: Seconds to wait on a silent client before treating its input
+            as closed (None waits forever).
+    """
+    if not supported():
+        print("Daemon mode needs Unix domain sockets, which this platform lacks.")
+        return
+
+    probe = connect(socket_path)
+    if probe is not None:
+        probe.close()
+        print(f"A daemon is already listening on {socket_path}.")
+        return
+
+    # Left behind by a daemon that did not shut down cleanly.
+    with suppress(FileNotFoundError):
+        os.unlink(socket_path)
+
+    # SIGTERM stops the daemon the same way Ctrl+C does.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        print(f"Grocery daemon listening on {socket_path} (Ctrl+C to stop)")
+
+        while True:
+            connection, _address = server.accept()
+            _serve_connection(connection, handle, timeout)
+    except KeyboardInterrupt:
+        print("\nStopping grocery daemon.")
+    finally:
+        server.close()
+        with suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+
+def _serve_connection(
+    connection: socket.socket,
+    handle: Callable[[list[str], str], None],
+    timeout: float | None,
+) -> None:
+    """Read one request from a client and run it with stdio bound to the socket."""
+    connection.settimeout(timeout)
+    reader = connection.makefile("r", encoding="utf-8", newline="\n")
+    writer = connection.makefile("w", encoding="utf-8")
+
+    try:
+        try:
+            request = json.loads(reader.readline())
+            argv = [str(arg) for arg in request["argv"]]
+            cwd = str(request["cwd"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        stdin = sys.stdin
+        sys.stdin = _ClientInput(reader)
+        try:
+            with redirect_stdout(writer), redirect_stderr(writer):
+                try:
+                    handle(argv, cwd)
+                except SystemExit:
+                    # argparse errors; the message was already written.
+                    pass
+                except OSError:
+                    # The client went away mid-command.
+                    pass
+                except Exception as exc:
+                    print(f"Error: {exc}")
+        finally:
+            sys.stdin = stdin
+    finally:
+        for stream in (writer, reader):
+            with suppress(OSError):
+                stream.close()
+        _close(connection)
+
+
+def _close(connection: socket.socket) -> None:
+    """
+    Close a client connection without resetting it.
+
+    Closing a socket with unread input makes the kernel send a reset, which
+    can discard output the client has not read yet. The write side is shut
+    down first, so the client sees the end of the output and stops sending,
+    and anything it sent meanwhile is read and dropped.
+    """
+    with suppress(OSError):
+        connection.shutdown(socket.SHUT_WR)
+        connection.settimeout(DRAIN_TIMEOUT)
+        while connection.recv(CHUNK_SIZE):
+            pass
+    connection.close()
+
+
+class _ClientInput:
+    """stdin stand-in for a client connection; a timeout reads as end-of-file."""
+
+    def __init__(self, reader) -> None:
+        """Wrap the connection's text reader."""
+        self._reader = reader
+
+    def readline(self, size: int = -1) -> str:
+        """Return the next line sent by the client ("" once input is closed)."""
+        try:
+            return self._reader.readline(size)
+        except OSError:
+            return ""
@@ -0,0 +1,218 @@
+"""
+exporter.py
+
+Streaming writers for exporting grocery items as text, CSV, JSON Lines or
+Markdown.
+
+Items are consumed one at a time from any iterable and written through a
+large write buffer (optionally gzip-compressed) while the item count and
+per-store subtotals (in cents) are accumulated on the fly, so an export takes
+one pass and its memory use does not grow with the number of items.
+"""
+
+import csv
+import gzip
+import io
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from json.encoder import encode_basestring_ascii as quote
+from typing import NamedTuple, TextIO
+
+import app.constants as constants
+from app.grocery_item import GroceryItem
+from app.money import from_cents
+
+# File extension for each format in constants.EXPORT_FORMATS
+EXPORT_EXTENSIONS = {
+    "txt": ".txt",
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "md": ".md",
+}
+
+# Fields written by the CSV and JSON Lines formats (the bulk-import columns,
+# so an export can be imported again)
+COLUMNS = ("name", "store", "cost", "amount", "priority", "buy")
+
+# Title line of the text format
+TEXT_HEADER = "\n** Grocery List Export ** \n\n"
+
+
+class ExportResult(NamedTuple):
+    """Summary of a finished export."""
+
+    count: int
+    subtotal: float
+    total: float
+    path: str | None  # None when the export went to stdout
+
+
+def default_path(file_format: str, compress: bool = False) -> str:
+    """
+    Return the default export file for a format.
+
+    The text format keeps `constants.EXPORT_LIST`; other formats swap its
+    extension, and compressed exports add ".gz".
+    """
+    base = os.path.splitext(constants.EXPORT_LIST)[0]
+    path = os.path.join(constants.EXPORT_PATH, base + EXPORT_EXTENSIONS[file_format])
+    return f"{path}.gz" if compress else path
+
+
+def text_line(number: int, item: GroceryItem) -> str:
+    """Return one item in the text export format (without a newline)."""
+    return (
+        f"Item {number} "
+        f"| Name: {item.name} "
+        f"| Store: {item.store} "
+        f"| Cost: {item.cost} "
+        f"| Amount: {item.amount} "
+        f"| Priority: {item.priority} "
+        f"| Buy: {item.buy}"
+    )
+
+
+def total_line(total: float) -> str:
+    """Return the closing total line of the text format (without a newline)."""
+    return f"The total cost is ${total:.2f}"
+
+
+def export(
+    items: Iterable[GroceryItem],
+    total: Callable[[dict[str, int]], float],
+    file_format: str = "txt",
+    path: str | None = None,
+    compress: bool = False,
+    to_stdout: bool = False,
+    echo: TextIO | None = None,
+) -> ExportResult:
+    """
+    Write items to an export file (or stdout) in one streaming pass.
+
+    Args:
+        items: Items to export, consumed once.
+        total: Turns the pre-tax subtotal of each store (in cents) into the
+            reported total in dollars (adding tax).
+        file_format: One of `constants.EXPORT_FORMATS`.
+        path: Output file (default: `default_path(file_format, compress)`).
+            Ignored when `to_stdout` is set.
+        compress: Gzip the output.
+        to_stdout: Write the export to stdout instead of a file.
+        echo: Also write each text-format item line and the total here
+            (e.g. the console). Only used by the text format.
+
+    Returns:
+        The number of items written, their subtotal and total, and the path.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    if to_stdout:
+        path = None
+    elif path is None:
+        path = default_path(file_format, compress)
+
+    with _open_output(path, compress) as out:
+        count, subtotals, grand_total = _write(
+            items, out, file_format, total, echo if file_format == "txt" else None)
+
+    return ExportResult(count, from_cents(sum(subtotals.values())), grand_total, path)
+
+
+@contextmanager
+def _open_output(path: str | None, compress: bool) -> Iterator[TextIO]:
+    """Open a buffered text stream to `path` (None for stdout), gzipped if asked."""
+    if path is None and not compress:
+        # Write straight to stdout, which must stay open afterwards.
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+
+    if path is None:
+        sys.stdout.flush()
+        raw = gzip.GzipFile(
+            fileobj=sys.stdout.buffer, mode="wb", compresslevel=constants.EXPORT_GZIP_LEVEL)
+    elif compress:
+        raw = gzip.open(path, "wb", compresslevel=constants.EXPORT_GZIP_LEVEL)
+    else:
+        raw = io.FileIO(path, "w")
+
+    buffered = io.BufferedWriter(raw, buffer_size=constants.EXPORT_BUFFER_SIZE)
+    with io.TextIOWrapper(buffered, encoding="utf-8", newline="") as out:
+        yield out
+
+    if path is None:
+        sys.stdout.buffer.flush()
+
+
+def _write(
+    items: Iterable[GroceryItem],
+    out: TextIO,
+    file_format: str,
+    total: Callable[[dict[str, int]], float],
+    echo: TextIO | None,
+) -> tuple[int, dict[str, int], float]:
+    """Write the header, one record per item and the footer; return the totals."""
+    count = 0
+    subtotals: dict[str, int] = {}
+
+    if file_format == "txt":
+        out.write(TEXT_HEADER)
+        for count, item in enumerate(items, start=1):
+            subtotals[item.store] = subtotals.get(item.store, 0) + item.amount * item.cost_cents
+            line = text_line(count, item) + "\n"
+            out.write(line)
+            if echo is not None:
+                echo.write(line)
+        grand_total = total(subtotals)
+        out.write(f"\n{total_line(grand_total)}\n")
+        if echo is not None:
+            echo.write(f"\n{total_line(grand_total)}\n\n")
+        return count, subtotals, grand_total
+
+    if file_format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for count, item in enumerate(items, start=1):
+            subtotals[item.store] = subtotals.get(item.store, 0) + item.amount * item.cost_cents
+            writer.writerow(
+                (item.name, item.store, item.cost, item.amount, item.priority,
+                 "yes" if item.buy else "no"))
+        return count, subtotals, total(subtotals)
+
+    if file_format == "jsonl":
+        # Formatted directly (same output as json.dumps with compact
+        # separators), which is several times faster than encoding a dict
+        # per item.
+        for count, item in enumerate(items, start=1):
+            subtotals[item.store] = subtotals.get(item.store, 0) + item.amount * item.cost_cents
+            out.write(
+                f'{{"name":{quote(item.name)},"store":{quote(item.store)},'
+                f'"cost":{item.cost!r},"amount":{item.amount},'
+                f'"priority":{item.priority},"buy":{"true" if item.buy else "false"}}}\n'
+            )
+        return count, subtotals, total(subtotals)
+
+    if file_format == "md":
+        out.write("# Grocery List Export\n\n")
+        out.write("| # | Name | Store | Cost | Amount | Priority | Buy |\n")
+        out.write("| ---: | --- | --- | ---: | ---: | ---: | --- |\n")
+        for count, item in enumerate(items, start=1):
+            subtotals[item.store] = subtotals.get(item.store, 0) + item.amount * item.cost_cents
+            out.write(
+                f"| {count} | {_markdown_cell(item.name)} | {_markdown_cell(item.store)} "
+                f"| {item.cost} | {item.amount} | {item.priority} | {item.buy} |\n"
+            )
+        grand_total = total(subtotals)
+        out.write(f"\n**Total cost: ${grand_total:.2f}**\n")
+        return count, subtotals, grand_total
+
+    raise ValueError(f"Unknown export format: {file_format!r}")
+
+
+def _markdown_cell(text: str) -> str:
+    """Escape a value for a Markdown table cell."""
+    return text.replace("\\", "\\\\").replace("|", "\\|").replace("\n", " ")
+
@@ -4,10 +4,15 @@ grocery_item.py
 Defines the GroceryItem model used by the Grocery List application.
 
 A GroceryItem stores one entry in the grocery list and validates each field
-through property setters.
+through property setters. Costs are held as integer cents (see `app.money`);
+`cost` reads and writes dollars.
 """
 
+from collections.abc import Mapping
+from typing import Any
+
 import app.constants as constants
+from app.money import from_cents, to_cents
 
 
 class GroceryItem:
@@ -15,9 +20,15 @@ class GroceryItem:
     Data model for a single grocery list item.
 
     Attributes are stored internally using private variables (e.g. _name) and
-    exposed/validated using @property getters/setters.
+    exposed/validated using @property getters/setters. `__slots__` removes the
+    per-instance `__dict__`, which keeps large lists compact in memory.
     """
 
+    __slots__ = ("_name", "_store", "_cents", "_amount", "_priority", "_buy", "_id")
+
+    # Public field names, in persisted order
+    FIELDS = ("name", "store", "cost", "amount", "priority", "buy", "id")
+
     def __init__(self) -> None:
         """
         Initialize a new GroceryItem with default values from constants.
@@ -27,12 +38,83 @@ class GroceryItem:
         """
         self._name: str = constants.NAME_DEFAULT
         self._store: str = constants.STORE_DEFAULT
-        self._cost: float = float(constants.COST_DEFAULT)
+        self._cents: int = to_cents(constants.COST_DEFAULT)
         self._amount: int = constants.AMOUNT_DEFAULT
         self._priority: int = constants.PRIORITY_DEFAULT
         self._buy: bool = constants.BUY_DEFAULT
         self._id: int = constants.ID_DEFAULT
 
+    # -----------------
+    # Bulk construction / serialization
+    # -----------------
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> "GroceryItem":
+        """
+        Build an item from a mapping of public field names in one step.
+
+        All fields are type-checked together and assigned directly, skipping
+        the per-field property calls. Missing keys use the constants defaults
+        and unknown keys are ignored. If any field is invalid, the property
+        setters are used instead so the usual ValueError is raised.
+
+        Args:
+            record: Mapping with any of the keys in `FIELDS`.
+
+        Returns:
+            A new GroceryItem.
+        """
+        name = record.get("name", constants.NAME_DEFAULT)
+        store = record.get("store", constants.STORE_DEFAULT)
+        cost = record.get("cost", constants.COST_DEFAULT)
+        amount = record.get("amount", constants.AMOUNT_DEFAULT)
+        priority = record.get("priority", constants.PRIORITY_DEFAULT)
+        buy = record.get("buy", constants.BUY_DEFAULT)
+        item_id = record.get("id", constants.ID_DEFAULT)
+
+        item = cls.__new__(cls)
+
+        if (
+            isinstance(name, str)
+            and isinstance(store, str)
+            and isinstance(cost, (int, float))
+            and isinstance(amount, int) and amount > 0
+            and isinstance(priority, int)
+            and constants.PRIORITY_MIN <= priority <= constants.PRIORITY_MAX
+            and isinstance(buy, bool)
+            and isinstance(item_id, int)
+        ):
+            item._name = name
+            item._store = store
+            item._cents = to_cents(cost)
+            item._amount = amount
+            item._priority = priority
+            item._buy = buy
+            item._id = item_id
+            return item
+
+        # Slow path: let the setters report which field is invalid.
+        item.name = name
+        item.store = store
+        item.cost = cost
+        item.amount = amount
+        item.priority = priority
+        item.buy = buy
+        item.id = item_id
+        return item
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the item as a JSON-serializable dict of public field names."""
+        return {
+            "name": self._name,
+            "store": self._store,
+            "cost": from_cents(self._cents),
+            "amount": self._amount,
+            "priority": self._priority,
+            "buy": self._buy,
+            "id": self._id,
+        }
+
     # -----------------
     # Name
     # -----------------
@@ -71,19 +153,32 @@ class GroceryItem:
 
     @property
     def cost(self) -> float:
-        """Return the item cost."""
-        return self._cost
+        """Return the item cost in dollars."""
+        return from_cents(self._cents)
 
     @cost.setter
     def cost(self, value: int | float) -> None:
         """
-        Set the item cost.
+        Set the item cost in dollars.
 
-        Cost is stored as a float to preserve decimal values.
+        Cost is stored as integer cents (rounded to the nearest cent) so
+        totals are exact.
         """
         if not isinstance(value, (int, float)):
             raise ValueError("Cost must be an int or a float value.")
-        self._cost = float(value)
+        self._cents = to_cents(value)
+
+    @property
+    def cost_cents(self) -> int:
+        """Return the item cost in cents."""
+        return self._cents
+
+    @cost_cents.setter
+    def cost_cents(self, value: int) -> None:
+        """Set the item cost in cents (must be an int)."""
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError("Cost in cents must be an int value.")
+        self._cents = value
 
     # -----------------
     # Amount
@@ -0,0 +1,384 @@
+"""
+http_api.py
+
+Asyncio HTTP/JSON API over a `GroceryList` (stdlib only).
+
+Endpoints (request and response bodies are JSON):
+
+    GET    /health           item count, request count and flush count
+    GET    /summary          item counts and subtotals per store and priority
+    GET    /stats            instrumentation metrics (see `metrics`)
+    GET    /items            all items; `?q=prefix` searches by name prefix
+    POST   /items            add an item (missing fields use the defaults)
+    GET    /items/<id>       one item
+    PATCH  /items/<id>       edit the given fields of an item
+    DELETE /items/<id>       remove an item
+    POST   /export           write the export file; returns the buy items
+
+`GET /items` and `POST /export` accept `?store=` (repeatable) to scope the
+result to some stores; `GET /items?q=...&fuzzy=1` does a typo-tolerant search.
+
+Item IDs are 128-bit, so they are sent as strings.
+
+Every request runs on the event loop thread, so the list needs no locking.
+Writes are queued in a `GroceryList.batch` and flushed once per burst: the
+first write schedules a flush `flush_delay` seconds later and every write that
+arrives before it joins that flush. Write responses are sent only after the
+flush, so an acknowledged change is on disk.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Mapping
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import app.constants as constants
+import app.metrics as metrics
+from app.app_core import GroceryList
+from app.grocery_item import GroceryItem
+
+logger = logging.getLogger(__name__)
+
+# Fields a client may set on add/edit
+EDITABLE_FIELDS = ("name", "store", "cost", "amount", "priority", "buy")
+
+
+class HttpError(Exception):
+    """An error reported to the client as a JSON {"error": ...} response."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        """Remember the HTTP status and message."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ValidationError(HttpError):
+    """Invalid client input (a field value, the body), reported as 400."""
+
+    def __init__(self, message: str) -> None:
+        """Remember the message; the status is always 400 Bad Request."""
+        super().__init__(HTTPStatus.BAD_REQUEST, message)
+
+
+class GroceryApi:
+    """Routes HTTP requests to a GroceryList and coalesces their writes."""
+
+    def __init__(
+        self,
+        grocery_app: GroceryList,
+        flush_delay: float = constants.HTTP_FLUSH_DELAY,
+    ) -> None:
+        """
+        Wrap a GroceryList.
+
+        Args:
+            grocery_app: The list to serve. `serve` runs it inside a batch.
+            flush_delay: Seconds to wait for more writes before flushing.
+        """
+        self.grocery_app = grocery_app
+        # A failed write must reach `_flush` so requests are not acknowledged.
+        grocery_app.backend.strict = True
+        self.flush_delay = flush_delay
+        self.requests = 0
+        self.flushes = 0
+        self._flush_waiter: asyncio.Future | None = None
+
+    # -------------------------
+    # Server
+    # -------------------------
+
+    def serve(self, host: str, port: int) -> None:
+        """Serve until interrupted, then write any queued changes."""
+        with self.grocery_app.batch():
+            try:
+                asyncio.run(self._serve(host, port))
+            except KeyboardInterrupt:
+                print("\nStopping HTTP API.")
+
+    async def _serve(self, host: str, port: int) -> None:
+        """Accept connections forever."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Grocery HTTP API listening on http://{host}:{port} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve requests on one (keep-alive) connection until it closes."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as exc:
+                    writer.write(self._response(exc.status, {"error": exc.message}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, keep_alive, body = request
+                status, payload = await self.dispatch(method, target, body)
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, bool, bytes] | None:
+        """Read one request; return None if the client closed the connection."""
+        try:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                return None
+
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.") from None
+
+            headers: dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HttpError(
+                HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Header line too long.") from None
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.") from None
+        if length > constants.HTTP_MAX_BODY:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+        body = await reader.readexactly(length) if length > 0 else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, keep_alive, body
+
+    @staticmethod
+    def _response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+        """Encode a JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    # -------------------------
+    # Routing
+    # -------------------------
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[HTTPStatus, Any]:
+        """Run one request and return (status, JSON payload)."""
+        self.requests += 1
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        try:
+            if parts == ["health"] and method == "GET":
+                return HTTPStatus.OK, self.health()
+
+            if parts == ["summary"] and method == "GET":
+                return HTTPStatus.OK, self.grocery_app.summary()
+
+            if parts == ["stats"] and method == "GET":
+                return HTTPStatus.OK, metrics.report()
+
+            if parts == ["items"]:
+                if method == "GET":
+                    return HTTPStatus.OK, self.list_items(
+                        query.get("q", [None])[0],
+                        query.get("store"),
+                        query.get("fuzzy", ["0"])[0] in constants.BUY_TRUE,
+                    )
+                if method == "POST":
+                    item = self.add_item(self._json_body(body))
+                    await self.persist()
+                    return HTTPStatus.CREATED, {"item": self._item_json(item)}
+
+            if len(parts) == 2 and parts[0] == "items":
+                item = self._find_item(parts[1])
+                if method == "GET":
+                    return HTTPStatus.OK, {"item": self._item_json(item)}
+                if method == "PATCH":
+                    self.edit_item(item, self._json_body(body))
+                    await self.persist()
+                    return HTTPStatus.OK, {"item": self._item_json(item)}
+                if method == "DELETE":
+                    self.grocery_app.remove_item(item.name, id=item.id)
+                    await self.persist()
+                    return HTTPStatus.OK, {"removed": str(item.id)}
+
+            if parts == ["export"] and method == "POST":
+                return HTTPStatus.OK, self.export(query.get("store"))
+
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}.")
+        except HttpError as exc:
+            return exc.status, {"error": exc.message}
+        except Exception as exc:
+            # A bug or a failed export (bad input raises ValidationError
+            # above); the connection stays usable.
+            logger.exception("Unhandled error in %s %s", method, url.path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def persist(self) -> None:
+        """Wait until queued writes are flushed; concurrent callers share one flush."""
+        if self._flush_waiter is None:
+            loop = asyncio.get_running_loop()
+            self._flush_waiter = loop.create_future()
+            loop.call_later(self.flush_delay, self._flush)
+        # Shielded so a client disconnecting does not cancel everyone's flush.
+        try:
+            await asyncio.shield(self._flush_waiter)
+        except Exception as exc:
+            raise HttpError(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"Could not save changes: {exc}") from exc
+
+    def _flush(self) -> None:
+        """Write every queued change and wake the requests waiting on it."""
+        waiter, self._flush_waiter = self._flush_waiter, None
+        try:
+            self.grocery_app.flush()
+        except Exception as exc:
+            # Logged once here; every waiting request answers with a 500.
+            logger.exception("Flush failed")
+            waiter.set_exception(exc)
+        else:
+            waiter.set_result(None)
+        self.flushes += 1
+
+    # -------------------------
+    # Handlers
+    # -------------------------
+
+    def health(self) -> dict:
+        """Return basic server counters."""
+        return {
+            "items": len(self.grocery_app.grocery_list),
+            "requests": self.requests,
+            "flushes": self.flushes,
+        }
+
+    def list_items(
+        self,
+        prefix: str | None,
+        stores: list[str] | None = None,
+        fuzzy: bool = False,
+    ) -> dict:
+        """Return all items, or those whose name starts with (or resembles) `prefix`."""
+        if prefix is None:
+            items = self.grocery_app.grocery_list
+            if stores is not None:
+                folded = {store.casefold() for store in stores}
+                items = [item for item in items if item.store.casefold() in folded]
+        elif fuzzy:
+            items = self.grocery_app.search_fuzzy(prefix, stores=stores)
+        else:
+            items = self.grocery_app.search_item_name(prefix, stores=stores)
+        return {"items": [self._item_json(item) for item in items]}
+
+    def add_item(self, body: Mapping) -> GroceryItem:
+        """Add an item from a JSON object (missing fields use the defaults)."""
+        fields = self._fields(body)
+        return self.grocery_app.add_item(
+            name=fields.get("name", constants.NAME_DEFAULT),
+            store=fields.get("store", constants.STORE_DEFAULT),
+            cost=fields.get("cost", constants.COST_DEFAULT),
+            amount=fields.get("amount", constants.AMOUNT_DEFAULT),
+            priority=fields.get("priority", constants.PRIORITY_DEFAULT),
+            buy=fields.get("buy", constants.BUY_DEFAULT),
+        )
+
+    def edit_item(self, item: GroceryItem, body: Mapping) -> None:
+        """Apply the fields of a JSON object to an item."""
+        self.grocery_app.edit_item(id=item.id, **self._fields(body))
+
+    def export(self, stores: list[str] | None = None) -> dict:
+        """Write the export file and return the buy items and their total."""
+        result = self.grocery_app.export_items(stores=stores, echo=False)
+
+        buy_items = [item for item in self.grocery_app.grocery_list if item.buy]
+        if stores is not None:
+            folded = {store.casefold() for store in stores}
+            buy_items = [item for item in buy_items if item.store.casefold() in folded]
+        return {
+            "items": [self._item_json(item) for item in buy_items],
+            "total_cost": 0.0 if result is None else result.total,
+            "path": None if result is None else result.path,
+        }
+
+    # -------------------------
+    # Helpers
+    # -------------------------
+
+    def _find_item(self, raw_id: str) -> GroceryItem:
+        """Return the item with the ID from a URL (404 if there is none)."""
+        try:
+            item = self.grocery_app.get_item_from_id(int(raw_id))
+        except ValueError:
+            item = None
+        if item is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No item with id {raw_id}.")
+        return item
+
+    @staticmethod
+    def _json_body(body: bytes) -> Mapping:
+        """Decode a JSON object request body."""
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise ValidationError("Body must be valid JSON.") from None
+        if not isinstance(data, dict):
+            raise ValidationError("Body must be a JSON object.")
+        return data
+
+    @staticmethod
+    def _fields(body: Mapping) -> dict[str, Any]:
+        """Return the editable fields present in a body (buy may be a string).
+
+        Raises:
+            ValidationError: If a field is unknown or has an invalid value.
+        """
+        unknown = set(body) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValidationError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+
+        fields = {key: body[key] for key in EDITABLE_FIELDS if body.get(key) is not None}
+        try:
+            if isinstance(fields.get("buy"), str):
+                fields["buy"] = GroceryList._parse_bool(fields["buy"])
+            # Checked here so that a ValueError from the core is a bug (500),
+            # not the client's fault.
+            GroceryItem.from_record(fields)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(str(exc)) from None
+        return fields
+
+    @staticmethod
+    def _item_json(item: GroceryItem) -> dict:
+        """Return an item as JSON (ID as a string)."""
+        data = item.to_dict()
+        data["id"] = str(item.id)
+        return data
@@ -0,0 +1,92 @@
+"""
+importer.py
+
+Streaming readers for bulk-importing grocery items from CSV or JSON Lines.
+
+Rows are yielded one at a time so arbitrarily large files can be fed straight
+into `GroceryList.add_items` without being loaded into memory first.
+"""
+
+import csv
+import json
+import os
+from collections.abc import Iterator
+
+# File extensions recognised for each format in constants.IMPORT_FORMATS
+IMPORT_EXTENSIONS = {
+    "csv": (".csv",),
+    "jsonl": (".jsonl", ".ndjson"),
+}
+
+
+def detect_format(file_path: str) -> str | None:
+    """
+    Return the import format for a file based on its extension.
+
+    Args:
+        file_path: Path to the file to import.
+
+    Returns:
+        "csv", "jsonl", or None if the extension is not recognised.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    for file_format, extensions in IMPORT_EXTENSIONS.items():
+        if extension in extensions:
+            return file_format
+    return None
+
+
+def iter_rows(file_path: str, file_format: str) -> Iterator[dict | None]:
+    """
+    Yield one row per record in the file.
+
+    CSV files must have a header row naming the columns (name, store, cost,
+    amount, priority, buy). JSON Lines files hold one object per line; blank
+    lines are skipped. Records that cannot be parsed or are not valid UTF-8
+    yield None so the caller can report them without aborting.
+
+    Args:
+        file_path: Path to the file to import.
+        file_format: "csv" or "jsonl".
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if file_format == "csv":
+        # Undecodable bytes become lone surrogates instead of aborting the
+        # whole file, and the rows holding them are reported below.
+        with open(file_path, "r", encoding="utf-8", errors="surrogateescape", newline="") as file:
+            reader = csv.DictReader(file)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error:
+                    yield None
+                    continue
+                yield row if _is_valid_text(row) else None
+
+    with open(file_path, "rb") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode("utf-8"))
+            except ValueError:
+                # json.JSONDecodeError and UnicodeDecodeError
+                yield None
+
+
+def _is_valid_text(row: dict) -> bool:
+    """Return False if a CSV row holds bytes that were not valid UTF-8."""
+    try:
+        for key, value in row.items():
+            if isinstance(key, str):
+                key.encode("utf-8")
+            if isinstance(value, str):
+                value.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
@@ -0,0 +1,691 @@
+"""
+indexes.py
+
+In-memory secondary indexes used by `GroceryList`.
+
+Each index is kept up to date incrementally by `GroceryList` on add, edit, and
+remove, and can be rebuilt in bulk when the list is loaded from disk.
+"""
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from itertools import islice
+
+from app.grocery_item import GroceryItem
+
+
+class PrefixIndex:
+    """
+    Case-folded, sorted name index for prefix search.
+
+    Entries are `(folded_name, seq, item_id)` tuples kept in a sorted list, so a
+    prefix lookup is a bisect plus a scan over the matches (O(log n + k)).
+    `seq` is the order in which an ID was first indexed; it breaks ties between
+    equal names so results come back in a deterministic order.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._keys: list[tuple[str, int, int]] = []
+        self._seq: dict[int, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._keys)
+
+    @staticmethod
+    def fold(name: str) -> str:
+        """Return the case-folded form of a name used for comparisons."""
+        return name.casefold()
+
+    def _assign_seq(self, item_id: int) -> int:
+        """Return the tie-break sequence for an ID, assigning one if new."""
+        seq = self._seq.get(item_id)
+        if seq is None:
+            seq = self._next_seq
+            self._seq[item_id] = seq
+            self._next_seq += 1
+        return seq
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the index contents with `items` (sorted once, O(n log n))."""
+        self._keys = []
+        self._seq = {}
+        self._next_seq = 0
+
+        for item in items:
+            self._keys.append(
+                (self.fold(item.name), self._assign_seq(item.id), item.id))
+
+        self._keys.sort()
+
+    def add(self, item: GroceryItem) -> None:
+        """Insert an item into the index."""
+        insort(self._keys, (self.fold(item.name), self._assign_seq(item.id), item.id))
+
+    def remove(self, item_id: int, name: str, forget: bool = True) -> None:
+        """
+        Remove an item from the index.
+
+        Args:
+            item_id: ID of the item to remove.
+            name: The name the item was indexed under.
+            forget: Drop the item's tie-break sequence as well. Pass False when
+                the item is about to be re-added under a new name.
+        """
+        seq = self._seq.get(item_id)
+        if seq is None:
+            return
+
+        key = (self.fold(name), seq, item_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+        if forget:
+            del self._seq[item_id]
+
+    def rename(self, item: GroceryItem, old_name: str) -> None:
+        """Move an item from `old_name` to its current name."""
+        self.remove(item.id, old_name, forget=False)
+        self.add(item)
+
+    def search(self, prefix: str) -> Iterator[int]:
+        """Yield IDs whose folded name starts with `prefix`, in sorted order."""
+        folded = self.fold(prefix)
+        position = bisect_left(self._keys, (folded,))
+
+        keys = self._keys
+        for index in range(position, len(keys)):
+            key = keys[index]
+            if not key[0].startswith(folded):
+                break
+            yield key[2]
+
+
+class TrigramIndex:
+    """
+    Character-trigram inverted index for typo-tolerant name search.
+
+    Names are case-folded and split into words; each distinct word is padded
+    (two spaces before, one after) and split into 3-character grams, so
+    "chese" and "cheese" share most of their grams. The index is two-level:
+    grams map to the distinct words that contain them and words map to the
+    items that use them. Typo matching therefore runs over the vocabulary,
+    which is far smaller than the item count on real lists.
+
+    A query word matches a vocabulary word when the Jaccard similarity of
+    their gram sets reaches the threshold. Candidate words come only from the
+    postings of the query's rarest grams (prefix filtering: a word sharing
+    `ceil(threshold * |query grams|)` grams must contain one of them), so the
+    long postings of common grams are never scanned. An item scores the mean,
+    over the query words, of its best matching word's similarity.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._gram_words: dict[str, set[str]] = {}
+        self._word_grams: dict[str, frozenset[str]] = {}
+        self._word_items: dict[str, set[int]] = {}
+        self._item_words: dict[int, tuple[str, ...]] = {}
+        # ID -> (name length, folded name): ties rank shorter names first.
+        self._rank_keys: dict[int, tuple[int, str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._item_words)
+
+    @staticmethod
+    def words(name: str) -> tuple[str, ...]:
+        """Return the distinct case-folded words of a name, in order."""
+        return tuple(dict.fromkeys(name.casefold().split()))
+
+    @staticmethod
+    def trigrams(word: str) -> frozenset[str]:
+        """Return the padded trigrams of a single word."""
+        padded = f"  {word} "
+        return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the index contents with `items`."""
+        self._gram_words = {}
+        self._word_grams = {}
+        self._word_items = {}
+        self._item_words = {}
+        self._rank_keys = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: GroceryItem) -> None:
+        """Index an item's name."""
+        words = self.words(item.name)
+        self._item_words[item.id] = words
+        folded = item.name.casefold()
+        self._rank_keys[item.id] = (len(folded), folded)
+
+        for word in words:
+            items = self._word_items.get(word)
+            if items is None:
+                self._word_items[word] = {item.id}
+                self._add_word(word)
+            else:
+                items.add(item.id)
+
+    def remove(self, item_id: int) -> None:
+        """Remove an item from the index."""
+        words = self._item_words.pop(item_id, None)
+        if words is None:
+            return
+        del self._rank_keys[item_id]
+
+        for word in words:
+            items = self._word_items[word]
+            items.discard(item_id)
+            if not items:
+                del self._word_items[word]
+                self._remove_word(word)
+
+    def rename(self, item: GroceryItem) -> None:
+        """Re-index an item whose name changed."""
+        self.remove(item.id)
+        self.add(item)
+
+    def _add_word(self, word: str) -> None:
+        """Add a new vocabulary word to the gram postings."""
+        grams = self.trigrams(word)
+        self._word_grams[word] = grams
+        for gram in grams:
+            words = self._gram_words.get(gram)
+            if words is None:
+                self._gram_words[gram] = {word}
+            else:
+                words.add(word)
+
+    def _remove_word(self, word: str) -> None:
+        """Drop a vocabulary word no item uses any more."""
+        for gram in self._word_grams.pop(word):
+            words = self._gram_words[gram]
+            words.discard(word)
+            if not words:
+                del self._gram_words[gram]
+
+    def similar_words(self, query_word: str, threshold: float) -> list[tuple[float, str]]:
+        """Return (similarity, word) for vocabulary words similar to `query_word`.
+
+        Results are ordered by similarity, best first.
+        """
+        query_grams = self.trigrams(query_word)
+        gram_words = self._gram_words
+        known = sorted(
+            (gram for gram in query_grams if gram in gram_words),
+            key=lambda gram: len(gram_words[gram]),
+        )
+        needed = max(1, math.ceil(threshold * len(query_grams)))
+        if len(known) < needed:
+            return []
+
+        candidates: set[str] = set()
+        for gram in known[:len(known) - needed + 1]:
+            candidates.update(gram_words[gram])
+
+        size = len(query_grams)
+        matches = []
+        for word in candidates:
+            grams = self._word_grams[word]
+            shared = len(query_grams & grams)
+            similarity = shared / (size + len(grams) - shared)
+            if similarity >= threshold:
+                matches.append((similarity, word))
+        matches.sort(reverse=True)
+        return matches
+
+    def search(
+        self,
+        query: str,
+        threshold: float,
+        limit: int | None = None,
+    ) -> list[tuple[float, int]]:
+        """
+        Return (score, ID) pairs for names similar to `query`.
+
+        Args:
+            query: Text to match (typos allowed).
+            threshold: Minimum similarity (0-1) for a word to match and for an
+                item's overall score.
+            limit: Maximum number of results (None for all).
+
+        Returns:
+            Matches ordered by score (best first), then shorter names first,
+            then by name.
+        """
+        query_words = self.words(query)
+        if not query_words:
+            return []
+
+        scores: dict[int, float] = {}
+        for query_word in query_words:
+            # Words arrive best first, so the first score an item gets for
+            # this query word is its best one.
+            best: dict[int, float] = {}
+            for similarity, word in self.similar_words(query_word, threshold):
+                best.update(dict.fromkeys(self._word_items[word] - best.keys(), similarity))
+
+            if not scores:
+                scores = best
+                continue
+            # Merge at C speed, then add up only the items matched by both.
+            common = scores.keys() & best.keys()
+            merged = {**best, **scores}
+            for item_id in common:
+                merged[item_id] += best[item_id]
+            scores = merged
+
+        if not scores:
+            return []
+
+        # Totals are compared before dividing by the word count.
+        count = len(query_words)
+        floor = threshold * count
+        if limit is not None and len(scores) > limit:
+            # Everything tied with the limit-th best total is kept so the
+            # tie-break below sees all of them.
+            floor = max(floor, heapq.nlargest(limit, scores.values())[-1])
+        ranked = [item_id for item_id, total in scores.items() if total >= floor]
+
+        # Two stable sorts with C-level keys: tie-break first, then score.
+        ranked.sort(key=self._rank_keys.__getitem__)
+        ranked.sort(key=scores.__getitem__, reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(scores[item_id] / count, item_id) for item_id in ranked]
+
+
+class FieldIndex:
+    """
+    Hash index from one field's value to the IDs of the items with that value.
+
+    Meant for low-cardinality fields (store, priority, buy). An equality
+    lookup is a single dict access; any other comparison unions the buckets
+    of the matching distinct values, so it costs O(distinct values) rather
+    than O(items).
+    """
+
+    def __init__(self, key: Callable[[GroceryItem], Hashable]) -> None:
+        """
+        Create an empty index.
+
+        Args:
+            key: Returns the indexed value of an item (e.g. its folded store).
+        """
+        self._key = key
+        self._buckets: dict[Hashable, set[int]] = {}
+        self._keys: dict[int, Hashable] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._keys)
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the index contents with `items`."""
+        items = list(items)
+        self._keys = dict(zip((item.id for item in items), map(self._key, items)))
+        self._buckets = {}
+        for item_id, value in self._keys.items():
+            bucket = self._buckets.get(value)
+            if bucket is None:
+                self._buckets[value] = {item_id}
+            else:
+                bucket.add(item_id)
+
+    def add(self, item: GroceryItem) -> None:
+        """Index an item."""
+        value = self._key(item)
+        self._keys[item.id] = value
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            self._buckets[value] = {item.id}
+        else:
+            bucket.add(item.id)
+
+    def remove(self, item_id: int) -> None:
+        """Remove an item from the index."""
+        if item_id not in self._keys:
+            return
+        value = self._keys.pop(item_id)
+        bucket = self._buckets[value]
+        bucket.discard(item_id)
+        if not bucket:
+            del self._buckets[value]
+
+    def update(self, item: GroceryItem) -> None:
+        """Move an edited item to its new bucket (no-op if the value is unchanged)."""
+        if item.id in self._keys and self._keys[item.id] == self._key(item):
+            return
+        self.remove(item.id)
+        self.add(item)
+
+    def buckets(self, test: Callable[[Hashable], bool]) -> list[set[int]]:
+        """Return the ID sets of every distinct value for which `test` is true."""
+        return [bucket for value, bucket in self._buckets.items() if test(value)]
+
+
+class SortedIndex:
+    """
+    Index over one numeric field, sorted by value, for range queries.
+
+    Values and IDs are kept in two parallel lists so lookups bisect a plain
+    list of numbers. A range is located with two bisects, so counting its
+    matches is O(log n) and listing them is O(log n + k).
+    """
+
+    def __init__(self, key: Callable[[GroceryItem], float]) -> None:
+        """
+        Create an empty index.
+
+        Args:
+            key: Returns the indexed value of an item (e.g. its cost).
+        """
+        self._key = key
+        self._values: list[float] = []
+        self._ids: list[int] = []
+        self._keys: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._ids)
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the index contents with `items` (sorted once, O(n log n))."""
+        items = list(items)
+        values = list(map(self._key, items))
+        ids = [item.id for item in items]
+        order = sorted(range(len(values)), key=values.__getitem__)
+
+        self._keys = dict(zip(ids, values))
+        self._values = [values[position] for position in order]
+        self._ids = [ids[position] for position in order]
+
+    def add(self, item: GroceryItem) -> None:
+        """Index an item."""
+        value = self._key(item)
+        self._keys[item.id] = value
+        position = bisect_right(self._values, value)
+        self._values.insert(position, value)
+        self._ids.insert(position, item.id)
+
+    def remove(self, item_id: int) -> None:
+        """Remove an item from the index."""
+        if item_id not in self._keys:
+            return
+        value = self._keys.pop(item_id)
+        start = bisect_left(self._values, value)
+        stop = bisect_right(self._values, value, start)
+        position = self._ids.index(item_id, start, stop)
+        del self._values[position]
+        del self._ids[position]
+
+    def update(self, item: GroceryItem) -> None:
+        """Re-sort an edited item (no-op if the value is unchanged)."""
+        if item.id in self._keys and self._keys[item.id] == self._key(item):
+            return
+        self.remove(item.id)
+        self.add(item)
+
+    def span(
+        self,
+        low: float | None = None,
+        high: float | None = None,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> tuple[int, int]:
+        """
+        Return the (start, stop) positions of the values in a range.
+
+        Args:
+            low: Lower bound (None for unbounded).
+            high: Upper bound (None for unbounded).
+            include_low: Whether a value equal to `low` is in the range.
+            include_high: Whether a value equal to `high` is in the range.
+        """
+        values = self._values
+        start, stop = 0, len(values)
+        if low is not None:
+            start = (bisect_left if include_low else bisect_right)(values, low)
+        if high is not None:
+            stop = (bisect_right if include_high else bisect_left)(values, high)
+        return start, max(start, stop)
+
+    def ids(self, start: int, stop: int) -> list[int]:
+        """Return the IDs between two positions returned by `span`, by value."""
+        return self._ids[start:stop]
+
+
+class PriorityView:
+    """
+    Items bucketed by (buy flag, priority) for "most important first" reads.
+
+    Priorities are small integers in `PRIORITY_MIN..PRIORITY_MAX`, so each
+    bucket is an insertion-ordered dict of IDs and adding, moving or removing
+    an item is O(1). `top` walks the buckets from the highest priority down
+    and stops after k IDs, so it costs O(k + number of priorities) no matter
+    how long the list is.
+    """
+
+    def __init__(self, lowest: int, highest: int) -> None:
+        """
+        Create an empty view.
+
+        Args:
+            lowest: Lowest valid priority.
+            highest: Highest valid priority (the most important).
+        """
+        self._lowest = lowest
+        self._highest = highest
+        self._buckets = self._empty_buckets()
+        self._keys: dict[int, tuple[bool, int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._keys)
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the view contents with `items`."""
+        self._buckets = self._empty_buckets()
+        self._keys = {}
+        for item in items:
+            self.add(item)
+
+    def _empty_buckets(self) -> dict[bool, list[dict[int, None]]]:
+        """Return one empty bucket per priority for each buy flag."""
+        return {
+            buy: [{} for _ in range(self._highest - self._lowest + 1)]
+            for buy in (True, False)
+        }
+
+    def add(self, item: GroceryItem) -> None:
+        """Add an item to the end of its bucket."""
+        key = (bool(item.buy), item.priority)
+        self._keys[item.id] = key
+        self._buckets[key[0]][key[1] - self._lowest][item.id] = None
+
+    def remove(self, item_id: int) -> None:
+        """Remove an item from the view."""
+        key = self._keys.pop(item_id, None)
+        if key is not None:
+            del self._buckets[key[0]][key[1] - self._lowest][item_id]
+
+    def update(self, item: GroceryItem) -> None:
+        """Move an edited item if its buy flag or priority changed."""
+        if self._keys.get(item.id) == (bool(item.buy), item.priority):
+            return
+        self.remove(item.id)
+        self.add(item)
+
+    def top(self, k: int, buy_only: bool = True) -> list[int]:
+        """
+        Return up to k IDs, highest priority first.
+
+        Items with the same priority come back in the order they entered
+        that priority; with `buy_only=False`, items marked to buy come before
+        the others at each priority.
+        """
+        result: list[int] = []
+        if k <= 0:
+            return result
+        flags = (True,) if buy_only else (True, False)
+        for priority in range(self._highest, self._lowest - 1, -1):
+            for buy in flags:
+                bucket = self._buckets[buy][priority - self._lowest]
+                if len(bucket) >= k - len(result):
+                    result.extend(islice(bucket, k - len(result)))
+                    return result
+                result.extend(bucket)
+        return result
+
+
+class CostAggregates:
+    """
+    Running totals over the list: item counts and amount * cost subtotals,
+    overall, per store and per priority, each for all items and buy items.
+
+    Every item's contribution is remembered by ID, so adding, editing or
+    removing an item adjusts the sums in O(1) and reading them costs
+    O(stores + priorities). Subtotals are integer cents (`amount *
+    cost_cents`), so they are exact and never drift however many edits are
+    applied.
+    """
+
+    def __init__(self) -> None:
+        """Create empty aggregates."""
+        self.rebuild(())
+
+    def __len__(self) -> int:
+        """Return the number of aggregated items."""
+        return len(self._keys)
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the aggregates with those of `items`."""
+        # ID -> (store, buy, priority, line total in cents)
+        self._keys: dict[int, tuple[str, bool, int, int]] = {}
+        # Store -> [items, buy items, subtotal, buy subtotal] (cents)
+        self._stores: dict[str, list[int]] = {}
+        # Priority -> [items, buy items]
+        self._priorities: dict[int, list[int]] = {}
+        # [items, buy items, subtotal, buy subtotal] over the whole list
+        self._totals = [0, 0, 0, 0]
+
+        # Bulk path: compute every key once, then fold the per-(store, buy)
+        # and per-(priority, buy) groups in instead of applying item by item.
+        self._keys = {
+            item.id: (item.store, bool(item.buy), item.priority, item.amount * item.cost_cents)
+            for item in items
+        }
+        groups: dict[tuple[str, bool], list[int]] = {}
+        for store, buy, _priority, line in self._keys.values():
+            sums = groups.get((store, buy))
+            if sums is None:
+                groups[(store, buy)] = [1, line]
+            else:
+                sums[0] += 1
+                sums[1] += line
+        for (store, buy), (count, line) in groups.items():
+            for sums in (self._totals, self._stores.setdefault(store, [0, 0, 0, 0])):
+                sums[0] += count
+                sums[2] += line
+                if buy:
+                    sums[1] += count
+                    sums[3] += line
+        for (priority, buy), count in Counter(
+            (key[2], key[1]) for key in self._keys.values()
+        ).items():
+            counts = self._priorities.setdefault(priority, [0, 0])
+            counts[0] += count
+            if buy:
+                counts[1] += count
+
+    def _key(self, item: GroceryItem) -> tuple[str, bool, int, int]:
+        """Return what an item contributes to the aggregates."""
+        return item.store, bool(item.buy), item.priority, item.amount * item.cost_cents
+
+    def add(self, item: GroceryItem) -> None:
+        """Add an item's contribution."""
+        key = self._key(item)
+        self._keys[item.id] = key
+        self._apply(key, 1)
+
+    def remove(self, item_id: int) -> None:
+        """Subtract an item's contribution."""
+        key = self._keys.pop(item_id, None)
+        if key is not None:
+            self._apply(key, -1)
+
+    def update(self, item: GroceryItem) -> None:
+        """Replace an edited item's old contribution with its new one."""
+        key = self._key(item)
+        old = self._keys.get(item.id)
+        if old == key:
+            return
+        if old is not None:
+            self._apply(old, -1)
+        self._keys[item.id] = key
+        self._apply(key, 1)
+
+    def _apply(self, key: tuple[str, bool, int, int], sign: int) -> None:
+        """Add (sign 1) or subtract (sign -1) one contribution."""
+        store, buy, priority, line = key
+        line *= sign
+        buy_sign = sign if buy else 0
+        buy_line = line if buy else 0
+
+        for sums in (
+            self._totals,
+            self._stores.setdefault(store, [0, 0, 0, 0]),
+        ):
+            sums[0] += sign
+            sums[1] += buy_sign
+            sums[2] += line
+            sums[3] += buy_line
+
+        counts = self._priorities.setdefault(priority, [0, 0])
+        counts[0] += sign
+        counts[1] += buy_sign
+
+        # Sums are exact, so an emptied store is back to all zeros.
+        if self._stores[store][0] == 0:
+            del self._stores[store]
+        if counts[0] == 0:
+            del self._priorities[priority]
+
+    def count(self, buy_only: bool = False) -> int:
+        """Return the number of items (or buy items)."""
+        return self._totals[1 if buy_only else 0]
+
+    def total(self, buy_only: bool = False) -> int:
+        """Return the pre-tax subtotal in cents of all items (or buy items)."""
+        return self._totals[3 if buy_only else 2]
+
+    def store_counts(self, buy_only: bool = False) -> dict[str, int]:
+        """Return the number of items (or buy items) per store."""
+        column = 1 if buy_only else 0
+        return {store: sums[column] for store, sums in self._stores.items() if sums[column]}
+
+    def store_totals(self, buy_only: bool = False) -> dict[str, int]:
+        """Return the pre-tax subtotal in cents per store (stores with buy items if `buy_only`)."""
+        count, column = (1, 3) if buy_only else (0, 2)
+        return {
+            store: sums[column]
+            for store, sums in self._stores.items() if sums[count]
+        }
+
+    def priority_counts(self, buy_only: bool = False) -> dict[int, int]:
+        """Return the number of items (or buy items) per priority, highest first."""
+        column = 1 if buy_only else 0
+        return {
+            priority: self._priorities[priority][column]
+            for priority in sorted(self._priorities, reverse=True)
+            if self._priorities[priority][column]
+        }
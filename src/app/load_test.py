@@ -0,0 +1,210 @@
+"""
+load_test.py
+
+Load generator for the HTTP JSON API (`app --mode http`).
+
+Opens `--clients` concurrent keep-alive connections to a running instance and
+has each send `--requests` requests: a mix of adds, edits, prefix searches and
+item lookups controlled by `--write-ratio`. Prints throughput, latency
+percentiles, error counts and how many flushes the server needed for the
+writes. Items created by the run are deleted afterwards unless `--keep` is set.
+
+Usage:
+    app --mode http &
+    python -m app.load_test --clients 50 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import app.constants as constants
+
+# Name prefix for items created by the load test
+NAME_PREFIX = "loadtest-"
+
+
+class Client:
+    """Minimal keep-alive HTTP/1.1 JSON client over one connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Wrap an open connection."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "Client":
+        """Connect to the API."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        """Send a request and return (status, decoded JSON body)."""
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data) if data else {}
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_client(
+    client_number: int,
+    args: argparse.Namespace,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+    created: list[str],
+) -> None:
+    """Send `args.requests` requests over one connection."""
+    client = await Client.open(args.host, args.port)
+    rng = random.Random(client_number)
+    own_ids: list[str] = []
+
+    try:
+        for request_number in range(args.requests):
+            if rng.random() < args.write_ratio:
+                if own_ids and rng.random() < 0.5:
+                    op = "edit"
+                    method, path = "PATCH", f"/items/{rng.choice(own_ids)}"
+                    payload = {"amount": rng.randint(1, 10), "buy": rng.random() < 0.5}
+                else:
+                    op = "add"
+                    method, path = "POST", "/items"
+                    payload = {
+                        "name": f"{NAME_PREFIX}{client_number}-{request_number}",
+                        "store": rng.choice(("Kroger", "Costco", "Walmart")),
+                        "cost": round(rng.uniform(0.5, 20.0), 2),
+                        "amount": rng.randint(1, 5),
+                        "priority": rng.randint(constants.PRIORITY_MIN, constants.PRIORITY_MAX),
+                    }
+            elif own_ids and rng.random() < 0.5:
+                op = "get"
+                method, path, payload = "GET", f"/items/{rng.choice(own_ids)}", None
+            else:
+                op = "search"
+                method, path, payload = "GET", f"/items?q={NAME_PREFIX}{client_number}-1", None
+
+            start = time.perf_counter()
+            status, body = await client.request(method, path, payload)
+            latencies.setdefault(op, []).append(time.perf_counter() - start)
+
+            if status >= 400:
+                errors[op] = errors.get(op, 0) + 1
+            elif op == "add":
+                own_ids.append(body["item"]["id"])
+    finally:
+        created.extend(own_ids)
+        await client.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the value at `fraction` (0-1) of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run the load test and return its report."""
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    created: list[str] = []
+
+    control = await Client.open(args.host, args.port)
+    _status, before = await control.request("GET", "/health")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(number, args, latencies, errors, created)
+        for number in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    _status, after = await control.request("GET", "/health")
+
+    if not args.keep:
+        for item_id in created:
+            await control.request("DELETE", f"/items/{item_id}")
+    await control.close()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    writes = sum(len(latencies.get(op, [])) for op in ("add", "edit"))
+    return {
+        "clients": args.clients,
+        "requests": len(all_latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(all_latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(all_latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(all_latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(all_latencies, 0.99) * 1000, 3),
+            "max": round(max(all_latencies) * 1000, 3),
+        },
+        "operations": {op: len(values) for op, values in sorted(latencies.items())},
+        "errors": errors,
+        "writes": writes,
+        "flushes": after["flushes"] - before["flushes"],
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print the report."""
+    parser = argparse.ArgumentParser(description="Load-test the grocery HTTP API")
+    parser.add_argument("--host", default=constants.HTTP_HOST, help="API host")
+    parser.add_argument("--port", type=int, default=constants.HTTP_PORT, help="API port")
+    parser.add_argument("--clients", type=int, default=20,
+                        help="Concurrent connections (default: 20)")
+    parser.add_argument("--requests", type=int, default=100,
+                        help="Requests per connection (default: 100)")
+    parser.add_argument("--write-ratio", type=float, default=0.5,
+                        help="Fraction of requests that add or edit (default: 0.5)")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep the items created by the run")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(args))
+    except OSError as exc:
+        print(f"Could not reach http://{args.host}:{args.port}: {exc}")
+        return
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['requests']} requests from {report['clients']} clients "
+          f"in {report['seconds']}s ({report['requests_per_second']} req/s)")
+    latency = report["latency_ms"]
+    print(f"latency ms: p50 {latency['p50']} | p95 {latency['p95']} "
+          f"| p99 {latency['p99']} | max {latency['max']}")
+    print(f"operations: {report['operations']}")
+    print(f"errors: {report['errors'] or 'none'}")
+    print(f"{report['writes']} writes persisted in {report['flushes']} flush(es)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,205 @@
+"""
+log_config.py
+
+Logging setup for the Grocery List application.
+
+Log calls never touch the disk on the calling thread: the root logger gets a
+`QueueHandler` that only puts the record on an in-memory queue, and a
+`QueueListener` thread formats the records and writes them to a size-rotated
+`grocery_logger.log` in the data directory, flushing whenever the queue runs
+dry rather than after every record. The level comes from
+GROCERY_APP_LOG_LEVEL (default INFO).
+
+Structured events on hot paths (e.g. `GroceryList` mutations) go through
+`log_event`, which skips building a `LogRecord` on the calling thread: it
+queues an (event, fields) tuple and the writer thread turns it into a record
+rendered as `event {json}`.
+"""
+
+import atexit
+import json
 import logging
 import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any
 
 import app.constants as constants
 
-os.makedirs(constants.EXPORT_PATH, exist_ok=True)
-log_file_name = os.path.join(constants.EXPORT_PATH, 'grocery_logger.log')
+log_file_name = os.path.join(constants.EXPORT_PATH, constants.LOG_FILE)
+
+# Queue between the logging calls and the writer thread, the root logger's
+# handler feeding it, and the thread itself (None until `configure_logging`
+# runs)
+_records: queue.SimpleQueue | None = None
+_handler: QueueHandler | None = None
+_listener: QueueListener | None = None
+
+# Without `configure_logging` (e.g. the core used as a library), the package's
+# records stop here instead of reaching Python's last-resort stderr handler.
+logging.getLogger("app").addHandler(logging.NullHandler())
+
+
+class StructuredMessage:
+    """A log message with JSON fields, rendered when the record is written."""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: dict[str, Any]) -> None:
+        """Remember the event name and its fields (which must not change later)."""
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        """Return `event {"field": value, ...}`."""
+        return f"{self.event} {json.dumps(self.fields, default=str)}"
+
+
+def log_event(
+    logger: logging.Logger,
+    level: int,
+    event: str,
+    fields: dict[str, Any],
+) -> None:
+    """
+    Log a structured event without blocking on formatting or disk writes.
+
+    Events below the logger's effective level are dropped. Callers on hot
+    paths may also check `logger.isEnabledFor(level)` first, to skip building
+    `fields`. `fields` is formatted later, on the writer thread, so it must be
+    a snapshot that the caller will not change.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _records is None:
+        # Queued logging is not running (e.g. the core is used as a library);
+        # go through the logger so the application's own handlers see it.
+        logger.log(level, StructuredMessage(event, fields))
+        return
+    _records.put((logger.name, level, time.time(), event, fields))
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    A QueueHandler that leaves formatting to the writer thread.
+
+    The stock `prepare` formats every record on the calling thread so it can
+    be pickled; this queue never leaves the process, so the record is queued
+    as is. Callers must therefore pass log arguments that will not change
+    afterwards (e.g. snapshots rather than live items).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record unformatted."""
+        return record
+
+
+class _EventListener(QueueListener):
+    """A QueueListener that also accepts the event tuples queued by `log_event`."""
+
+    def prepare(self, record: Any) -> logging.LogRecord:
+        """Turn a queued event tuple into a LogRecord stamped with its creation time."""
+        if isinstance(record, logging.LogRecord):
+            return record
+
+        name, level, created, event, fields = record
+        record = logging.LogRecord(
+            name, level, "", 0, StructuredMessage(event, fields), None, None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+
+
+class _RotatingLogWriter(RotatingFileHandler):
+    """
+    A RotatingFileHandler tuned for the writer thread.
+
+    The stock handler formats each record twice and seeks to the end of the
+    file to decide whether to rotate, then flushes after every record. This
+    one formats once, tracks the file size (in encoded bytes) itself and
+    flushes only when no more records are waiting.
+    """
+
+    def __init__(self, records: queue.SimpleQueue, *args: Any, **kwargs: Any) -> None:
+        """Write to the file given by `args`; flush whenever `records` is empty."""
+        super().__init__(*args, **kwargs)
+        self._waiting = records
+        self._size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write one record, rotating the file first if it would grow too big."""
+        try:
+            line = self.format(record) + self.terminator
+            size = len(line) if line.isascii() else len(line.encode(self.encoding or "utf-8"))
+            if self.maxBytes > 0 and self._size + size >= self.maxBytes and self._size:
+                self.doRollover()
+                self._size = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line)
+            self._size += size
+            if self._waiting.empty():
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def log_level() -> int:
+    """Return the level named by GROCERY_APP_LOG_LEVEL (INFO if unset or unknown)."""
+    level = logging.getLevelName(constants.LOG_LEVEL.upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def configure_logging() -> None:
+    """
+    Start queued, rotating file logging in the data directory (first call only).
+
+    Deferred to first use so that importing the package (or running `--help`)
+    does not create directories, open the log file or start the writer thread.
+    """
+    global _records, _handler, _listener
+    if _listener is not None:
+        return
+
+    os.makedirs(constants.EXPORT_PATH, exist_ok=True)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    writer = _RotatingLogWriter(
+        records,
+        log_file_name,
+        maxBytes=constants.LOG_MAX_BYTES,
+        backupCount=constants.LOG_BACKUPS,
+        encoding="utf-8",
+        delay=True,
+    )
+    writer.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+
+    _handler = _DeferredQueueHandler(records)
+    root = logging.getLogger()
+    root.setLevel(log_level())
+    root.addHandler(_handler)
+
+    _records = records
+    _listener = _EventListener(records, writer)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    # Invalid settings found when `constants` was imported, before logging
+    # was set up.
+    for message in constants.CONFIG_WARNINGS:
+        logging.getLogger(__name__).warning(message)
+
 
-logging.basicConfig(
-    filename=log_file_name,
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-)
+def stop_logging() -> None:
+    """Write every queued record, stop the writer thread and detach the handler."""
+    global _records, _handler, _listener
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _records = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _handler = None
+    _listener = None
@@ -0,0 +1,346 @@
+"""
+metrics.py
+
+Opt-in instrumentation for the Grocery List application.
+
+When GROCERY_APP_METRICS is set, every public `GroceryList` method and the
+JSON file helpers in `utils` record their call count, error count and a
+latency histogram, and the file helpers also count bytes and items written
+and read. `app stats` prints the numbers and `app stats --json` dumps them.
+
+When it is not set, `timed` and `instrument` hand back the function or class
+unchanged and the counter calls sit behind an `if metrics.ENABLED` check, so
+disabled instrumentation adds no wrapper calls at all.
+
+Each process keeps its numbers in memory and merges them into
+`constants.METRICS_FILE` in the data directory when it exits, so the report
+covers every run since the last `app stats --reset`. A running daemon also
+reports its live numbers.
+
+Latency buckets are powers of two in microseconds: bucket 0 holds calls under
+1 µs, bucket k calls of [2**(k-1), 2**k) µs, and the last bucket everything
+slower. Percentiles are the upper bound of the bucket they fall in.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import app.constants as constants
+
+# Read once at import: instrumentation is decided when modules are loaded.
+ENABLED = constants.METRICS_ENABLED
+
+# Percentiles shown by `app stats`
+PERCENTILES = (50, 95, 99)
+
+_T = TypeVar("_T")
+
+# Guards the registry; sharded loads read files from several threads.
+_lock = threading.Lock()
+
+
+class OperationStats:
+    """Call count, errors, total/min/max time and latency histogram of one operation."""
+
+    __slots__ = ("count", "errors", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        """Start with no calls recorded."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every recorded call."""
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.buckets = [0] * constants.METRICS_BUCKETS
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        """Add one call that took `seconds`."""
+        bucket = min(int(seconds * 1e6).bit_length(), constants.METRICS_BUCKETS - 1)
+        with _lock:
+            if self.count == 0 or seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+            self.count += 1
+            self.errors += failed
+            self.total += seconds
+            self.buckets[bucket] += 1
+
+    def merge(self, other: "OperationStats") -> None:
+        """Add another set of numbers for the same operation."""
+        if other.count == 0:
+            return
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        for index, value in enumerate(other.buckets[:len(self.buckets)]):
+            self.buckets[index] += value
+
+    def percentile(self, percent: float) -> float:
+        """Return an upper bound (seconds) for the given latency percentile."""
+        if self.count == 0:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for bucket, value in enumerate(self.buckets):
+            seen += value
+            if seen >= rank:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Return the numbers as JSON-ready data."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": self.total,
+            "min_s": self.min,
+            "max_s": self.max,
+            "buckets": self.buckets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OperationStats":
+        """Rebuild stats saved by `to_dict`."""
+        stats = cls()
+        stats.count = int(data.get("count", 0))
+        stats.errors = int(data.get("errors", 0))
+        stats.total = float(data.get("total_s", 0.0))
+        stats.min = float(data.get("min_s", 0.0))
+        stats.max = float(data.get("max_s", 0.0))
+        buckets = list(data.get("buckets", []))[:constants.METRICS_BUCKETS]
+        stats.buckets[:len(buckets)] = buckets
+        return stats
+
+
+# Numbers recorded by this process
+_operations: dict[str, OperationStats] = {}
+_counters: dict[str, int] = {}
+_started = time.time()
+
+
+# -------------------------
+# Recording
+# -------------------------
+
+def operation(name: str) -> OperationStats:
+    """Return the stats for an operation, creating them on first use."""
+    stats = _operations.get(name)
+    if stats is None:
+        stats = _operations.setdefault(name, OperationStats())
+    return stats
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add `value` to a counter (callers check `ENABLED` first)."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def timed(name: str) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """
+    Decorate a function so each call is recorded under `name`.
+
+    Returns the function unchanged when instrumentation is disabled. Calls
+    that raise are counted as errors (and still timed).
+    """
+    def decorate(func: Callable[..., _T]) -> Callable[..., _T]:
+        if not ENABLED:
+            return func
+
+        stats = operation(name)
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> _T:
+            start = clock()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.record(clock() - start, failed)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument(cls: type[_T]) -> type[_T]:
+    """
+    Class decorator: time every public method as "<Class>.<method>".
+
+    Static and class methods are included; properties, generator functions
+    and context managers (whose work happens after the call returns) are
+    not. Nested calls are each recorded, so times are inclusive. Returns the
+    class unchanged when instrumentation is disabled.
+    """
+    if not ENABLED:
+        return cls
+
+    import inspect
+
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_"):
+            continue
+        wrapper_type = type(attr) if isinstance(attr, (staticmethod, classmethod)) else None
+        func = attr.__func__ if wrapper_type is not None else attr
+        if not inspect.isfunction(func):
+            continue
+        if inspect.isgeneratorfunction(inspect.unwrap(func)):
+            continue
+
+        wrapped = timed(f"{cls.__name__}.{attr_name}")(func)
+        setattr(cls, attr_name, wrapper_type(wrapped) if wrapper_type is not None else wrapped)
+    return cls
+
+
+# -------------------------
+# Reporting
+# -------------------------
+
+def metrics_path() -> str:
+    """Return the file that accumulates the numbers of finished runs."""
+    return os.path.join(constants.EXPORT_PATH, constants.METRICS_FILE)
+
+
+def snapshot() -> dict:
+    """Return this process's numbers as JSON-ready data."""
+    with _lock:
+        return {
+            "since": _started,
+            "operations": {
+                name: stats.to_dict()
+                for name, stats in _operations.items() if stats.count
+            },
+            "counters": dict(_counters),
+        }
+
+
+def merge(base: dict, extra: dict) -> dict:
+    """Return the sum of two reports (as returned by `snapshot`)."""
+    operations = {
+        name: OperationStats.from_dict(data)
+        for name, data in base.get("operations", {}).items()
+    }
+    for name, data in extra.get("operations", {}).items():
+        operations.setdefault(name, OperationStats()).merge(OperationStats.from_dict(data))
+
+    counters = dict(base.get("counters", {}))
+    for name, value in extra.get("counters", {}).items():
+        counters[name] = counters.get(name, 0) + value
+
+    return {
+        "since": min(base.get("since", _started), extra.get("since", _started)),
+        "operations": {name: stats.to_dict() for name, stats in operations.items()},
+        "counters": counters,
+    }
+
+
+def load_saved() -> dict:
+    """Return the numbers saved by earlier runs (empty if there are none)."""
+    try:
+        with open(metrics_path(), "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"Error loading metrics: {exc}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def report() -> dict:
+    """Return the saved numbers plus this process's numbers."""
+    return merge(load_saved(), snapshot())
+
+
+def reset() -> None:
+    """Forget this process's numbers and delete the saved ones."""
+    global _started
+    with _lock:
+        for stats in _operations.values():
+            stats.clear()
+        _counters.clear()
+        _started = time.time()
+    try:
+        os.remove(metrics_path())
+    except FileNotFoundError:
+        pass
+
+
+def save() -> None:
+    """Merge this process's numbers into the saved ones and start over."""
+    current = snapshot()
+    if not current["operations"] and not current["counters"]:
+        return
+    # The data directory may be gone (e.g. a temporary one in the benchmarks).
+    if not os.path.isdir(constants.EXPORT_PATH):
+        return
+
+    import app.utils as utils
+
+    path = metrics_path()
+    with utils.file_lock(f"{path}.{constants.LOCK_EXTENSION}"):
+        # `write_json`, not the instrumented `save_data`: saving the metrics
+        # must not record metrics of its own.
+        try:
+            utils.write_json(path, merge(load_saved(), current))
+        except (OSError, TypeError) as exc:
+            print(f"Error saving metrics: {exc}")
+            return
+    with _lock:
+        for stats in _operations.values():
+            stats.clear()
+        _counters.clear()
+
+
+def format_report(data: dict) -> str:
+    """Return a report as a table, slowest operations (by total time) first."""
+    operations = {
+        name: OperationStats.from_dict(stats)
+        for name, stats in data.get("operations", {}).items()
+    }
+    counters = data.get("counters", {})
+    if not operations and not counters:
+        return "No metrics recorded yet."
+
+    since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data.get("since", _started)))
+    percentiles = "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    lines = [
+        f"Metrics since {since}",
+        "",
+        f"{'Operation':<34}{'Calls':>9}{'Errors':>8}{'Total s':>10}{'Mean ms':>10}"
+        f"{percentiles}{'Max ms':>10}",
+    ]
+    ranked = sorted(operations.items(), key=lambda entry: entry[1].total, reverse=True)
+    for name, stats in ranked:
+        mean = stats.total / stats.count if stats.count else 0.0
+        values = "".join(f"{stats.percentile(p) * 1000:>10.3f}" for p in PERCENTILES)
+        lines.append(
+            f"{name:<34}{stats.count:>9}{stats.errors:>8}{stats.total:>10.3f}"
+            f"{mean * 1000:>10.3f}{values}{stats.max * 1000:>10.3f}"
+        )
+
+    if counters:
+        lines += ["", "Counters"]
+        lines += [f"  {name:<32}{value:>15,}" for name, value in sorted(counters.items())]
+    return "\n".join(lines)
+
+
+if ENABLED:
+    atexit.register(save)
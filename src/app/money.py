@@ -0,0 +1,100 @@
+"""
+money.py
+
+Fixed-point money helpers for the Grocery List application.
+
+Costs are held as integer cents, so sums are exact integer additions. Sales
+tax is a per-store rate (`constants.STORE_TAX_RATES`, overridable with
+GROCERY_APP_TAX_RATES, falling back to `constants.TAX_RATE_DEFAULT`) applied to
+each store's subtotal and rounded half up to the cent with `Decimal`, so a
+total never depends on the order items were summed in.
+"""
+
+import math
+from collections.abc import Mapping
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+
+import app.constants as constants
+
+
+def to_cents(value: int | float) -> int:
+    """
+    Convert a dollar amount to whole cents, rounding half cents up.
+
+    Values close to a half cent are rounded from their decimal form, so
+    2.675 and 1.005 become 268 and 101 even though their binary products with
+    100 fall just short of the half.
+
+    Raises:
+        ValueError: If the value is not finite.
+    """
+    if isinstance(value, int):
+        return value * 100
+    if not math.isfinite(value):
+        raise ValueError(f"Cost must be a finite number (got {value!r}).")
+    cents = value * 100
+    if abs(cents - math.floor(cents) - 0.5) < 1e-6:
+        return int(Decimal(repr(value)).scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+    return round(cents)
+
+
+def from_cents(cents: int) -> float:
+    """Return a cent amount as dollars (the nearest float)."""
+    return cents / 100
+
+
+@lru_cache(maxsize=1)
+def tax_rates() -> dict[str, Decimal]:
+    """
+    Return the per-store tax rates, keyed by case-folded store name.
+
+    `constants.STORE_TAX_RATES` is read first, then GROCERY_APP_TAX_RATES
+    ("Store=rate,Store=rate"); entries that cannot be parsed are reported and
+    skipped.
+    """
+    rates = {
+        store.casefold(): Decimal(str(rate))
+        for store, rate in constants.STORE_TAX_RATES.items()
+    }
+    for entry in constants.STORE_TAX_RATES_ENV.split(","):
+        if not entry.strip():
+            continue
+        store, _, rate = entry.rpartition("=")
+        try:
+            if not store.strip():
+                raise ValueError
+            rates[store.strip().casefold()] = Decimal(rate.strip())
+        except (ArithmeticError, ValueError):
+            print(f"Ignoring invalid tax rate {entry.strip()!r} in GROCERY_APP_TAX_RATES.")
+    return rates
+
+
+def tax_rate(store: str) -> Decimal:
+    """Return the sales tax rate for a store."""
+    rate = tax_rates().get(store.casefold())
+    return rate if rate is not None else Decimal(str(constants.TAX_RATE_DEFAULT))
+
+
+def tax_cents(subtotal: int, rate: Decimal | float) -> int:
+    """Return the tax on a cent subtotal, rounded half up to the cent."""
+    if not isinstance(rate, Decimal):
+        rate = Decimal(str(rate))
+    return int((subtotal * rate).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def total_with_tax(
+    store_subtotals: Mapping[str, int],
+    tax: float | None = None,
+) -> int:
+    """
+    Return the total in cents of per-store cent subtotals plus their tax.
+
+    Args:
+        store_subtotals: Pre-tax subtotal in cents for each store.
+        tax: One rate for every store instead of the per-store rates.
+    """
+    return sum(
+        subtotal + tax_cents(subtotal, tax_rate(store) if tax is None else tax)
+        for store, subtotal in store_subtotals.items()
+    )
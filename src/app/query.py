@@ -0,0 +1,330 @@
+"""
+query.py
+
+Multi-field queries over the grocery list (`GroceryList.query`, `app query`).
+
+A query is a list of conditions that must all hold, each written as
+`<field><op><value>`, e.g. `priority>=4`, `store=Costco` or `cost<10`. A bare
+`buy` means `buy=yes` and `!buy` (or `not buy`) means `buy=no`; a single
+clause may join several conditions with "and".
+
+Queries are answered from `QueryIndex`, a set of secondary indexes (hash
+indexes on store, priority and buy, and a sorted cost index). The planner
+counts how many items each indexed condition matches (O(distinct values) for
+the hash indexes, two bisects for cost, with every range condition on cost
+merged into one span), reads candidates from the most selective one and
+checks the remaining conditions on those items only, most selective first.
+With no usable index the list is scanned.
+"""
+
+import operator
+import re
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, NamedTuple
+
+import app.constants as constants
+from app.grocery_item import GroceryItem
+from app.indexes import FieldIndex, SortedIndex
+
+# Queryable fields and the type their values are parsed as
+FIELDS: dict[str, type] = {
+    "name": str,
+    "store": str,
+    "cost": float,
+    "amount": int,
+    "priority": int,
+    "buy": bool,
+}
+
+# Comparison operators ("==" is accepted as an alias for "=")
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Intersect with another index only while it has at most this many IDs per
+# candidate; past that, checking each candidate in Python is cheaper.
+INTERSECT_RATIO = 8
+
+# `field op value`, or a bare (optionally negated) boolean field
+_CONDITION = re.compile(
+    r"^\s*(?P<negate>!|not\s+)?(?P<field>[a-z_]+)\s*"
+    r"(?:(?P<op>==|!=|<=|>=|=|<|>)\s*(?P<value>.*?))?\s*$",
+    re.IGNORECASE,
+)
+
+# Separator between conditions inside one clause
+_AND = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+class Condition(NamedTuple):
+    """One `field op value` test. String values are stored case-folded."""
+
+    field: str
+    op: str
+    value: Any
+
+    def __str__(self) -> str:
+        """Return the condition in query syntax."""
+        return f"{self.field}{self.op}{self.value}"
+
+    def matches(self, item: GroceryItem) -> bool:
+        """Return True if the item satisfies the condition."""
+        value = getattr(item, self.field)
+        if FIELDS[self.field] is str:
+            value = value.casefold()
+        return OPERATORS[self.op](value, self.value)
+
+    def test(self, value: Any) -> bool:
+        """Return True if an (already case-folded) field value satisfies the condition."""
+        return OPERATORS[self.op](value, self.value)
+
+
+class Plan(NamedTuple):
+    """
+    How a query will run.
+
+    Candidates are read from the index for `index` (`estimate` items, or
+    every item when `index` is empty), narrowed by intersecting with the
+    index entries for `intersect`, and then checked against `filters`.
+    """
+
+    index: list[Condition]
+    estimate: int
+    intersect: list[Condition]
+    filters: list[Condition]
+
+    def __str__(self) -> str:
+        """Describe the plan in one line (for `app query --explain`)."""
+        if not self.index:
+            source = f"scan all {self.estimate} item(s)"
+        else:
+            source = (
+                f"index on {self.index[0].field} for {', '.join(map(str, self.index))} "
+                f"({self.estimate} item(s))"
+            )
+        if self.intersect:
+            source += f", intersect {', '.join(map(str, self.intersect))}"
+        if self.filters:
+            source += f", then filter {', '.join(map(str, self.filters))}"
+        return source
+
+
+def parse_condition(text: str) -> Condition:
+    """
+    Parse one condition such as "priority>=4", "buy" or "store=Costco".
+
+    Raises:
+        ValueError: If the field, operator or value is invalid.
+    """
+    match = _CONDITION.match(text)
+    if match is None:
+        raise ValueError(f"Cannot parse condition {text!r}.")
+
+    field = match["field"].lower()
+    if field not in FIELDS:
+        raise ValueError(
+            f"Unknown field {match['field']!r} (choose from {', '.join(FIELDS)}).")
+    kind = FIELDS[field]
+
+    if match["op"] is None:
+        if kind is not bool:
+            raise ValueError(f"Condition {text!r} needs an operator and a value.")
+        return Condition(field, "=", match["negate"] is None)
+    if match["negate"]:
+        raise ValueError(f"Cannot negate a comparison in {text!r}; use != instead.")
+
+    op = "=" if match["op"] == "==" else match["op"]
+    raw = match["value"].strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in ('"', "'"):
+        raw = raw[1:-1]
+
+    if kind in (str, bool) and op not in ("=", "!="):
+        raise ValueError(f"{field} only supports = and != (got {op!r}).")
+
+    if kind is str:
+        return Condition(field, op, raw.casefold())
+    if kind is bool:
+        folded = raw.lower()
+        if folded in constants.BUY_TRUE:
+            return Condition(field, op, True)
+        if folded in constants.BUY_FALSE:
+            return Condition(field, op, False)
+        raise ValueError(f"{field} must be yes/no/true/false (got {raw!r}).")
+
+    try:
+        value = kind(raw)
+    except ValueError:
+        raise ValueError(f"Invalid {field} value {raw!r}.") from None
+    return Condition(field, op, value)
+
+
+def parse_where(clauses: Iterable[str]) -> list[Condition]:
+    """Parse `--where` clauses; conditions within a clause may be joined with "and"."""
+    return [
+        parse_condition(part)
+        for clause in clauses
+        for part in _AND.split(clause.strip())
+        if part
+    ]
+
+
+class QueryIndex:
+    """Secondary indexes on store, priority, buy and cost, plus the planner."""
+
+    def __init__(self) -> None:
+        """Create empty indexes."""
+        self.fields: dict[str, FieldIndex] = {
+            "store": FieldIndex(lambda item: item.store.casefold()),
+            "priority": FieldIndex(operator.attrgetter("priority")),
+            "buy": FieldIndex(operator.attrgetter("buy")),
+        }
+        self.cost = SortedIndex(operator.attrgetter("cost"))
+        self._indexes = (*self.fields.values(), self.cost)
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self.cost)
+
+    def rebuild(self, items: Iterable[GroceryItem]) -> None:
+        """Replace every index's contents with `items`."""
+        items = list(items)
+        for index in self._indexes:
+            index.rebuild(items)
+
+    def add(self, item: GroceryItem) -> None:
+        """Index a new item."""
+        for index in self._indexes:
+            index.add(item)
+
+    def remove(self, item_id: int) -> None:
+        """Remove an item from every index."""
+        for index in self._indexes:
+            index.remove(item_id)
+
+    def update(self, item: GroceryItem) -> None:
+        """Re-index an edited item (only indexes whose value changed do work)."""
+        for index in self._indexes:
+            index.update(item)
+
+    # -------------------------
+    # Planning
+    # -------------------------
+
+    def _lookup(
+        self,
+        conditions: list[Condition],
+    ) -> tuple[int, Callable[[], Iterable[int]]] | None:
+        """
+        Return (matching item count, candidate ID reader) for indexed conditions.
+
+        `conditions` is one condition on a hash-indexed field, or every range
+        condition on cost, which are merged into a single span. None means
+        the condition has no usable index (e.g. `name=...` or `cost!=x`).
+        """
+        field_index = self.fields.get(conditions[0].field)
+        if field_index is not None:
+            buckets = field_index.buckets(conditions[0].test)
+            if len(buckets) == 1:
+                return len(buckets[0]), lambda: buckets[0]
+            return sum(map(len, buckets)), lambda: set().union(*buckets)
+
+        if conditions[0].field != "cost" or conditions[0].op == "!=":
+            return None
+
+        low = high = None
+        include_low = include_high = True
+        for condition in conditions:
+            value, op = condition.value, condition.op
+            if op in ("=", ">", ">=") and (
+                low is None or value > low or (value == low and op == ">")
+            ):
+                low, include_low = value, op != ">"
+            if op in ("=", "<", "<=") and (
+                high is None or value < high or (value == high and op == "<")
+            ):
+                high, include_high = value, op != "<"
+
+        start, stop = self.cost.span(low, high, include_low, include_high)
+        return stop - start, lambda: self.cost.ids(start, stop)
+
+    def plan(
+        self,
+        conditions: list[Condition],
+    ) -> tuple[Plan, list[Callable[[], Iterable[int]]]]:
+        """
+        Choose how to run a query.
+
+        Every indexed condition is sized exactly (range conditions on cost
+        count as one). The smallest supplies the candidates. The other
+        indexed conditions are intersected with them at C speed, unless their
+        index is so much bigger than the candidates that checking each
+        candidate in Python is cheaper; those, and unindexed conditions, are
+        checked per item, smallest first so most candidates fail early.
+
+        Returns:
+            The plan, and the ID readers for `plan.index` followed by those
+            for `plan.intersect` (no readers for a full scan).
+        """
+        ranges = [c for c in conditions if c.field == "cost" and c.op != "!="]
+        groups = [ranges] if ranges else []
+        groups.extend([c] for c in conditions if c.field != "cost" or c.op == "!=")
+
+        total = len(self)
+        sized = []
+        for group in groups:
+            lookup = self._lookup(group)
+            # Unindexed conditions could match anything, so they rank last.
+            size = total + 1 if lookup is None else lookup[0]
+            sized.append((size, group, lookup))
+        sized.sort(key=operator.itemgetter(0))
+
+        if not sized or sized[0][0] >= total:
+            filters = [c for _size, group, _lookup in sized for c in group]
+            return Plan([], total, [], filters), []
+
+        (estimate, index, (_count, reader)), *rest = sized
+        readers = [reader]
+        intersect: list[Condition] = []
+        filters: list[Condition] = []
+        for size, group, lookup in rest:
+            if lookup is not None and size <= estimate * INTERSECT_RATIO:
+                intersect.extend(group)
+                readers.append(lookup[1])
+            else:
+                filters.extend(group)
+        return Plan(index, estimate, intersect, filters), readers
+
+    def execute(
+        self,
+        conditions: list[Condition],
+        items: Mapping[int, GroceryItem],
+    ) -> list[GroceryItem]:
+        """
+        Return the items matching every condition, ordered by case-folded name.
+
+        Args:
+            conditions: Parsed conditions (all must hold).
+            items: The indexed items, keyed by ID.
+        """
+        plan, readers = self.plan(conditions)
+        if not readers:
+            candidates: Iterable[GroceryItem] = items.values()
+        else:
+            ids = set(readers[0]())
+            for reader in readers[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(reader())
+            candidates = map(items.__getitem__, ids)
+
+        matches = [
+            item for item in candidates
+            if all(condition.matches(item) for condition in plan.filters)
+        ]
+        matches.sort(key=lambda item: (item.name.casefold(), item.id))
+        return matches
@@ -0,0 +1,331 @@
+"""
+snapshot.py
+
+Compact binary snapshot format for the grocery list.
+
+Layout (all integers little-endian):
+
+    header        magic b"GRCY", version (u16), flags (u16),
+                  item count N (u64), string count S (u64)
+    ids           N x 16-byte unsigned integers
+    cost          N x i64 cents (f64 dollars in version 1)
+    amount        N x i64
+    priority      N x i8
+    buy           N x u8
+    name refs     N x u32 (index into the string table)
+    store refs    N x u32 (index into the string table)
+    string table  (S + 1) x u64 byte offsets, then the UTF-8 blob
+
+Names and stores share one de-duplicated string table. Readers `mmap` the file
+and view each column with `memoryview.cast`, so nothing is decoded until a row
+(or string) is actually accessed; `SnapshotReader.items` decodes a whole file
+column by column when every item is needed. Section sizes are checked against
+the file size on open, so a truncated file raises `SnapshotError`. Version 1
+files (float costs) are still read; their costs are rounded to cents as rows
+are decoded.
+"""
+
+import gc
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterable, Iterator
+
+import app.utils as utils
+from app.grocery_item import GroceryItem
+from app.money import to_cents
+
+MAGIC = b"GRCY"
+VERSION = 2
+# Older versions that can still be read
+READABLE_VERSIONS = (1, VERSION)
+HEADER = struct.Struct("<4sHHQQ")
+
+# Width in bytes of each stored item ID
+ID_WIDTH = 16
+
+# Bytes per item across all columns (id, cost, amount, priority, buy, refs)
+ROW_WIDTH = ID_WIDTH + 8 + 8 + 1 + 1 + 4 + 4
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is not in a supported format."""
+
+
+def write_snapshot(file_path: str, items: Iterable[GroceryItem]) -> None:
+    """
+    Write items to a binary snapshot.
+
+    The file is written to a uniquely named temporary file in the same
+    directory, flushed to disk and moved into place with `os.replace`, so
+    readers (and a crash mid-write) never see a partially written snapshot and
+    concurrent writers never share a temporary file.
+
+    Args:
+        file_path: Destination path.
+        items: Items to write, in order.
+
+    Raises:
+        OSError: If the file cannot be written.
+        ValueError: If an item ID does not fit in 16 unsigned bytes.
+    """
+    ids = bytearray()
+    costs = bytearray()
+    amounts = bytearray()
+    priorities = bytearray()
+    buys = bytearray()
+    name_refs = bytearray()
+    store_refs = bytearray()
+
+    strings: dict[str, int] = {}
+    blob = bytearray()
+    offsets = [0]
+
+    def string_ref(value: str) -> int:
+        ref = strings.get(value)
+        if ref is None:
+            ref = len(strings)
+            strings[value] = ref
+            blob.extend(value.encode("utf-8"))
+            offsets.append(len(blob))
+        return ref
+
+    count = 0
+    for item in items:
+        try:
+            ids.extend(item.id.to_bytes(ID_WIDTH, "little"))
+        except OverflowError as exc:
+            raise ValueError(
+                f"ID {item.id} does not fit in the binary snapshot format.") from exc
+        costs.extend(item.cost_cents.to_bytes(8, "little", signed=True))
+        amounts.extend(item.amount.to_bytes(8, "little", signed=True))
+        priorities.extend(item.priority.to_bytes(1, "little", signed=True))
+        buys.append(1 if item.buy else 0)
+        name_refs.extend(string_ref(item.name).to_bytes(4, "little"))
+        store_refs.extend(string_ref(item.store).to_bytes(4, "little"))
+        count += 1
+
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, count, len(strings)))
+            for column in (ids, costs, amounts, priorities, buys, name_refs, store_refs):
+                file.write(column)
+            file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            file.write(blob)
+            file.flush()
+            os.fsync(file.fileno())
+        utils.copy_file_mode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotReader:
+    """
+    Lazily decoded, memory-mapped view of a binary snapshot.
+
+    Supports `len()`, indexing, and iteration; each access decodes only the
+    requested row. Use as a context manager (or call `close`) to release the
+    mapping.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """Open and map a snapshot file, validating its header."""
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError(f"{file_path} is too small to be a snapshot.")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _flags, count, string_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError(f"{file_path} is not a grocery list snapshot.")
+        if version not in READABLE_VERSIONS:
+            self.close()
+            raise SnapshotError(f"Unsupported snapshot version {version}.")
+        if HEADER.size + ROW_WIDTH * count + 8 * (string_count + 1) > size:
+            self.close()
+            raise SnapshotError(f"{file_path} is truncated or damaged.")
+
+        self._count = count
+        self._float_costs = version == 1
+        # Every memoryview over the map is tracked so `close` can release
+        # them before unmapping.
+        self._views: list[memoryview] = [memoryview(self._map)]
+        offset = HEADER.size
+
+        def section(size: int, code: str | None = None) -> memoryview:
+            nonlocal offset
+            part = self._views[0][offset:offset + size]
+            offset += size
+            self._views.append(part)
+            if code is not None:
+                part = part.cast(code)
+                self._views.append(part)
+            return part
+
+        self._ids = section(ID_WIDTH * count)
+        self._cost = section(8 * count, "d" if self._float_costs else "q")
+        self._amount = section(8 * count, "q")
+        self._priority = section(count, "b")
+        self._buy = section(count, "B")
+        self._name_refs = section(4 * count, "I")
+        self._store_refs = section(4 * count, "I")
+        self._string_offsets = section(8 * (string_count + 1), "Q")
+
+        self._blob_start = offset
+        self._strings: list[str | None] = [None] * string_count
+
+        try:
+            self._check_layout(file_path, size)
+        except SnapshotError:
+            self.close()
+            raise
+
+    def _check_layout(self, file_path: str, size: int) -> None:
+        """Raise SnapshotError unless the sections fit the file exactly.
+
+        A truncated or padded file would otherwise fail later with a
+        TypeError/IndexError, or decode cut-off strings as valid items. String
+        references are checked as rows are decoded.
+        """
+        # Kept for `strings`, which needs the same list.
+        self._offset_list = offsets = self._string_offsets.tolist()
+        if (
+            offsets[0] != 0
+            or any(start > end for start, end in zip(offsets, offsets[1:]))
+            or self._blob_start + offsets[-1] != size
+        ):
+            raise SnapshotError(f"{file_path} is truncated or damaged.")
+
+    def __len__(self) -> int:
+        """Return the number of items in the snapshot."""
+        return self._count
+
+    def __getitem__(self, index: int) -> GroceryItem:
+        """Decode and return the item at `index`."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("snapshot index out of range")
+
+        start = index * ID_WIDTH
+        item = GroceryItem.__new__(GroceryItem)
+        item._id = int.from_bytes(self._ids[start:start + ID_WIDTH], "little")
+        item._name = self.string(self._name_refs[index])
+        item._store = self.string(self._store_refs[index])
+        cost = self._cost[index]
+        item._cents = to_cents(cost) if self._float_costs else cost
+        item._amount = self._amount[index]
+        item._priority = self._priority[index]
+        item._buy = bool(self._buy[index])
+        return item
+
+    def __iter__(self) -> Iterator[GroceryItem]:
+        """Yield every item in order."""
+        for index in range(self._count):
+            yield self[index]
+
+    def items(self) -> list[GroceryItem]:
+        """
+        Decode every item at once.
+
+        Each column is converted in one call and the string table is decoded
+        once. The cyclic garbage collector is paused meanwhile: the new items
+        cannot form cycles, and collections triggered by a large burst of
+        allocations would otherwise rescan them over and over.
+        """
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._decode_all()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _decode_all(self) -> list[GroceryItem]:
+        """Build every item from whole-column conversions (see `items`)."""
+        strings = self.strings()
+        ids = self._ids.tobytes()
+        costs = self._cost.tolist()
+        if self._float_costs:
+            costs = [to_cents(cost) for cost in costs]
+
+        name_refs = self._name_refs.tolist()
+        store_refs = self._store_refs.tolist()
+        if self._count and max(max(name_refs), max(store_refs)) >= len(strings):
+            raise SnapshotError("Snapshot refers to a missing string.")
+
+        from_bytes = int.from_bytes
+        new = GroceryItem.__new__
+        result = []
+        append = result.append
+        for start, cents, amount, priority, buy, name_ref, store_ref in zip(
+            range(0, len(ids), ID_WIDTH),
+            costs,
+            self._amount.tolist(),
+            self._priority.tolist(),
+            self._buy.tolist(),
+            name_refs,
+            store_refs,
+        ):
+            item = new(GroceryItem)
+            item._id = from_bytes(ids[start:start + ID_WIDTH], "little")
+            item._name = strings[name_ref]
+            item._store = strings[store_ref]
+            item._cents = cents
+            item._amount = amount
+            item._priority = priority
+            item._buy = buy == 1
+            append(item)
+        return result
+
+    def strings(self) -> list[str]:
+        """Decode (and cache) the whole string table."""
+        offsets = self._offset_list
+        blob = self._map[self._blob_start:self._blob_start + offsets[-1]]
+        try:
+            self._strings = [
+                blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])
+            ]
+        except UnicodeDecodeError as exc:
+            raise SnapshotError(f"Snapshot string table is damaged: {exc}") from exc
+        return self._strings
+
+    def string(self, ref: int) -> str:
+        """Return (and cache) entry `ref` of the string table."""
+        if ref >= len(self._strings):
+            raise SnapshotError("Snapshot refers to a missing string.")
+        value = self._strings[ref]
+        if value is None:
+            start = self._blob_start + self._string_offsets[ref]
+            end = self._blob_start + self._string_offsets[ref + 1]
+            try:
+                value = self._map[start:end].decode("utf-8")
+            except UnicodeDecodeError as exc:
+                raise SnapshotError(f"Snapshot string table is damaged: {exc}") from exc
+            self._strings[ref] = value
+        return value
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        """Return the reader for use in a `with` block."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the reader when the `with` block exits."""
+        self.close()
@@ -0,0 +1,616 @@
+"""
+storage.py
+
+Storage backends used by `GroceryList` to persist items.
+
+Every backend implements the `StorageBackend` interface:
+- `exists` / `iter_items` / `load` to read the persisted list
+- `save_all` to replace the persisted list with the in-memory one
+- `apply_changes` to persist individual add/edit/remove changes
+
+File-based backends (JSON and binary snapshots) rewrite the whole file on
+`save_all`; `GroceryList` may put its append-only journal in front of them.
+The sharded backend keeps one JSON file per store and its `apply_changes`
+rewrites only the shards a change touched. Backends with `incremental = True`
+(SQLite) write each change as a single row operation instead, so the journal
+is bypassed.
+
+The backend is selected with the `GROCERY_APP_STORAGE` environment variable
+(see `constants.STORAGE`).
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import app.constants as constants
+import app.utils as utils
+from app.grocery_item import GroceryItem
+from app.snapshot import SnapshotError, SnapshotReader, write_snapshot
+
+
+def item_from_dict(item_dict: dict) -> GroceryItem:
+    """Build a GroceryItem from a persisted dictionary (legacy keys allowed).
+
+    Normalizes legacy data:
+    - Keys that start with an underscore (e.g. "_buy" -> "buy")
+    - String booleans for buy ("True"/"False") into real bool values
+    """
+    # Fast path: records written by `GroceryItem.to_dict`.
+    if "name" in item_dict and not isinstance(item_dict.get("buy"), str):
+        return GroceryItem.from_record(item_dict)
+
+    record = {}
+
+    for key, value in item_dict.items():
+        if isinstance(key, str) and key.startswith("_"):
+            key = key[1:]
+        record[key] = value
+
+    buy = record.get("buy")
+    if isinstance(buy, str):
+        v = buy.strip().lower()
+        if v in ("true", "yes", "y", "1"):
+            record["buy"] = True
+        elif v in ("false", "no", "n", "0"):
+            record["buy"] = False
+
+    return GroceryItem.from_record(record)
+
+
+def quarantine(path: str) -> bool:
+    """Move an unreadable data file to `<path>.corrupt`; return True if it moved."""
+    corrupt_path = f"{path}.corrupt"
+    try:
+        os.replace(path, corrupt_path)
+    except OSError:
+        return False
+    print(f"Unreadable data was moved to {corrupt_path}")
+    return True
+
+
+class StorageBackend:
+    """Interface shared by all storage backends."""
+
+    # Name used in GROCERY_APP_STORAGE
+    name = ""
+
+    # True if `apply_changes` writes single changes without a full rewrite
+    incremental = False
+
+    def __init__(self, path: str) -> None:
+        """Remember the path the backend persists to."""
+        self.path = path
+        # Raise write errors instead of printing them (for callers such as
+        # the HTTP API that must not acknowledge a failed write).
+        self.strict = False
+
+    def exists(self) -> bool:
+        """Return True if persisted data exists."""
+        return os.path.exists(self.path)
+
+    def version(self) -> tuple | None:
+        """Return a token that changes whenever the persisted data is rewritten."""
+        return utils.file_version(self.path)
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Yield persisted items in order."""
+        raise NotImplementedError
+
+    def load(self) -> list[GroceryItem]:
+        """Return all persisted items."""
+        return list(self.iter_items())
+
+    def save_all(self, items: Iterable[GroceryItem]) -> None:
+        """Replace the persisted list with `items`."""
+        raise NotImplementedError
+
+    def apply_changes(
+        self,
+        changes: list[tuple[str, GroceryItem]],
+        items: Iterable[GroceryItem],
+    ) -> None:
+        """Persist (op, item) changes; `items` is the full list after them.
+
+        The default implementation rewrites everything.
+        """
+        self.save_all(items)
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JsonBackend(StorageBackend):
+    """The original indented JSON file (`grocery_list.json`)."""
+
+    name = "json"
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Stream items from the JSON file (see `utils.iter_json_array`).
+
+        If the file is unreadable, the items before the damage are yielded and
+        the file is moved aside to `<name>.corrupt` so the next save cannot
+        overwrite what is left of it.
+        """
+        try:
+            for item_dict in utils.iter_json_array(self.path, strict=True):
+                yield item_from_dict(item_dict)
+        except (OSError, ValueError) as exc:
+            print(f"Error loading data: {exc}")
+            quarantine(self.path)
+
+    def save_all(self, items: Iterable[GroceryItem]) -> None:
+        """Rewrite the JSON file."""
+        utils.save_data(self.path, [item.to_dict() for item in items], strict=self.strict)
+
+
+class BinaryBackend(StorageBackend):
+    """Memory-mapped binary snapshot (`grocery_list.bin`, see `snapshot.py`)."""
+
+    name = "binary"
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Decode items from the snapshot.
+
+        A damaged snapshot is moved aside to `<name>.corrupt` (as with the
+        JSON file) so the next save cannot overwrite it.
+        """
+        try:
+            with SnapshotReader(self.path) as reader:
+                yield from reader
+        except OSError as exc:
+            print(f"Error loading snapshot: {exc}")
+        except SnapshotError as exc:
+            print(f"Error loading snapshot: {exc}")
+            quarantine(self.path)
+
+    def load(self) -> list[GroceryItem]:
+        """Decode the whole snapshot column by column (see `SnapshotReader.items`)."""
+        try:
+            with SnapshotReader(self.path) as reader:
+                return reader.items()
+        except OSError as exc:
+            print(f"Error loading snapshot: {exc}")
+        except SnapshotError as exc:
+            print(f"Error loading snapshot: {exc}")
+            quarantine(self.path)
+        return []
+
+    def save_all(self, items: Iterable[GroceryItem]) -> None:
+        """Rewrite the snapshot."""
+        try:
+            write_snapshot(self.path, items)
+        except (OSError, ValueError) as exc:
+            if self.strict:
+                raise
+            print(f"Error saving snapshot: {exc}")
+
+
+class ShardedBackend(StorageBackend):
+    """
+    One JSON file per store inside the `grocery_list.shards/` directory.
+
+    Each record carries a `seq` number (its position in the list when it was
+    first saved) so the shards can be merged back into list order on load.
+    Shards are read in parallel with a thread pool (capped at the CPU count),
+    and `apply_changes` rewrites only the shards of the stores that an add,
+    edit, or remove touched (both the old and new store when an item moves).
+
+    An unreadable shard (or one holding anything but item records) is handled
+    like an unreadable JSON list: the records before the damage are kept and
+    the file is moved to `<shard>.corrupt`. If it cannot be moved, the shard
+    is never rewritten by this backend.
+    """
+
+    name = "sharded"
+
+    def __init__(self, path: str) -> None:
+        """Remember the shard directory; nothing is read until `iter_items`."""
+        super().__init__(path)
+        # Shard file of every persisted item, and its list-order sequence.
+        self._shard_of: dict[int, str] = {}
+        self._seq: dict[int, int] = {}
+        self._next_seq = 0
+        # Store name -> shard file name (hashing is not free on large lists).
+        self._shard_names: dict[str, str] = {}
+        # Unreadable shards that are still in place and must not be replaced.
+        self._damaged: set[str] = set()
+
+    def shard_name(self, store: str) -> str:
+        """Return the shard file name for a store (readable slug + short hash)."""
+        name = self._shard_names.get(store)
+        if name is None:
+            slug = re.sub(r"[^a-z0-9]+", "-", store.casefold()).strip("-")[:32]
+            digest = hashlib.sha1(store.encode("utf-8")).hexdigest()[:8]
+            name = f"{slug or 'store'}-{digest}.json"
+            self._shard_names[store] = name
+        return name
+
+    def exists(self) -> bool:
+        """Return True if the shard directory exists."""
+        return os.path.isdir(self.path)
+
+    def version(self) -> tuple | None:
+        """Return a token built from every shard file's inode, mtime and size.
+
+        The directory's own mtime is too coarse: two rewrites within one
+        timestamp tick would look the same.
+        """
+        if not os.path.isdir(self.path):
+            return None
+        return tuple(
+            (name, utils.file_version(os.path.join(self.path, name)))
+            for name in self._shard_files()
+        )
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Load every shard in parallel and yield the items in list order."""
+        names = self._shard_files()
+        workers = min(constants.SHARD_LOAD_WORKERS, len(names), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                shards = list(pool.map(self._read_shard, names))
+        else:
+            shards = [self._read_shard(name) for name in names]
+
+        # Each shard is already in seq order, so this sort only merges runs.
+        entries = [entry for shard in shards for entry in shard]
+        entries.sort(key=itemgetter(0))
+
+        shard_of = self._shard_of = {}
+        seqs = self._seq = {}
+        self._next_seq = entries[-1][0] + 1 if entries else 0
+
+        for seq, item, name in entries:
+            shard_of[item.id] = name
+            seqs[item.id] = seq
+            yield item
+
+    def save_all(self, items: Iterable[GroceryItem]) -> None:
+        """Rewrite every shard and delete shards of stores with no items left."""
+        self._shard_of = {}
+        groups = self._group(items)
+        # Forget the sequence numbers of items that are gone.
+        self._seq = {item.id: seq for group in groups.values() for seq, item in group}
+        for name, group in groups.items():
+            self._write_shard(name, group)
+
+        for name in set(self._shard_files()) - set(groups):
+            self._remove_shard(name)
+
+    def apply_changes(
+        self,
+        changes: list[tuple[str, GroceryItem]],
+        items: Iterable[GroceryItem],
+    ) -> None:
+        """Rewrite only the shards touched by `changes`."""
+        dirty: set[str] = set()
+        for op, item in changes:
+            old_name = self._shard_of.get(item.id)
+            if old_name is not None:
+                dirty.add(old_name)
+            dirty.add(self.shard_name(item.store))
+            if op == "remove":
+                self._shard_of.pop(item.id, None)
+                self._seq.pop(item.id, None)
+
+        groups = self._group(items, dirty)
+        for name in dirty:
+            if groups.get(name):
+                self._write_shard(name, groups[name])
+            else:
+                self._remove_shard(name)
+
+    def _group(
+        self,
+        items: Iterable[GroceryItem],
+        only: set[str] | None = None,
+    ) -> dict[str, list[tuple[int, GroceryItem]]]:
+        """Group items into (seq, item) lists per shard, assigning new seqs.
+
+        Args:
+            items: Every item, in list order.
+            only: Shard names to collect (all when None).
+        """
+        groups: dict[str, list[tuple[int, GroceryItem]]] = {}
+        for item in items:
+            seq = self._seq.get(item.id)
+            if seq is None:
+                seq = self._next_seq
+                self._seq[item.id] = seq
+                self._next_seq += 1
+
+            name = self.shard_name(item.store)
+            self._shard_of[item.id] = name
+            if only is None or name in only:
+                groups.setdefault(name, []).append((seq, item))
+        return groups
+
+    def _shard_files(self) -> list[str]:
+        """Return the names of the shard files on disk."""
+        try:
+            return sorted(
+                name for name in os.listdir(self.path) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+
+    def _read_shard(self, name: str) -> list[tuple[int, GroceryItem, str]]:
+        """Read one shard as (seq, item, shard name) tuples sorted by seq.
+
+        Shards are small enough to parse in one call, which is much faster
+        than streaming them. A shard that cannot be parsed, or that holds
+        anything other than item records, is streamed again to keep the
+        records before the damage, then quarantined.
+        """
+        path = os.path.join(self.path, name)
+        entries: list[tuple[int, GroceryItem, str]] = []
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                records = json.load(file)
+            if not isinstance(records, list):
+                raise ValueError("expected a JSON array")
+            self._add_entries(entries, records, name)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as exc:
+            print(f"Error loading shard {name}: {exc}")
+            entries = []
+            try:
+                self._add_entries(entries, utils.iter_json_array(path, strict=True), name)
+            except (OSError, ValueError):
+                pass
+            if not quarantine(path):
+                self._damaged.add(name)
+
+        entries.sort(key=itemgetter(0))
+        return entries
+
+    @staticmethod
+    def _add_entries(
+        entries: list[tuple[int, GroceryItem, str]],
+        records: Iterable,
+        name: str,
+    ) -> None:
+        """Append a (seq, item, name) entry per record.
+
+        Raises:
+            ValueError: At the first record that is not a valid item (the
+                entries before it are kept).
+        """
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise ValueError(f"record {index} is not a JSON object")
+            seq = record.pop("seq", 0)
+            if not isinstance(seq, int) or isinstance(seq, bool):
+                raise ValueError(f"record {index} has an invalid seq {seq!r}")
+            try:
+                item = item_from_dict(record)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"record {index}: {exc}") from exc
+            entries.append((seq, item, name))
+
+    def _write_shard(self, name: str, group: list[tuple[int, GroceryItem]]) -> None:
+        """Atomically rewrite one shard (unless it is damaged, see the class docs)."""
+        if self._refuse(name):
+            return
+        os.makedirs(self.path, exist_ok=True)
+        utils.save_data(
+            os.path.join(self.path, name),
+            [{**item.to_dict(), "seq": seq} for seq, item in group],
+            strict=self.strict,
+        )
+
+    def _remove_shard(self, name: str) -> None:
+        """Delete the shard of a store that has no items left."""
+        if self._refuse(name):
+            return
+        try:
+            os.remove(os.path.join(self.path, name))
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            if self.strict:
+                raise
+            print(f"Error removing shard {name}: {exc}")
+
+    def _refuse(self, name: str) -> bool:
+        """Return True (after saying so) if `name` is an unreadable shard still in place."""
+        if name not in self._damaged:
+            return False
+        message = f"Not saving shard {name}: it could not be read and was left untouched."
+        if self.strict:
+            raise OSError(message)
+        print(message)
+        return True
+
+
+class SqliteBackend(StorageBackend):
+    """
+    SQLite database (`grocery_list.sqlite3`) with one row per item.
+
+    IDs are stored as text because they are 128-bit. `seq` preserves insertion
+    order, and `name_lower` (the case-folded name) and `store` are indexed for
+    prefix and per-store queries.
+
+    The database is opened on first use rather than on construction, because
+    connecting creates the file: a backend built only to probe `exists` must
+    not leave an empty database behind to shadow `grocery_list.json` later.
+    """
+
+    name = "sqlite"
+    incremental = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            store TEXT NOT NULL,
+            cost REAL NOT NULL,
+            amount INTEGER NOT NULL,
+            priority INTEGER NOT NULL,
+            buy INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS items_name_lower ON items (name_lower);
+        CREATE INDEX IF NOT EXISTS items_store ON items (store);
+    """
+
+    # A plain INSERT: an ID that is already stored is a conflict to report,
+    # not a row to overwrite.
+    _INSERT = (
+        "INSERT INTO items "
+        "(id, name, name_lower, store, cost, amount, priority, buy) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    _UPDATE = (
+        "UPDATE items SET name = ?, name_lower = ?, store = ?, cost = ?, "
+        "amount = ?, priority = ?, buy = ? WHERE id = ?"
+    )
+
+    def __init__(self, path: str) -> None:
+        """Remember the database path; nothing is opened until first use."""
+        # Imported here so the other backends do not pay for loading sqlite3.
+        import sqlite3
+
+        super().__init__(path)
+        self._error = sqlite3.Error
+        self._conflict = sqlite3.IntegrityError
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> "sqlite3.Connection":
+        """Return the open connection, opening (or creating) the database first."""
+        if self._connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self.path)
+            try:
+                connection.executescript(self.SCHEMA)
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def exists(self) -> bool:
+        """Return True if a (non-empty) database file exists."""
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def iter_items(self) -> Iterator[GroceryItem]:
+        """Yield items in insertion order (nothing if there is no database)."""
+        if self._connection is None and not self.exists():
+            return
+        rows = self.connection.execute(
+            "SELECT id, name, store, cost, amount, priority, buy "
+            "FROM items ORDER BY seq"
+        )
+        for item_id, name, store, cost, amount, priority, buy in rows:
+            yield GroceryItem.from_record({
+                "id": int(item_id),
+                "name": name,
+                "store": store,
+                "cost": cost,
+                "amount": amount,
+                "priority": priority,
+                "buy": bool(buy),
+            })
+
+    def save_all(self, items: Iterable[GroceryItem]) -> None:
+        """Replace every row in one transaction."""
+        try:
+            connection = self.connection
+            with connection:
+                connection.execute("DELETE FROM items")
+                connection.executemany(
+                    self._INSERT, (self._row(item) for item in items))
+        except self._error as exc:
+            if self.strict:
+                raise
+            print(f"Error saving data: {exc}")
+
+    def apply_changes(
+        self,
+        changes: list[tuple[str, GroceryItem]],
+        items: Iterable[GroceryItem],
+    ) -> None:
+        """Write each change as a single-row statement, in one transaction."""
+        try:
+            connection = self.connection
+            with connection:
+                for op, item in changes:
+                    if op == "add":
+                        try:
+                            connection.execute(self._INSERT, self._row(item))
+                        except self._conflict as exc:
+                            raise self._conflict(
+                                f"Item ID {item.id} is already stored; "
+                                "no changes were saved.") from exc
+                    elif op == "edit":
+                        row = self._row(item)
+                        connection.execute(self._UPDATE, (*row[1:], row[0]))
+                    elif op == "remove":
+                        connection.execute(
+                            "DELETE FROM items WHERE id = ?", (str(item.id),))
+        except self._error as exc:
+            if self.strict:
+                raise
+            print(f"Error saving data: {exc}")
+
+    def close(self) -> None:
+        """Close the database connection, if one was opened."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _row(item: GroceryItem) -> tuple:
+        """Return the column values for an item (id first)."""
+        return (
+            str(item.id),
+            item.name,
+            item.name.casefold(),
+            item.store,
+            item.cost,
+            item.amount,
+            item.priority,
+            int(item.buy),
+        )
+
+
+# Backend class and file extension for each GROCERY_APP_STORAGE value
+BACKENDS: dict[str, tuple[type[StorageBackend], str]] = {
+    "json": (JsonBackend, "json"),
+    "binary": (BinaryBackend, constants.SNAPSHOT_EXTENSION),
+    "sqlite": (SqliteBackend, "sqlite3"),
+    "sharded": (ShardedBackend, "shards"),
+}
+
+
+def backend_path(storage: str) -> str:
+    """Return the file a backend persists to inside the data directory."""
+    _backend_class, extension = BACKENDS[storage]
+    return os.path.join(constants.EXPORT_PATH, f"{constants.GROCERY_LIST}.{extension}")
+
+
+def create_backend(storage: str) -> StorageBackend:
+    """
+    Create the backend for a GROCERY_APP_STORAGE value.
+
+    Raises:
+        ValueError: If `storage` is not a known backend.
+    """
+    if storage not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage {storage!r}; expected one of {', '.join(BACKENDS)}.")
+
+    backend_class, _extension = BACKENDS[storage]
+    return backend_class(backend_path(storage))
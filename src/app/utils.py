@@ -6,27 +6,159 @@ Small utility functions used by the Grocery List application.
 
 import json
 import os
+import re
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 
+import app.metrics as metrics
 
-def save_data(file_path: str, data: list) -> None:
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; locking becomes a no-op there.
+    fcntl = None
+
+# Characters read per chunk by the streaming JSON reader
+JSON_CHUNK_SIZE = 1 << 16
+
+# JSON insignificant whitespace
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Process umask, read once at import (reading it means briefly changing it,
+# which is not safe once other threads are running)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@metrics.timed("utils.save_data")
+def save_data(file_path: str, data: list, strict: bool = False) -> None:
     """
     Save a Python list to a JSON file.
 
+    The data is written atomically (see `write_json`), so readers (and a crash
+    mid-write) only ever see the old or the new file, never a truncated one.
+
     Args:
         file_path: Full path to the file to write.
         data: List of JSON-serializable objects.
+        strict: Raise OSError / TypeError instead of printing them.
     """
     # Ensure we always write a list to disk.
     if not data:
         data = []
 
     try:
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+        size = write_json(file_path, data)
     except (OSError, TypeError) as exc:
+        if strict:
+            raise
         print(f"Error saving data: {exc}")
+        return
+
+    if metrics.ENABLED:
+        metrics.count("utils.save_data.bytes_written", size)
+        metrics.count("utils.save_data.items", len(data))
+
+
+def write_json(file_path: str, data: object) -> int:
+    """
+    Atomically write `data` to a JSON file.
+
+    The data is written to a temporary file in the same directory, flushed to
+    disk and moved into place with `os.replace`. Unlike `save_data` this is not
+    instrumented, so the metrics file can be written with it.
+
+    Args:
+        file_path: Full path to the file to write.
+        data: A JSON-serializable object.
+
+    Returns:
+        The size of the written file in bytes.
+
+    Raises:
+        OSError: If the file cannot be written.
+        TypeError: If `data` is not JSON-serializable.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+            size = os.fstat(file.fileno()).st_size
+        copy_file_mode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return size
+
+
+def copy_file_mode(file_path: str, temp_path: str) -> None:
+    """
+    Give a temporary file the permissions `file_path` has (or would get).
 
+    `tempfile.mkstemp` creates files owner-only (0600). Before a temporary file
+    replaces `file_path`, it gets the existing file's mode, or the mode a plain
+    `open` would create (0666 minus the umask) if there is no file yet.
 
+    Args:
+        file_path: The file about to be replaced.
+        temp_path: The temporary file that will replace it.
+    """
+    try:
+        mode = os.stat(file_path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(temp_path, mode)
+
+
+@contextmanager
+def file_lock(lock_path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory `fcntl.flock` lock on `lock_path` for a `with` block.
+
+    Locks are per open file, so nesting two locks on the same path in one
+    process deadlocks; callers that nest must count depth themselves.
+
+    Args:
+        lock_path: Full path to the lock file (created if missing).
+        shared: Take a shared (read) lock instead of an exclusive one.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def file_version(file_path: str) -> tuple[int, int, int] | None:
+    """
+    Return a token that changes whenever a file is rewritten or appended to.
+
+    Args:
+        file_path: Full path to the file.
+
+    Returns:
+        (inode, mtime in ns, size), or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@metrics.timed("utils.load_data")
 def load_data(file_path: str) -> list:
     """
     Load JSON data from disk.
@@ -39,12 +171,165 @@ def load_data(file_path: str) -> list:
     """
     try:
         with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
+            data = json.load(file)
+            if metrics.ENABLED:
+                metrics.count("utils.load_data.bytes_read", os.fstat(file.fileno()).st_size)
+                metrics.count("utils.load_data.items", len(data))
+            return data
     except (OSError, json.JSONDecodeError) as exc:
         print(f"Error loading data: {exc}")
         return []
 
 
+def iter_json_array(
+    file_path: str,
+    chunk_size: int = JSON_CHUNK_SIZE,
+    strict: bool = False,
+) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so memory stays bounded by the largest element rather than the
+    whole file, and callers can start consuming items before the file has been
+    fully read.
+
+    Args:
+        file_path: Full path to the file to read.
+        chunk_size: Number of characters read per chunk.
+        strict: Raise OSError / json.JSONDecodeError instead of printing them.
+
+    Yields:
+        Each decoded array element, in order. Reading stops (after printing an
+        error) if the file cannot be read or is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    count = 0
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            if metrics.ENABLED:
+                metrics.count("utils.iter_json_array.bytes_read", os.fstat(file.fileno()).st_size)
+            buffer = file.read(chunk_size)
+            eof = not buffer
+            position = _skip_whitespace(buffer, 0)
+
+            # Expect the opening bracket (reading more if the file starts
+            # with a lot of whitespace).
+            while position == len(buffer) and not eof:
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = _skip_whitespace(buffer, 0)
+
+            if buffer[position:position + 1] != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, position)
+            position += 1
+            first = True
+
+            while True:
+                position = _skip_whitespace(buffer, position)
+
+                if first and buffer[position:position + 1] == "]":
+                    return
+
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    end = None
+
+                # Only accept an element once the following "," or "]" is in
+                # the buffer; a scalar at the buffer edge may be truncated
+                # (e.g. "12" of "123").
+                if end is not None:
+                    following = _skip_whitespace(buffer, end)
+                    if following < len(buffer) and buffer[following] in ",]":
+                        yield element
+                        count += 1
+                        if buffer[following] == "]":
+                            return
+                        position = following + 1
+                        first = False
+                        continue
+
+                if eof:
+                    raise json.JSONDecodeError(
+                        "Unterminated array", buffer, position)
+
+                # Drop the consumed prefix and append the next chunk.
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+    except (OSError, json.JSONDecodeError) as exc:
+        if strict:
+            raise
+        print(f"Error loading data: {exc}")
+    finally:
+        if metrics.ENABLED:
+            metrics.count("utils.iter_json_array.items", count)
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    """Return the index of the first non-whitespace character at or after position."""
+    return _WHITESPACE.match(text, position).end()
+
+
+def append_records(file_path: str, records: list[dict], strict: bool = False) -> None:
+    """
+    Append records to a JSON Lines file (one compact JSON object per line).
+
+    Args:
+        file_path: Full path to the file to append to.
+        records: JSON-serializable dictionaries to append.
+        strict: Raise OSError / TypeError instead of printing them.
+    """
+    if not records:
+        return
+
+    lines = "".join(
+        json.dumps(record, separators=(",", ":")) + "\n" for record in records
+    )
+
+    try:
+        with open(file_path, "a", encoding="utf-8") as file:
+            file.write(lines)
+    except (OSError, TypeError) as exc:
+        if strict:
+            raise
+        print(f"Error appending data: {exc}")
+
+
+def load_records(file_path: str) -> list[dict]:
+    """
+    Load records from a JSON Lines file.
+
+    A torn trailing line (e.g. from a crash mid-append) is skipped.
+
+    Args:
+        file_path: Full path to the file to read.
+
+    Returns:
+        The decoded records, or an empty list if the file cannot be read.
+    """
+    records: list[dict] = []
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Skipping unreadable record in {file_path}")
+    except OSError as exc:
+        print(f"Error loading records: {exc}")
+
+    return records
+
+
 def check_file_exists(file_path: str) -> bool:
     """
     Check if a file exists at the given path.